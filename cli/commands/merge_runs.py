@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import argparse
+import shutil
+from pathlib import Path
+from typing import Any
+
+from cli.commands.run import RunStats, load_resume_metadata, write_run_metadata
+from cli.execution import journal_path, load_journal, split_shard_run_id
+from cli.utils import PROJECT_ROOT, RESULTS_ROOT, RUNS_ROOT
+
+
+MAX_LISTED_CASES = 10
+
+
+def _list_cases(label: str, cases: list[str]) -> None:
+    print(f"  {label}: {len(cases)}")
+    for case_id in cases[:MAX_LISTED_CASES]:
+        print(f"    - {case_id}")
+    if len(cases) > MAX_LISTED_CASES:
+        print(f"    ... and {len(cases) - MAX_LISTED_CASES} more")
+
+
+def find_shard_runs(approach_id: str, base_run_id: str) -> dict[int, tuple[int, Path]]:
+    """Map shard index to ``(shard count, metadata path)`` for ``base_run_id``."""
+    shards: dict[int, tuple[int, Path]] = {}
+    runs_dir = RUNS_ROOT / approach_id
+    if not runs_dir.is_dir():
+        return shards
+    for metadata_path in sorted(runs_dir.glob(f"{base_run_id}-shard*of*.yaml")):
+        parsed = split_shard_run_id(metadata_path.stem)
+        if parsed is None or parsed[0] != base_run_id:
+            continue
+        _, index, count = parsed
+        shards[index] = (count, metadata_path)
+    return shards
+
+
+def merge_run(
+    approach_id: str, base_run_id: str, *, allow_missing: bool, force: bool
+) -> bool:
+    shards = find_shard_runs(approach_id, base_run_id)
+    if not shards:
+        print(f"Error: no shard runs found for {approach_id}/{base_run_id}")
+        return False
+
+    counts = {count for count, _ in shards.values()}
+    if len(counts) != 1:
+        print(f"Error: {base_run_id} has shards of different sizes: {sorted(counts)}")
+        return False
+    count = counts.pop()
+    absent = sorted(set(range(1, count + 1)) - set(shards))
+    if absent:
+        print(
+            f"Error: {base_run_id} is missing shard(s) "
+            f"{', '.join(f'{index}/{count}' for index in absent)}"
+        )
+        return False
+
+    metadata = {
+        index: load_resume_metadata(path) for index, (_, path) in shards.items()
+    }
+    first = metadata[1]
+    if any(entry.get("args") != first.get("args") for entry in metadata.values()):
+        print(f"Error: the shards of {base_run_id} were run with different arguments")
+        return False
+
+    target_dir = RESULTS_ROOT / approach_id / base_run_id / "cases"
+    if target_dir.exists() and any(target_dir.iterdir()) and not force:
+        print(f"Error: {target_dir} already exists (use --force to overwrite)")
+        return False
+
+    # Collect everything first so that nothing is written for a broken merge.
+    sources: dict[str, Path] = {}
+    duplicates: list[str] = []
+    missing: list[str] = []
+    expected_total = 0
+    assigned_total = 0
+    for index in sorted(shards):
+        shard_run_id = metadata[index].get("run_id") or shards[index][1].stem
+        cases_dir = RESULTS_ROOT / approach_id / shard_run_id / "cases"
+        present: set[str] = set()
+        if cases_dir.is_dir():
+            for case_path in sorted(cases_dir.glob("*/*/*.json")):
+                case_id = case_path.relative_to(cases_dir).with_suffix("").as_posix()
+                present.add(case_id)
+                if case_id in sources:
+                    duplicates.append(case_id)
+                else:
+                    sources[case_id] = case_path
+        state = load_journal(journal_path(approach_id, shard_run_id))
+        missing.extend(sorted(state.queued - present))
+        shard_info: dict[str, Any] = metadata[index].get("shard") or {}
+        expected_total = max(expected_total, int(shard_info.get("total_cases", 0)))
+        assigned_total += int(shard_info.get("assigned_cases", 0))
+
+    if expected_total and assigned_total != expected_total:
+        print(
+            f"Error: the shards of {base_run_id} were assigned {assigned_total} "
+            f"case(s) but the run has {expected_total}; were they run on different data?"
+        )
+        return False
+    if duplicates:
+        print(f"Error: cases of {base_run_id} appear in more than one shard")
+        _list_cases("duplicated", sorted(duplicates))
+        return False
+    if expected_total and len(sources) + len(missing) < expected_total:
+        print(
+            f"Error: {base_run_id} has {len(sources)} result(s) of {expected_total} "
+            "case(s) and the shard journals do not account for the rest"
+        )
+        return False
+    if missing:
+        level = "Warning" if allow_missing else "Error"
+        print(f"{level}: {base_run_id} has queued cases without a result")
+        _list_cases("missing", missing)
+        if not allow_missing:
+            print("  Resume the affected shards or pass --allow-missing.")
+            return False
+
+    if target_dir.exists():
+        shutil.rmtree(target_dir)
+    for case_id, source in sources.items():
+        destination = target_dir / f"{case_id}.json"
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(source, destination)
+
+    merged_journal = journal_path(approach_id, base_run_id)
+    merged_attempts = RESULTS_ROOT / approach_id / base_run_id / "attempts.jsonl"
+    for merged_path, part_path in (
+        (merged_journal, lambda run_id: journal_path(approach_id, run_id)),
+        (
+            merged_attempts,
+            lambda run_id: RESULTS_ROOT / approach_id / run_id / "attempts.jsonl",
+        ),
+    ):
+        with merged_path.open("w", encoding="utf-8") as handle:
+            for index in sorted(shards):
+                part = part_path(metadata[index].get("run_id") or shards[index][1].stem)
+                if part.exists():
+                    text = part.read_text(encoding="utf-8")
+                    handle.write(
+                        text if text.endswith("\n") or not text else text + "\n"
+                    )
+
+    stats = RunStats(
+        executed=sum(
+            int(entry.get("cases_executed", 0)) for entry in metadata.values()
+        ),
+        failed=sum(int(entry.get("cases_failed", 0)) for entry in metadata.values()),
+        timed_out=sum(
+            int(entry.get("cases_timed_out", 0)) for entry in metadata.values()
+        ),
+    )
+    config_path = Path(first.get("config_path", ""))
+    if not config_path.is_absolute():
+        config_path = PROJECT_ROOT / config_path
+    extra: dict[str, Any] = {
+        "journal": str(merged_journal.relative_to(RUNS_ROOT.parent)),
+        "shards": [
+            {
+                "run_id": metadata[index].get("run_id"),
+                "strategy": (metadata[index].get("shard") or {}).get("strategy"),
+                "assigned_cases": (metadata[index].get("shard") or {}).get(
+                    "assigned_cases"
+                ),
+                "cases_executed": metadata[index].get("cases_executed", 0),
+                "cases_failed": metadata[index].get("cases_failed", 0),
+                "cases_timed_out": metadata[index].get("cases_timed_out", 0),
+                "generated_at": metadata[index].get("generated_at"),
+            }
+            for index in sorted(shards)
+        ],
+        "cases_missing": len(missing),
+    }
+    if first.get("matrix"):
+        extra["matrix"] = first["matrix"]
+    metadata_path = write_run_metadata(
+        approach_id=approach_id,
+        run_id=base_run_id,
+        approach_args=first.get("args") or {},
+        config_path=config_path,
+        stats=stats,
+        extra=extra,
+    )
+    print(
+        f"Merged {count} shard(s) of {base_run_id}: {len(sources)} case(s) in "
+        f"{target_dir}"
+    )
+    print(f"Run metadata written to {metadata_path}")
+    return True
+
+
+def merge_runs_command(args: argparse.Namespace) -> int:
+    merged = [
+        merge_run(
+            args.approach,
+            run_id,
+            allow_missing=args.allow_missing,
+            force=args.force,
+        )
+        for run_id in args.run_ids
+    ]
+    return 0 if all(merged) else 1
+
+
+def register_subcommand(parser: argparse.ArgumentParser) -> None:
+    parser.set_defaults(handler=merge_runs_command)
+    parser.add_argument(
+        "run_ids",
+        nargs="+",
+        metavar="RUN_ID",
+        help="Run id passed to the sharded runs (without the -shardIofN suffix)",
+    )
+    parser.add_argument(
+        "--approach",
+        default="pecv-reference",
+        help="Approach identifier under runs/ and results/ (default: pecv-reference)",
+    )
+    parser.add_argument(
+        "--allow-missing",
+        action="store_true",
+        help="Merge even if some queued cases have no result (e.g. failed cases)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Overwrite an existing merged cases directory",
+    )
@@ -14,6 +14,8 @@ try:
 except ImportError:  # pragma: no cover - optional dependency
     yaml = None  # type: ignore[assignment]
 
+from cli.execution.journal import load_journal
+from cli.execution.sharding import split_shard_run_id
 from cli.reporting import (
     evaluate_case,
     extract_prediction_issues,
@@ -25,6 +27,19 @@ from cli.utils import DATA_ROOT, PROJECT_ROOT, RESULTS_ROOT, RUNS_ROOT
 
 MetricValue = Optional[float]
 
+# Case stages in execution order; ``materialize`` and ``result_write`` come from
+# the run journal, the others from the ``timing.stages`` of the result files.
+STAGE_ORDER = (
+    "materialize",
+    "load_files",
+    "context_rendering",
+    "structural_llm",
+    "semantic_llm",
+    "merge",
+    "usage_fetch",
+    "result_write",
+)
+
 
 def _resolve_path(candidate: str | Path | None, default: Path) -> Path:
     if candidate is None:
@@ -166,6 +181,12 @@ class StatsAccumulator:
     time_count: int = 0
     cost_sum: float = 0.0
     cost_count: int = 0
+    stage_sum: Dict[str, float] = field(default_factory=dict)
+    stage_count: Dict[str, int] = field(default_factory=dict)
+    # Prompt tokens of the cases whose usage says how many came from the cache.
+    cache_cases: int = 0
+    cache_prompt_tokens: int = 0
+    cache_read_tokens: int = 0
 
     def add_case(
         self,
@@ -179,8 +200,18 @@ class StatsAccumulator:
         matches: int = 0,
         duration: MetricValue,
         cost: MetricValue,
+        stages: Optional[Dict[str, float]] = None,
+        prompt_tokens: Optional[int] = None,
+        cached_tokens: Optional[int] = None,
     ) -> None:
         self.cases += 1
+        if prompt_tokens and cached_tokens is not None:
+            self.cache_cases += 1
+            self.cache_prompt_tokens += prompt_tokens
+            self.cache_read_tokens += cached_tokens
+        for name, seconds in (stages or {}).items():
+            self.stage_sum[name] = self.stage_sum.get(name, 0.0) + seconds
+            self.stage_count[name] = self.stage_count.get(name, 0) + 1
         if duration is not None:
             self.time_sum += duration
             self.time_count += 1
@@ -221,11 +252,28 @@ class StatsAccumulator:
         iou_avg = self.iou_sum / self.matches if self.matches else None
         time_avg = self.time_sum / self.time_count if self.time_count else None
         cost_avg = self.cost_sum / self.cost_count if self.cost_count else None
+        cached_ratio = (
+            self.cache_read_tokens / self.cache_prompt_tokens if self.cache_cases else None
+        )
         return {
             "span_f1": span_avg,
             "iou": iou_avg,
             "time_s": time_avg,
             "cost_usd": cost_avg,
+            "cached_token_ratio": cached_ratio,
+        }
+
+    def stage_breakdown(self) -> dict[str, Any]:
+        """Mean and total seconds per stage, over the cases that reported it."""
+        ordered = [name for name in STAGE_ORDER if name in self.stage_sum]
+        ordered += sorted(name for name in self.stage_sum if name not in STAGE_ORDER)
+        return {
+            name: {
+                "cases": self.stage_count[name],
+                "mean_s": self.stage_sum[name] / self.stage_count[name],
+                "total_s": self.stage_sum[name],
+            }
+            for name in ordered
         }
 
     def merge(self, other: "StatsAccumulator") -> None:
@@ -241,6 +289,14 @@ class StatsAccumulator:
         self.time_count += other.time_count
         self.cost_sum += other.cost_sum
         self.cost_count += other.cost_count
+        self.cache_cases += other.cache_cases
+        self.cache_prompt_tokens += other.cache_prompt_tokens
+        self.cache_read_tokens += other.cache_read_tokens
+        for name, seconds in other.stage_sum.items():
+            self.stage_sum[name] = self.stage_sum.get(name, 0.0) + seconds
+            self.stage_count[name] = (
+                self.stage_count.get(name, 0) + other.stage_count[name]
+            )
 
 
 def _iter_case_files(cases_dir: Path) -> Iterator[Path]:
@@ -276,14 +332,39 @@ def _resolve_case_parts(cases_dir: Path, case_path: Path) -> Optional[Tuple[str,
     return course, exercise, variant
 
 
-def _collect_run_stats(cases_dir: Path) -> tuple[StatsAccumulator, dict[str, StatsAccumulator]]:
+def _case_stages(
+    timing_data: dict[str, Any], harness_stages: Optional[Dict[str, Any]]
+) -> Dict[str, float]:
+    stages: Dict[str, float] = {}
+    for source in (timing_data.get("stages"), harness_stages):
+        if not isinstance(source, dict):
+            continue
+        for name, seconds in source.items():
+            value = _safe_number(seconds)
+            if value is not None:
+                stages[str(name)] = value
+    return stages
+
+
+def _collect_run_stats(
+    cases_dir: Path,
+    harness_stages: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> tuple[StatsAccumulator, dict[str, StatsAccumulator]]:
+    """Aggregate the case results of one run.
+
+    ``harness_stages`` maps case ids to the stages the harness journaled for
+    them; they are combined with the ``timing.stages`` of the result files.
+    """
     overall = StatsAccumulator()
     per_exercise: dict[str, StatsAccumulator] = defaultdict(StatsAccumulator)
 
     for case_path in _iter_case_files(cases_dir):
         try:
             case_data = json.loads(case_path.read_text(encoding="utf-8"))
-        except (OSError, json.JSONDecodeError):
+        except (OSError, json.JSONDecodeError) as exc:
+            _log_warning(
+                f"Skipping unreadable result {case_path} ({exc}); resume the run to redo it"
+            )
             continue
 
         timing_data = case_data.get("timing") or {}
@@ -292,6 +373,10 @@ def _collect_run_stats(cases_dir: Path) -> tuple[StatsAccumulator, dict[str, Sta
         cost_data = case_data.get("cost") or case_data.get("costs") or {}
         cost = _safe_number(cost_data.get("total_usd") or cost_data.get("totalUsd"))
 
+        token_data = case_data.get("tokens") or {}
+        prompt_tokens = _safe_number(token_data.get("prompt"))
+        cached_tokens = _safe_number(token_data.get("cached"))
+
         case_relative = None
         try:
             case_relative = str(case_path.relative_to(cases_dir))
@@ -328,6 +413,11 @@ def _collect_run_stats(cases_dir: Path) -> tuple[StatsAccumulator, dict[str, Sta
             gold_issues is not None and not missing_predictions
         )
 
+        case_id = (
+            "/".join(course_exercise_variant) if course_exercise_variant else None
+        )
+        stages = _case_stages(timing_data, (harness_stages or {}).get(case_id or ""))
+
         tp = fp = fn = matches = 0
         span_sum = iou_sum = 0.0
 
@@ -345,6 +435,9 @@ def _collect_run_stats(cases_dir: Path) -> tuple[StatsAccumulator, dict[str, Sta
                 matches=matches,
                 duration=duration,
                 cost=cost,
+                stages=stages,
+                prompt_tokens=int(prompt_tokens) if prompt_tokens else None,
+                cached_tokens=int(cached_tokens) if cached_tokens is not None else None,
             )
 
     return overall, per_exercise
@@ -385,6 +478,13 @@ def _format_number(value: Any, precision: int = 4) -> str:
         return str(value)
 
 
+def _stage_columns(rows: List[Dict[str, Any]]) -> List[str]:
+    seen = {name for row in rows for name in (row.get("stages") or {})}
+    return [name for name in STAGE_ORDER if name in seen] + sorted(
+        seen.difference(STAGE_ORDER)
+    )
+
+
 @dataclass
 class GroupAccumulator:
     benchmark: str
@@ -393,6 +493,7 @@ class GroupAccumulator:
     run_count: int = 0
     overall: StatsAccumulator = field(default_factory=StatsAccumulator)
     per_exercise: Dict[str, StatsAccumulator] = field(default_factory=dict)
+    repetitions: Optional[Dict[str, Any]] = None
 
     def add_run(
         self,
@@ -400,8 +501,12 @@ class GroupAccumulator:
         args_meta: Dict[str, Any],
         overall_stats: StatsAccumulator,
         per_exercise_stats: Dict[str, StatsAccumulator],
+        repetitions: Optional[Dict[str, Any]] = None,
     ) -> None:
         self.run_count += 1
+        # Every run of an adaptive repetition series carries the final decision.
+        if isinstance(repetitions, dict):
+            self.repetitions = repetitions
         model = args_meta.get("model")
         if isinstance(model, str):
             self.model_values.add(model)
@@ -431,7 +536,7 @@ class GroupAccumulator:
         model = sorted(self.model_values)
         model_repr = ", ".join(model) if model else "—"
 
-        return {
+        row = {
             "benchmark": self.benchmark,
             "model": model_repr,
             "config_key": self.config_key,
@@ -443,7 +548,11 @@ class GroupAccumulator:
                 "f1": f1,
             },
             "averages": averages,
+            "stages": self.overall.stage_breakdown(),
         }
+        if self.repetitions is not None:
+            row["repetitions"] = self.repetitions
+        return row
 
     def per_exercise_summary(self) -> List[Dict[str, Any]]:
         entries: List[Dict[str, Any]] = []
@@ -482,6 +591,10 @@ def report_command(args: argparse.Namespace) -> int:
     for run_dir in sorted(p for p in benchmark_root.iterdir() if p.is_dir()):
         if aggregate_root is not None and run_dir == aggregate_root:
             continue
+        shard_of = split_shard_run_id(run_dir.name)
+        if shard_of is not None and (benchmark_root / shard_of[0] / "cases").is_dir():
+            # merge-runs copied the shard's cases into its base run.
+            continue
 
         cases_dir = run_dir / "cases"
         if not cases_dir.exists():
@@ -491,9 +604,12 @@ def report_command(args: argparse.Namespace) -> int:
         if not case_files:
             continue
 
-        overall_stats, per_exercise_stats = _collect_run_stats(cases_dir)
-
         run_id = run_dir.name
+        journal = load_journal(runs_root / benchmark / f"{run_id}.journal")
+        overall_stats, per_exercise_stats = _collect_run_stats(
+            cases_dir, journal.stages
+        )
+
         metadata_path = runs_root / benchmark / f"{run_id}.yaml"
         metadata = _load_run_metadata(metadata_path)
         args_meta = metadata.get("args") if isinstance(metadata, dict) else {}
@@ -509,6 +625,7 @@ def report_command(args: argparse.Namespace) -> int:
             args_meta=args_meta,
             overall_stats=overall_stats,
             per_exercise_stats=per_exercise_stats,
+            repetitions=metadata.get("repetitions"),
         )
 
         run_report = {
@@ -521,9 +638,11 @@ def report_command(args: argparse.Namespace) -> int:
                 "generated_at": metadata.get("generated_at"),
                 "cases_executed": metadata.get("cases_executed"),
                 "cases_failed": metadata.get("cases_failed"),
+                "repetitions": metadata.get("repetitions"),
             },
             "totals": overall_stats.totals(),
             "averages": overall_stats.averages(),
+            "stages": overall_stats.stage_breakdown(),
         }
 
         per_exercise_rendered = _render_per_exercise(per_exercise_stats)
@@ -650,6 +769,58 @@ def report_command(args: argparse.Namespace) -> int:
             + " |"
         )
 
+    repetition_rows = [row for row in summary_rows if row.get("repetitions")]
+    if repetition_rows:
+        markdown_lines.append("")
+        markdown_lines.append("### Adaptive Repetitions")
+        markdown_lines.append(
+            "| Config Key | Runs | Micro F1 | Repetition CI | Dataset CI | Stopped |"
+        )
+        markdown_lines.append("| " + " | ".join(["---"] * 6) + " |")
+        for row in repetition_rows:
+            decision = row["repetitions"]
+            interval = decision.get("interval") or [None, None]
+            dataset_interval = decision.get("dataset_interval") or [None, None]
+            markdown_lines.append(
+                "| "
+                + " | ".join(
+                    [
+                        _display_config_key(row["config_key"], row["benchmark"]),
+                        f"{decision.get('completed')}/{decision.get('max_repetitions')}",
+                        _format_number(decision.get("micro_f1"), 3),
+                        f"{_format_number(interval[0], 3)}–{_format_number(interval[1], 3)}",
+                        f"{_format_number(dataset_interval[0], 3)}–"
+                        f"{_format_number(dataset_interval[1], 3)}",
+                        str(decision.get("stopped") or "—"),
+                    ]
+                )
+                + " |"
+            )
+
+    stage_names = _stage_columns(summary_rows)
+    if stage_names:
+        markdown_lines.append("")
+        markdown_lines.append("### Stage Breakdown")
+        markdown_lines.append("Mean seconds per case spent in each stage.")
+        markdown_lines.append("")
+        markdown_lines.append("| Config Key | " + " | ".join(stage_names) + " |")
+        markdown_lines.append("| " + " | ".join(["---"] * (len(stage_names) + 1)) + " |")
+        for row in summary_rows:
+            stages = row.get("stages") or {}
+            if not stages:
+                continue
+            markdown_lines.append(
+                "| "
+                + " | ".join(
+                    [_display_config_key(row["config_key"], row["benchmark"])]
+                    + [
+                        _format_number((stages.get(name) or {}).get("mean_s"), 3)
+                        for name in stage_names
+                    ]
+                )
+                + " |"
+            )
+
     markdown_lines.append("")
     markdown_lines.append("## Per Exercise Breakdown")
 
@@ -659,36 +830,39 @@ def report_command(args: argparse.Namespace) -> int:
         per_ex = per_exercise_tables.get(config_key, {}).get("exercises") or []
         if not per_ex:
             continue
+        # Only providers that break prompt usage down report cached tokens.
+        show_cache = any(
+            entry["averages"].get("cached_token_ratio") is not None for entry in per_ex
+        )
         markdown_lines.append("")
         markdown_lines.append(f"### {row['benchmark']} :: {display_key}")
         markdown_lines.append(
             "| Exercise | TP | FP | FN | Precision | Recall | F1 | Span F1 | IoU | Avg Time (s) | Avg Cost ($) |"
+            + (" Cached Prompt Tokens |" if show_cache else "")
         )
         markdown_lines.append(
-            "| " + " | ".join(["---"] * 11) + " |"
+            "| " + " | ".join(["---"] * (12 if show_cache else 11)) + " |"
         )
         for entry in per_ex:
             totals = entry["totals"]
             averages = entry["averages"]
-            markdown_lines.append(
-                "| "
-                + " | ".join(
-                    [
-                        entry["exercise"],
-                        _format_number(totals.get("tp"), 0),
-                        _format_number(totals.get("fp"), 0),
-                        _format_number(totals.get("fn"), 0),
-                        _format_number(totals.get("precision"), 3),
-                        _format_number(totals.get("recall"), 3),
-                        _format_number(totals.get("f1"), 3),
-                        _format_number(averages.get("span_f1"), 3),
-                        _format_number(averages.get("iou"), 3),
-                        _format_number(averages.get("time_s"), 3),
-                        _format_number(averages.get("cost_usd"), 4),
-                    ]
-                )
-                + " |"
-            )
+            values = [
+                entry["exercise"],
+                _format_number(totals.get("tp"), 0),
+                _format_number(totals.get("fp"), 0),
+                _format_number(totals.get("fn"), 0),
+                _format_number(totals.get("precision"), 3),
+                _format_number(totals.get("recall"), 3),
+                _format_number(totals.get("f1"), 3),
+                _format_number(averages.get("span_f1"), 3),
+                _format_number(averages.get("iou"), 3),
+                _format_number(averages.get("time_s"), 3),
+                _format_number(averages.get("cost_usd"), 4),
+            ]
+            if show_cache:
+                ratio = averages.get("cached_token_ratio")
+                values.append(f"{ratio:.0%}" if ratio is not None else "—")
+            markdown_lines.append("| " + " | ".join(values) + " |")
 
     markdown_lines.append("")
     markdown_lines.append(
@@ -814,6 +988,30 @@ def report_command(args: argparse.Namespace) -> int:
     summary_tex_path = benchmark_root / "summary.tex"
     summary_tex_path.write_text("\n\n".join(latex_blocks) + "\n", encoding="utf-8")
 
+    if stage_names:
+        print("Stage breakdown (mean seconds per case):")
+        for row in summary_rows:
+            stages = row.get("stages") or {}
+            if not stages:
+                continue
+            total = sum(entry["mean_s"] for entry in stages.values())
+            parts = [
+                f"{name} {entry['mean_s']:.3f}"
+                + (f" ({entry['mean_s'] / total:.0%})" if total else "")
+                for name, entry in stages.items()
+            ]
+            display_key = _display_config_key(row["config_key"], row["benchmark"])
+            print(f"  {display_key}: " + ", ".join(parts))
+
+    cache_rows = [
+        row for row in summary_rows if row["averages"].get("cached_token_ratio") is not None
+    ]
+    if cache_rows:
+        print("Prompt tokens served from the provider cache:")
+        for row in cache_rows:
+            display_key = _display_config_key(row["config_key"], row["benchmark"])
+            print(f"  {display_key}: {row['averages']['cached_token_ratio']:.0%}")
+
     print(f"Generated {len(run_reports)} run reports.")
     print(f"Summary JSON: {summary_json_path}")
     print(f"Summary Markdown: {summary_md_path}")
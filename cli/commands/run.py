@@ -1,18 +1,18 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
+import itertools
 import json
-import os
 import re
-import shlex
-import subprocess
-import sys
 import threading
+import time
 import uuid
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path
-from typing import Any, Iterable, Tuple
+from typing import Any, Iterable, Optional, Sequence, Tuple, Union
 
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
@@ -21,11 +21,85 @@ try:
 except ImportError:  # pragma: no cover - optional dependency
     yaml = None  # type: ignore[assignment]
 
-from cli.commands.variants import VariantManager
+from cli.commands.variants import BASE_ARTIFACTS, VariantManager
+from cli.execution import (
+    AFFINITY,
+    BatchEntrypoint,
+    AttemptLog,
+    BudgetGuard,
+    DEFAULT_PREFLIGHT_TIMEOUT_S,
+    CaseEntrypoint,
+    CHILD_OUTPUT_MODES,
+    CaseTimeoutError,
+    ConcurrencyController,
+    ConcurrencyLimiter,
+    GracefulInterrupt,
+    LONGEST_FIRST,
+    MATERIALIZE,
+    PROGRESS_MODES,
+    ProgressReporter,
+    PromptCensus,
+    ProbeResult,
+    PythonEntrypoint,
+    RESULT_WRITE,
+    RateLimiter,
+    ResultWriter,
+    RetryPolicy,
+    RunJournal,
+    WorkerPool,
+    SCHEDULES,
+    SHARD_BY_DURATION,
+    SHARD_STRATEGIES,
+    VariantLeases,
+    WorkQueue,
+    arun_with_retries,
+    balanced_shards,
+    check_result_file,
+    congestion_signal,
+    estimate_configuration,
+    estimate_durations,
+    estimate_wall_time,
+    group_tasks,
+    hash_shards,
+    historical_case_usage,
+    interleave,
+    is_prepared,
+    journal_path,
+    load_case_entrypoint,
+    load_estimate_entrypoint,
+    load_historical_durations,
+    load_preflight_entrypoint,
+    load_tokenizer,
+    mark_prepared,
+    order_tasks,
+    parse_shard,
+    preflight_key,
+    prepare_fingerprint,
+    prompt_chars,
+    read_reported_tokens,
+    reported_tokens,
+    resolve_case_timeout,
+    run_affinity_threads,
+    run_cases_async,
+    run_entrypoint,
+    run_preflight,
+    run_with_retries,
+    shard_run_id,
+    stage,
+    take_census,
+)
+from cli.execution.entrypoints import STARTUP_PROBE_TIMEOUT_S
+from cli.execution.estimate import TOKENIZER_ENCODING
+from cli.execution.rate_limits import (
+    DEFAULT_CHARS_PER_TOKEN,
+    DEFAULT_COMPLETION_TOKENS,
+    DEFAULT_REQUESTS_PER_CASE,
+)
+from cli.reporting import collect_case_counts, repetition_interval
 from cli.utils import (
     CONFIGS_ROOT,
+    DATA_ROOT,
     ExerciseIdentifier,
-    REFERENCE_ROOT,
     RESULTS_ROOT,
     RUNS_ROOT,
     iter_exercises,
@@ -70,24 +144,6 @@ def load_resume_metadata(path: Path) -> dict:
     return json.loads(path.read_text(encoding="utf-8"))
 
 
-def _forward_stream(
-    stream: Any, sink: Any, buffer: list[str], *, prefix: str | None = None
-) -> None:
-    if stream is None:
-        return
-    try:
-        for line in iter(stream.readline, ""):
-            if prefix and line:
-                formatted = f"{prefix}{line}"
-            else:
-                formatted = line
-            sink.write(formatted)
-            sink.flush()
-            buffer.append(line)
-    finally:
-        stream.close()
-
-
 def parse_approach_arguments(
     config: dict,
     extra_args: list[str] | None,
@@ -160,107 +216,6 @@ def parse_approach_arguments(
     return values, selection_metadata
 
 
-def run_entrypoint(
-    command: str,
-    *,
-    input_path: Path | None = None,
-    output_path: Path | None = None,
-    case_id: str | None = None,
-    approach_args: dict[str, Any] | None = None,
-    extra_flags: dict[str, Any] | None = None,
-) -> None:
-    if not command:
-        raise ValueError("Approach configuration is missing an executable entrypoint")
-
-    cmd = shlex.split(command)
-    if input_path is not None:
-        cmd.extend(["--input-path", str(input_path)])
-    if output_path is not None:
-        cmd.extend(["--output-path", str(output_path)])
-    if case_id is not None:
-        cmd.extend(["--case-id", case_id])
-
-    def emit_flags(values: dict[str, Any]) -> list[str]:
-        result: list[str] = []
-        for key, raw_value in values.items():
-            if raw_value is None:
-                continue
-            flag = f"--{key.replace('_', '-')}"
-            if isinstance(raw_value, bool):
-                if raw_value:
-                    result.append(flag)
-            elif isinstance(raw_value, (list, tuple)):
-                for item in raw_value:
-                    result.extend([flag, str(item)])
-            else:
-                result.extend([flag, str(raw_value)])
-        return result
-
-    if approach_args:
-        cmd.extend(emit_flags(approach_args))
-    if extra_flags:
-        cmd.extend(emit_flags(extra_flags))
-
-    if cmd and cmd[0] in {"python", "python3"}:
-        cmd[0] = sys.executable
-
-    env = os.environ.copy()
-    pythonpath_parts = [str(REFERENCE_ROOT)]
-    if existing := env.get("PYTHONPATH"):
-        pythonpath_parts.append(existing)
-    env["PYTHONPATH"] = os.pathsep.join(pythonpath_parts)
-
-    stdout_lines: list[str] = []
-    stderr_lines: list[str] = []
-    process = subprocess.Popen(  # noqa: S603,B404 - intentional execution
-        cmd,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        env=env,
-    )
-
-    threads = [
-        threading.Thread(
-            target=_forward_stream,
-            args=(process.stdout, sys.stdout, stdout_lines),
-        ),
-        threading.Thread(
-            target=_forward_stream,
-            args=(process.stderr, sys.stderr, stderr_lines),
-        ),
-    ]
-    for thread in threads:
-        thread.daemon = True
-        thread.start()
-
-    try:
-        returncode = process.wait()
-    except KeyboardInterrupt:  # pragma: no cover - interactive flow
-        process.terminate()
-        try:
-            process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            process.kill()
-        raise
-    finally:
-        for thread in threads:
-            thread.join()
-
-    if returncode != 0:
-        raise RuntimeError(
-            "\n".join(
-                [
-                    f"Command failed: {' '.join(cmd)}",
-                    "--- stdout ---",
-                    "".join(stdout_lines).strip(),
-                    "--- stderr ---",
-                    "".join(stderr_lines).strip(),
-                ]
-            )
-        )
-
-
 def resolve_exercises(values: list[str] | None) -> Iterable[ExerciseIdentifier]:
     if values:
         seen: set[str] = set()
@@ -283,11 +238,131 @@ def determine_variants(
     return [status.variant_id for status in manager.list_variants()]
 
 
+def run_slug(
+    approach_id: str,
+    approach_args: dict[str, Any],
+    selection_metadata: dict[str, dict[str, Any] | None],
+) -> str:
+    slug_components: list[str] = []
+    for key, value in approach_args.items():
+        meta = selection_metadata.get(key)
+        if isinstance(value, bool):
+            if value:
+                slug_components.append(slugify(key))
+            continue
+        if value in (None, ""):
+            continue
+        if meta and meta.get("run_id"):
+            slug_components.append(slugify(str(meta["run_id"])))
+        else:
+            slug_components.append(slugify(str(value)))
+    if not slug_components:
+        slug_components.append(slugify(approach_id))
+    return "-".join(slug_components)
+
+
+def build_run_id(
+    approach_id: str,
+    approach_args: dict[str, Any],
+    selection_metadata: dict[str, dict[str, Any] | None],
+) -> str:
+    slug_base = run_slug(approach_id, approach_args, selection_metadata)
+    time_slug = datetime.now(timezone.utc).strftime("%Y-%m-%d-%H%M")
+    suffix = uuid.uuid4().hex[:6]
+    parts: list[str] = []
+    if slug_base:
+        parts.append(slug_base)
+    parts.extend([time_slug, suffix])
+    return "-".join(parts)
+
+
+def explicit_argument_names(config: dict, extra_args: list[str] | None) -> set[str]:
+    names: set[str] = set()
+    for name in config.get("arguments", {}) or {}:
+        flag = f"--{name.replace('_', '-')}"
+        if any(
+            token == flag or token.startswith(f"{flag}=") for token in extra_args or []
+        ):
+            names.add(name)
+    return names
+
+
+def expand_argument_matrix(
+    config: dict, extra_args: list[str] | None
+) -> list[Tuple[dict[str, Any], dict[str, dict[str, Any] | None]]]:
+    """Parse one set of approach arguments per combination of declared choices.
+
+    Arguments passed explicitly on the command line stay fixed; every other
+    argument with ``choices`` in the approach config becomes a matrix axis.
+    """
+    fixed = explicit_argument_names(config, extra_args)
+    axes: list[tuple[str, list[Any]]] = []
+    for name, spec in (config.get("arguments", {}) or {}).items():
+        if name in fixed:
+            continue
+        choices = [
+            entry.get("id") if isinstance(entry, dict) else entry
+            for entry in (spec or {}).get("choices") or []
+        ]
+        choices = [choice for choice in choices if choice is not None]
+        if choices:
+            axes.append((name, choices))
+    if not axes:
+        return [parse_approach_arguments(config, extra_args)]
+
+    names = [name for name, _ in axes]
+    return [
+        parse_approach_arguments(
+            config, extra_args, extra_defaults=dict(zip(names, values))
+        )
+        for values in itertools.product(*(choices for _, choices in axes))
+    ]
+
+
+# How often a case held back by the budget guard asks again.
+BUDGET_POLL_INTERVAL_S = 0.2
+
+# Outcome of a queued case that was dropped after Ctrl-C.
+CANCELLED = "cancelled"
+CaseOutcome = Union[Tuple[bool, Optional[str]], str, None]
+
+
 @dataclass
 class RunStats:
     executed: int = 0
     skipped: int = 0
     failed: int = 0
+    timed_out: int = 0
+    not_started: int = 0
+    # Cases run again because their existing result file was incomplete.
+    requeued: int = 0
+    # Queued cases dropped after Ctrl-C; they stay pending in the journal.
+    cancelled: int = 0
+
+
+@dataclass
+class BenchmarkRun:
+    run_id: str
+    approach_args: dict[str, Any]
+    results_dir: Path
+    limiter: ConcurrencyLimiter
+    rate_limiter: RateLimiter | None
+    attempt_log: AttemptLog
+    journal: RunJournal
+    case_timeout_s: float | None = None
+    stats: RunStats = field(default_factory=RunStats)
+    errors: list[str] = field(default_factory=list)
+    schedule: dict[str, Any] = field(default_factory=dict)
+    matrix: dict[str, Any] | None = None
+    shard: dict[str, Any] | None = None
+    metadata_path: Path | None = None
+
+    def result_path(self, case_id: str) -> Path:
+        return self.results_dir / f"{case_id}.json"
+
+    def log_path(self, case_id: str) -> Path:
+        """Where the output of a subprocess entrypoint is kept for ``case_id``."""
+        return self.results_dir.parent / "logs" / f"{case_id}.log"
 
 
 @dataclass
@@ -296,6 +371,332 @@ class CaseTask:
     variant_id: str
     case_id: str
     target_path: Path
+    run: BenchmarkRun
+
+
+def warm_up_args(
+    configurations: Sequence[Tuple[dict[str, Any], Any]]
+) -> list[dict[str, Any]]:
+    """The distinct approach arguments of ``configurations``, to warm up once each."""
+    distinct: dict[str, dict[str, Any]] = {}
+    for approach_args, _selection in configurations:
+        distinct.setdefault(
+            json.dumps(approach_args, sort_keys=True, default=str), approach_args
+        )
+    return list(distinct.values())
+
+
+def prepare_approach(
+    config: dict,
+    config_path: Path,
+    approach_args_list: list[dict[str, Any]],
+    *,
+    force: bool = False,
+) -> None:
+    """Run ``entrypoints.prepare`` for each configuration that is not prepared yet.
+
+    A marker under ``runs/.prepare`` records each completed preparation by the
+    fingerprint of its inputs, so unchanged configurations are skipped on the
+    next run or resume. ``force`` runs the entrypoint regardless.
+    """
+    prepare_entrypoint = (config.get("entrypoints", {}) or {}).get("prepare")
+    if not prepare_entrypoint:
+        return
+    approach_id = config.get("approach_id") or Path(config_path).stem
+    for approach_args in approach_args_list:
+        fingerprint = prepare_fingerprint(config, config_path, approach_args)
+        if not force and is_prepared(approach_id, fingerprint):
+            print(
+                f"[prepare] Skipping prepare for {json.dumps(approach_args, default=str)}: "
+                "inputs unchanged since it last completed (--force-prepare to rerun)"
+            )
+            continue
+        started = time.perf_counter()
+        try:
+            run_entrypoint(
+                prepare_entrypoint,
+                approach_args=approach_args,
+                extra_flags={"config": str(config_path)},
+            )
+        except Exception as exc:  # noqa: BLE001 - preparation errors for visibility
+            raise RuntimeError(f"Failed to run prepare entrypoint: {exc}") from exc
+        mark_prepared(
+            approach_id,
+            fingerprint,
+            approach_args=approach_args,
+            duration_s=time.perf_counter() - started,
+        )
+
+
+def preflight_models(
+    config: dict,
+    approach_args_list: list[dict[str, Any]],
+    *,
+    timeout_s: float | None,
+) -> dict[str, ProbeResult]:
+    """Probe each distinct model once through ``entrypoints.preflight``.
+
+    Returns nothing when the approach has no probe or it cannot be imported;
+    the caller decides what a failed probe means for the run.
+    """
+    spec = (config.get("entrypoints", {}) or {}).get("preflight")
+    try:
+        probe = load_preflight_entrypoint(spec)
+    except (ImportError, AttributeError, ValueError) as exc:
+        print(f"Warning: skipping the pre-flight check: {exc}")
+        return {}
+    if probe is None:
+        return {}
+    results = run_preflight(probe, approach_args_list, timeout_s=timeout_s)
+    for result in results.values():
+        if not result.ok:
+            continue
+        latencies = ", ".join(
+            f"{name} {seconds:.2f}s" for name, seconds in result.latencies.items()
+        )
+        print(
+            f"[preflight] {result.model}: "
+            f"{latencies or f'{result.duration_s:.2f}s'}"
+        )
+    return results
+
+
+def open_run(
+    approach_id: str,
+    run_id: str,
+    approach_args: dict[str, Any],
+    *,
+    config: dict,
+    concurrency: ConcurrencyController,
+    retry_policy: RetryPolicy,
+    ignore_rate_limits: bool = False,
+    schedule_policy: str = "fifo",
+    case_timeout_s: float | None = None,
+) -> BenchmarkRun:
+    rate_limiter = None
+    if not ignore_rate_limits:
+        rate_limiter = RateLimiter.from_config(
+            config.get("rate_limits"), approach_args.get("model")
+        )
+    journal = RunJournal(journal_path(approach_id, run_id))
+    run = BenchmarkRun(
+        run_id=run_id,
+        approach_args=approach_args,
+        results_dir=RESULTS_ROOT / approach_id / run_id / "cases",
+        limiter=concurrency.limiter_for(approach_args.get("model")),
+        rate_limiter=rate_limiter,
+        attempt_log=AttemptLog(
+            RESULTS_ROOT / approach_id / run_id / "attempts.jsonl",
+            retry_policy,
+            journal=journal,
+        ),
+        journal=journal,
+        case_timeout_s=resolve_case_timeout(
+            config.get("case_timeouts"), approach_args.get("model"), case_timeout_s
+        ),
+        schedule={"policy": schedule_policy},
+    )
+    run.results_dir.mkdir(parents=True, exist_ok=True)
+    return run
+
+
+class CaseExecutor:
+    """Materialise a case's variant, run it with retries and clean up after it.
+
+    Shared by ``run-benchmark`` and ``worker``. ``leases`` decides when a
+    variant read by several runs is materialised and cleaned.
+    """
+
+    def __init__(
+        self,
+        entrypoint: CaseEntrypoint | WorkerPool | BatchEntrypoint,
+        leases: VariantLeases,
+        retry_policy: RetryPolicy,
+        *,
+        force_materialize: bool = False,
+        clean_after: bool = False,
+        keep_outputs: bool = False,
+    ) -> None:
+        self.entrypoint = entrypoint
+        self.leases = leases
+        self.retry_policy = retry_policy
+        self.force_materialize = force_materialize
+        self.clean_after = clean_after
+        self.keep_outputs = keep_outputs
+
+    @staticmethod
+    def _discard_result(task: CaseTask) -> None:
+        if task.target_path.exists():
+            task.target_path.unlink()
+
+    def _materialize(self, task: CaseTask) -> Path:
+        return self.leases.acquire(
+            task.case_id,
+            lambda: VariantManager(task.exercise).materialize_variant(
+                task.variant_id,
+                force=self.force_materialize,
+            ),
+        )
+
+    def _release(self, task: CaseTask) -> None:
+        clean = None
+        if self.clean_after:
+            clean = partial(
+                VariantManager(task.exercise).clean_variant,
+                task.variant_id,
+                keep_outputs=self.keep_outputs,
+            )
+        self.leases.release(task.case_id, clean)
+
+    def skip(self, task: CaseTask) -> None:
+        """Return the lease of a case that is dropped without being run."""
+        self._release(task)
+
+    def execute(self, task: CaseTask) -> tuple[bool, str | None]:
+        run = task.run
+        started = time.perf_counter()
+        try:
+            materialized_dir = self._materialize(task)
+        except Exception as exc:  # noqa: BLE001 - CLI reporting
+            self._release(task)
+            message = f"{task.case_id}: materialize failed ({exc})"
+            run.journal.failed(
+                task.case_id, 1, 0.0, failure="materialize", error=str(exc)
+            )
+            return False, message
+        materialize_s = time.perf_counter() - started
+
+        def attempt() -> None:
+            reservation = (
+                run.rate_limiter.acquire(materialized_dir) if run.rate_limiter else None
+            )
+            try:
+                with run.limiter.slot():
+                    self.entrypoint(
+                        input_path=materialized_dir,
+                        output_path=task.target_path,
+                        case_id=task.case_id,
+                        approach_args=run.approach_args,
+                        timeout_s=run.case_timeout_s,
+                        log_path=run.log_path(task.case_id),
+                    )
+            except Exception as exc:
+                # A throttled or overloaded provider consumed no tokens; other
+                # failures may have, so their estimate stays charged.
+                if reservation is not None and congestion_signal(exc):
+                    run.rate_limiter.refund(reservation)
+                raise
+            if reservation is not None:
+                run.rate_limiter.settle(
+                    reservation, read_reported_tokens(task.target_path)
+                )
+
+        try:
+            run_with_retries(
+                task.case_id,
+                attempt,
+                policy=self.retry_policy,
+                log=run.attempt_log,
+                result_path=task.target_path,
+                on_failed_attempt=lambda: self._discard_result(task),
+                stages={MATERIALIZE: materialize_s},
+            )
+            success = True
+            error_message: str | None = None
+        except CaseTimeoutError as exc:
+            success = False
+            error_message = f"{task.case_id}: timed out ({exc})"
+        except Exception as exc:  # noqa: BLE001 - CLI reporting
+            success = False
+            error_message = f"{task.case_id}: run failed ({exc})"
+        finally:
+            self._release(task)
+
+        return success, error_message
+
+    async def execute_async(
+        self, task: CaseTask, writer: ResultWriter
+    ) -> tuple[bool, str | None]:
+        run = task.run
+        started = time.perf_counter()
+        try:
+            materialized_dir = await asyncio.to_thread(self._materialize, task)
+        except Exception as exc:  # noqa: BLE001 - CLI reporting
+            await asyncio.to_thread(self._release, task)
+            message = f"{task.case_id}: materialize failed ({exc})"
+            await asyncio.to_thread(
+                run.journal.failed,
+                task.case_id,
+                1,
+                0.0,
+                failure="materialize",
+                error=str(exc),
+            )
+            return False, message
+        materialize_s = time.perf_counter() - started
+
+        async def attempt() -> None:
+            reservation = (
+                await run.rate_limiter.acquire_async(materialized_dir)
+                if run.rate_limiter
+                else None
+            )
+            try:
+                async with run.limiter.aslot():
+                    payload = await self.entrypoint.acall(
+                        input_path=materialized_dir,
+                        output_path=task.target_path,
+                        case_id=task.case_id,
+                        approach_args=run.approach_args,
+                        timeout_s=run.case_timeout_s,
+                        log_path=run.log_path(task.case_id),
+                    )
+            except Exception as exc:
+                if reservation is not None and congestion_signal(exc):
+                    await asyncio.to_thread(run.rate_limiter.refund, reservation)
+                raise
+            if payload is not None:
+                with stage(RESULT_WRITE):
+                    await writer.write(task.target_path, payload)
+            if reservation is not None:
+                actual_tokens = (
+                    reported_tokens(payload)
+                    if payload is not None
+                    else await asyncio.to_thread(read_reported_tokens, task.target_path)
+                )
+                await asyncio.to_thread(
+                    run.rate_limiter.settle, reservation, actual_tokens
+                )
+
+        try:
+            await arun_with_retries(
+                task.case_id,
+                attempt,
+                policy=self.retry_policy,
+                log=run.attempt_log,
+                result_path=task.target_path,
+                on_failed_attempt=lambda: self._discard_result(task),
+                stages={MATERIALIZE: materialize_s},
+            )
+            success = True
+            error_message: str | None = None
+        except CaseTimeoutError as exc:
+            success = False
+            error_message = f"{task.case_id}: timed out ({exc})"
+        except Exception as exc:  # noqa: BLE001 - CLI reporting
+            success = False
+            error_message = f"{task.case_id}: run failed ({exc})"
+        finally:
+            await asyncio.to_thread(self._release, task)
+
+        return success, error_message
+
+
+def relative_config_path(config_path: Path) -> str:
+    try:
+        return str(config_path.relative_to(CONFIGS_ROOT.parent))
+    except ValueError:
+        return str(config_path)
 
 
 def write_run_metadata(
@@ -304,26 +705,29 @@ def write_run_metadata(
     approach_args: dict[str, Any],
     config_path: Path,
     stats: RunStats | None = None,
+    extra: dict[str, Any] | None = None,
 ) -> Path:
     runs_dir = RUNS_ROOT / approach_id
     runs_dir.mkdir(parents=True, exist_ok=True)
     target = runs_dir / f"{run_id}.yaml"
 
-    try:
-        relative_config = str(config_path.relative_to(CONFIGS_ROOT.parent))
-    except ValueError:
-        relative_config = str(config_path)
-
     payload: dict[str, Any] = {
         "approach_id": approach_id,
         "run_id": run_id,
         "args": {**approach_args},
-        "config_path": relative_config,
+        "config_path": relative_config_path(config_path),
         "generated_at": datetime.now(timezone.utc).isoformat(),
     }
     if stats is not None:
         payload["cases_executed"] = stats.executed
         payload["cases_failed"] = stats.failed
+        payload["cases_timed_out"] = stats.timed_out
+        if stats.requeued:
+            payload["cases_requeued"] = stats.requeued
+        if stats.cancelled:
+            payload["cases_cancelled"] = stats.cancelled
+    if extra:
+        payload.update(extra)
 
     if yaml is None:
         target.write_text(json.dumps(payload, indent=2), encoding="utf-8")
@@ -333,12 +737,186 @@ def write_run_metadata(
     return target
 
 
+def format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}h{minutes:02d}m"
+    return f"{minutes}m{seconds:02d}s" if minutes else f"{seconds}s"
+
+
+def dry_run(
+    args: argparse.Namespace,
+    *,
+    approach_id: str,
+    config: dict,
+    configurations: Sequence[Tuple[dict[str, Any], dict[str, dict[str, Any] | None]]],
+    repetitions: int,
+    max_concurrency: int,
+) -> int:
+    """Project tokens, cost and wall time of a run without calling any model.
+
+    Every selected variant is materialised (and cleaned again if it was not
+    materialised before) and the approach's ``estimate_case`` entrypoint
+    renders the prompts each configuration would send.
+    """
+    entrypoints = config.get("entrypoints", {}) or {}
+    renderer = load_estimate_entrypoint(entrypoints.get("estimate_case"))
+    tokenizer = load_tokenizer() if renderer is not None else None
+    rate_limits = config.get("rate_limits") or {}
+    estimate_section = rate_limits.get("estimate") or {}
+    chars_per_token = float(
+        estimate_section.get("chars_per_token", DEFAULT_CHARS_PER_TOKEN)
+    )
+    requests_per_case = int(
+        estimate_section.get("requests_per_case", DEFAULT_REQUESTS_PER_CASE)
+    )
+    prices = (config.get("pricing") or {}).get("models") or {}
+
+    variant_filter = args.variant or None
+    if variant_filter and len(args.exercise or []) != 1:
+        raise ValueError("--variant requires exactly one --exercise to be specified")
+
+    census: list[dict[str, PromptCensus]] = [{} for _ in configurations]
+    for exercise in resolve_exercises(args.exercise):
+        manager = VariantManager(exercise)
+        materialized = {
+            status.variant_id
+            for status in manager.list_variants()
+            if status.is_materialized
+        }
+        for variant_id in determine_variants(manager, variant_filter):
+            case_id = f"{exercise.relative}/{variant_id}"
+            input_path = manager.materialize_variant(variant_id)
+            try:
+                for index, (approach_args, _) in enumerate(configurations):
+                    census[index][case_id] = take_census(
+                        input_path,
+                        approach_args,
+                        renderer=renderer,
+                        tokenizer=tokenizer,
+                        requests_per_case=requests_per_case,
+                    )
+            finally:
+                if variant_id not in materialized:
+                    manager.clean_variant(variant_id, keep_outputs=True)
+
+    estimates = [
+        estimate_configuration(
+            approach_id,
+            approach_args,
+            census[index],
+            repetitions=repetitions,
+            chars_per_token=chars_per_token,
+            completion_tokens=int(
+                estimate_section.get("completion_tokens", DEFAULT_COMPLETION_TOKENS)
+            ),
+            price=prices.get(approach_args.get("model")),
+        )
+        for index, (approach_args, _) in enumerate(configurations)
+    ]
+    wall_time = estimate_wall_time(estimates, max_concurrency, rate_limits)
+
+    print("Dry run: nothing is executed and no model is called.")
+    if renderer is None:
+        print(
+            "The approach has no 'entrypoints.estimate_case'; every request is assumed "
+            f"to carry the whole variant at {chars_per_token:g} characters per token."
+        )
+    elif tokenizer is not None:
+        print(f"Prompt tokens counted with tiktoken ({TOKENIZER_ENCODING}).")
+    else:
+        print(
+            f"Prompt tokens estimated at {chars_per_token:g} characters per token "
+            "(tiktoken is not available offline)."
+        )
+    runs_label = (
+        f"at most {repetitions}" if args.adaptive_repetitions else str(repetitions)
+    )
+    for (approach_args, selection_metadata), estimate in zip(configurations, estimates):
+        slug = run_slug(approach_id, approach_args, selection_metadata)
+        cost = (
+            f"${estimate.cost_usd:.2f}"
+            if estimate.cost_usd is not None
+            else "unknown cost"
+        )
+        method = estimate.method
+        print(
+            f"{slug}: {runs_label} run(s) x {estimate.cases} case(s), "
+            f"{estimate.requests} request(s), {estimate.prompt_tokens} prompt + "
+            f"{estimate.completion_tokens} completion tokens, {cost}"
+        )
+        if method["calibrated_cases"]:
+            print(
+                f"  prompt tokens scaled by {method['calibration']:g} to match the usage "
+                f"reported for {method['calibrated_cases']} case(s) in "
+                f"{method['history_runs']} earlier run(s)"
+            )
+        if method["price_source"] == "history":
+            print(
+                "  priced at the rates implied by earlier results (no 'pricing' entry)"
+            )
+
+    costs = [estimate.cost_usd for estimate in estimates]
+    if all(cost is None for cost in costs):
+        total_cost = "unknown cost"
+    else:
+        total_cost = f"${sum(cost for cost in costs if cost is not None):.2f}"
+        if None in costs:
+            total_cost += (
+                f" (without {costs.count(None)} configuration(s) that have no price)"
+            )
+    print(
+        f"Projected total: {sum(e.total_tokens for e in estimates)} tokens, {total_cost}"
+    )
+    if wall_time["makespan_s"] is not None:
+        line = (
+            f"Projected wall time at --max-concurrency {max_concurrency}: "
+            f"{format_duration(wall_time['wall_time_s'])}"
+        )
+        if wall_time["wall_time_s"] != wall_time["makespan_s"]:
+            line += " (bound by rate limits)"
+        print(line)
+    elif wall_time["rate_limit_floor_s"] is not None:
+        print(
+            "No duration history for every configuration; rate limits alone need at "
+            f"least {format_duration(wall_time['rate_limit_floor_s'])}."
+        )
+    else:
+        print("No duration history for every configuration; wall time is unknown.")
+    return 0
+
+
 def run_benchmark(args: argparse.Namespace) -> int:
     config_path = Path(args.config)
     config = load_config(config_path)
 
     default_approach = config.get("approach_id", "pecv-reference")
 
+    repetitions = args.repetitions
+    if repetitions < 1:
+        raise ValueError("--repetitions must be at least 1")
+    min_repetitions = args.min_repetitions
+    if args.adaptive_repetitions:
+        if not 2 <= min_repetitions <= repetitions:
+            raise ValueError(
+                "--adaptive-repetitions needs 2 <= --min-repetitions <= --repetitions "
+                "(the maximum)"
+            )
+        if args.target_ci_half_width <= 0:
+            raise ValueError("--target-ci-half-width must be positive")
+        if args.enqueue or args.shard:
+            raise ValueError(
+                "--adaptive-repetitions decides on further repetitions from finished "
+                "results and cannot be combined with --enqueue or --shard"
+            )
+    multi_run = args.matrix or repetitions > 1
+    if multi_run and (args.resume_run or args.resume_run_id):
+        raise ValueError(
+            "--matrix and --repetitions create new runs and cannot be combined with "
+            "--resume-run or --resume-run-id"
+        )
+
     resume_path: Path | None = None
     resume_run_id = args.resume_run_id
     if args.resume_run:
@@ -399,85 +977,205 @@ def run_benchmark(args: argparse.Namespace) -> int:
         or config.get("approach_id", "pecv-reference")
     )
 
+    resuming = bool(resume_metadata) or bool(resume_run_id)
+    shard = parse_shard(args.shard) if args.shard else None
+    shard_by = args.shard_by
+    stored_shard = (resume_metadata or {}).get("shard")
+    if resuming and stored_shard:
+        shard = (int(stored_shard["index"]), int(stored_shard["count"]))
+        shard_by = stored_shard.get("strategy", shard_by)
+    elif shard is not None and resuming:
+        raise ValueError("--shard cannot be added to a run that was not sharded")
+    elif shard is not None and not args.run_id:
+        raise ValueError(
+            "--shard requires --run-id so that every shard derives the same run id"
+        )
+
     stored_args = (resume_metadata or {}).get("args", {})
     defaults_from_resume = {
         key: value for key, value in stored_args.items() if key != "exercises"
     }
     extra_args = getattr(args, "_extra_args", [])
-    approach_args, selection_metadata = parse_approach_arguments(
-        config,
-        extra_args,
-        extra_defaults=defaults_from_resume,
-    )
+    if args.matrix:
+        configurations = expand_argument_matrix(config, extra_args)
+    else:
+        configurations = [
+            parse_approach_arguments(
+                config,
+                extra_args,
+                extra_defaults=defaults_from_resume,
+            )
+        ]
 
     entrypoints = config.get("entrypoints", {}) or {}
-    run_case_entrypoint = entrypoints.get("run_case")
-    if not run_case_entrypoint:
+    run_case_spec = entrypoints.get("run_case")
+    run_batch_spec = entrypoints.get("run_batch")
+    if not run_case_spec and not run_batch_spec:
         raise ValueError(
-            "Approach configuration must provide an 'entrypoints.run_case'"
+            "Approach configuration must provide an 'entrypoints.run_case' "
+            "or 'entrypoints.run_batch'"
         )
 
-    prepare_entrypoint = entrypoints.get("prepare")
-    if prepare_entrypoint:
-        try:
-            run_entrypoint(
-                prepare_entrypoint,
-                approach_args=approach_args,
-                extra_flags={"config": str(config_path)},
-            )
-        except Exception as exc:  # noqa: BLE001 - preparation errors for visibility
-            raise RuntimeError(f"Failed to run prepare entrypoint: {exc}") from exc
+    max_concurrency = args.max_concurrency or 1
+    if max_concurrency < 1:
+        raise ValueError("--max-concurrency must be at least 1")
+    if args.case_timeout is not None and args.case_timeout <= 0:
+        raise ValueError("--case-timeout must be positive")
+    if args.preflight_timeout <= 0:
+        raise ValueError("--preflight-timeout must be positive")
+    budget = BudgetGuard(
+        max_cost_usd=args.max_cost_usd, max_tokens=args.max_total_tokens
+    )
+    if budget.enabled and args.enqueue:
+        raise ValueError(
+            "--max-cost-usd and --max-total-tokens cannot be used with --enqueue"
+        )
+    if args.progress_interval is not None and args.progress_interval <= 0:
+        raise ValueError("--progress-interval must be positive")
+    retry_policy = RetryPolicy(
+        max_attempts=args.max_attempts,
+        base_delay_s=args.retry_base_delay,
+        max_delay_s=args.retry_max_delay,
+    )
 
-    slug_components: list[str] = []
-    for key, value in approach_args.items():
-        meta = selection_metadata.get(key)
-        if isinstance(value, bool):
-            if value:
-                slug_components.append(slugify(key))
-            continue
-        if value in (None, ""):
-            continue
-        if meta and meta.get("run_id"):
-            slug_components.append(slugify(str(meta["run_id"])))
-        else:
-            slug_components.append(slugify(str(value)))
-    if not slug_components:
-        slug_components.append(slugify(approach_id))
-    slug_base = "-".join(slug_components)
+    if args.dry_run:
+        if resuming or args.enqueue or shard is not None:
+            raise ValueError(
+                "--dry-run estimates a new run and cannot be combined with --resume-run, "
+                "--resume-run-id, --enqueue or --shard"
+            )
+        return dry_run(
+            args,
+            approach_id=approach_id,
+            config=config,
+            configurations=configurations,
+            repetitions=repetitions,
+            max_concurrency=max_concurrency,
+        )
 
-    if resume_metadata and "run_id" in resume_metadata:
-        default_run_id = resume_metadata["run_id"]
-    elif resume_run_id:
-        default_run_id = resume_run_id
+    # Approaches receive the arguments of each case with the call itself; the
+    # start-up arguments of long-lived entrypoints only matter for a single run.
+    startup_args = configurations[0][0] if len(configurations) == 1 else {}
+    engine = getattr(args, "engine", "threads")
+    run_case_entrypoint: CaseEntrypoint | WorkerPool | BatchEntrypoint | None = None
+    if args.enqueue:
+        if not run_case_spec:
+            raise ValueError("--enqueue requires an 'entrypoints.run_case'")
+    elif run_batch_spec:
+        if engine == "workers":
+            raise ValueError("--engine workers cannot drive an 'entrypoints.run_batch'")
+        run_case_entrypoint = BatchEntrypoint(
+            str(run_batch_spec),
+            approach_args=startup_args,
+            max_in_flight=max_concurrency,
+        )
+    elif engine == "workers":
+        run_case_entrypoint = WorkerPool(
+            run_case_spec,
+            size=max_concurrency,
+            warm_up_args=warm_up_args(configurations),
+            max_cases_per_worker=args.worker_max_cases,
+            max_rss_mb=args.worker_max_rss_mb,
+        )
     else:
-        time_slug = datetime.now(timezone.utc).strftime("%Y-%m-%d-%H%M")
-        suffix = uuid.uuid4().hex[:6]
-        parts: list[str] = []
-        if slug_base:
-            parts.append(slug_base)
-        parts.extend([time_slug, suffix])
-        default_run_id = "-".join(parts)
-
-    run_id = args.run_id or default_run_id
-
-    results_dir = RESULTS_ROOT / approach_id / run_id / "cases"
-    results_dir.mkdir(parents=True, exist_ok=True)
+        run_case_entrypoint = load_case_entrypoint(
+            run_case_spec, child_output=args.child_output
+        )
 
-    stats = RunStats()
-    if resume_metadata:
-        stats.executed = int(resume_metadata.get("cases_executed", 0))
-        stats.skipped = int(resume_metadata.get("cases_skipped", 0))
-        # Always recompute failures for the current run to avoid carrying over past state
-        stats.failed = 0
+    # Workers prepare the approach on their own machine when they start.
+    preflight_results: dict[str, ProbeResult] = {}
+    if not args.enqueue:
+        prepare_approach(
+            config,
+            config_path,
+            [approach_args for approach_args, _ in configurations],
+            force=args.force_prepare,
+        )
+        if not args.skip_preflight:
+            preflight_results = preflight_models(
+                config,
+                [approach_args for approach_args, _ in configurations],
+                timeout_s=args.preflight_timeout,
+            )
+        failed = [result for result in preflight_results.values() if not result.ok]
+        if failed:
+            for result in failed:
+                print(
+                    f"Error: pre-flight check failed for {result.model}: {result.error}"
+                )
+            print(
+                "No cases were started. Check the credentials and the connection to the "
+                "provider, or pass --skip-preflight."
+            )
+            return 1
 
-    metadata_path = write_run_metadata(
-        approach_id=approach_id,
-        run_id=run_id,
-        approach_args=approach_args,
-        config_path=config_path,
+    concurrency = ConcurrencyController(
+        max_concurrency=max_concurrency,
+        adaptive=args.adaptive_concurrency,
+        initial=args.initial_concurrency,
     )
-
-    errors: list[str] = []
+    matrix_id = (args.run_id or uuid.uuid4().hex[:8]) if multi_run else None
+
+    def open_repetition(config_index: int, repetition: int) -> BenchmarkRun:
+        approach_args, selection_metadata = configurations[config_index]
+        if resume_metadata and "run_id" in resume_metadata:
+            run_id = resume_metadata["run_id"]
+        elif resume_run_id:
+            run_id = resume_run_id
+        elif args.run_id and multi_run:
+            # The run id is a prefix shared by every run of the matrix.
+            run_id = "-".join(
+                [args.run_id, run_slug(approach_id, approach_args, selection_metadata)]
+                + ([f"r{repetition}"] if repetitions > 1 else [])
+            )
+        elif args.run_id:
+            run_id = args.run_id
+        else:
+            run_id = build_run_id(approach_id, approach_args, selection_metadata)
+        base_run_id = run_id
+        if shard is not None and not resuming:
+            run_id = shard_run_id(base_run_id, *shard)
+
+        run = open_run(
+            approach_id,
+            run_id,
+            approach_args,
+            config=config,
+            concurrency=concurrency,
+            retry_policy=retry_policy,
+            ignore_rate_limits=args.ignore_rate_limits,
+            schedule_policy=args.schedule,
+            case_timeout_s=args.case_timeout,
+        )
+        if multi_run:
+            run.matrix = {
+                "id": matrix_id,
+                "configuration": config_index + 1,
+                "configurations": len(configurations),
+                "repetition": repetition,
+                "repetitions": repetitions,
+            }
+        if shard is not None:
+            run.shard = stored_shard or {
+                "index": shard[0],
+                "count": shard[1],
+                "strategy": shard_by,
+                "base_run_id": base_run_id,
+            }
+        if resume_metadata:
+            run.stats.executed = int(resume_metadata.get("cases_executed", 0))
+            run.stats.skipped = int(resume_metadata.get("cases_skipped", 0))
+            # Always recompute failures for the current run to avoid carrying
+            # over past state
+            run.stats.failed = 0
+        return run
+
+    first_round = min_repetitions if args.adaptive_repetitions else repetitions
+    runs: list[BenchmarkRun] = [
+        open_repetition(config_index, repetition)
+        for config_index in range(len(configurations))
+        for repetition in range(1, first_round + 1)
+    ]
 
     requested_exercises = args.exercise
     if not requested_exercises and stored_args.get("exercises"):
@@ -487,108 +1185,655 @@ def run_benchmark(args: argparse.Namespace) -> int:
     if variant_filter and len(requested_exercises or []) != 1:
         raise ValueError("--variant requires exactly one --exercise to be specified")
 
-    skip_existing = args.skip_existing or bool(resume_metadata) or bool(resume_run_id)
+    skip_existing = args.skip_existing or resuming
 
-    tasks: list[CaseTask] = []
+    tasks_by_run: dict[str, list[CaseTask]] = {run.run_id: [] for run in runs}
 
-    for exercise in resolve_exercises(requested_exercises):
-        manager = VariantManager(exercise)
-        variants_to_run = determine_variants(manager, variant_filter)
-        if not variants_to_run:
-            continue
+    exercise_chars: dict[str, int] = {}
 
-        for variant_id in variants_to_run:
-            case_id = f"{exercise.relative}/{variant_id}"
-            target_path = (
-                results_dir / exercise.course / exercise.exercise / f"{variant_id}.json"
-            )
-            target_path.parent.mkdir(parents=True, exist_ok=True)
+    def exercise_size(exercise: ExerciseIdentifier) -> int:
+        key = exercise.relative
+        if key not in exercise_chars:
+            exercise_chars[key] = prompt_chars(DATA_ROOT / key, BASE_ARTIFACTS)
+        return exercise_chars[key]
 
-            if skip_existing and target_path.exists():
-                stats.skipped += 1
-                continue
+    history_by_args: dict[str, tuple[dict[str, list[float]], int]] = {}
 
-            tasks.append(
-                CaseTask(
-                    exercise=exercise,
-                    variant_id=variant_id,
-                    case_id=case_id,
-                    target_path=target_path,
-                )
+    def history_for(run: BenchmarkRun) -> tuple[dict[str, list[float]], int]:
+        # Shards ignore the results of their sibling shards: a shard that starts
+        # after another has finished cases must still compute the same split.
+        base_run_id = run.shard.get("base_run_id") if run.shard else None
+        history_key = json.dumps(
+            [run.approach_args, base_run_id], sort_keys=True, default=str
+        )
+        if history_key not in history_by_args:
+            history_by_args[history_key] = load_historical_durations(
+                approach_id,
+                run.approach_args,
+                exclude_run_id=run.run_id,
+                exclude_shards_of=base_run_id,
             )
+        return history_by_args[history_key]
+
+    def add_task(
+        run: BenchmarkRun, exercise: ExerciseIdentifier, variant_id: str
+    ) -> None:
+        case_id = f"{exercise.relative}/{variant_id}"
+        target_path = run.result_path(case_id)
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+        tasks_by_run.setdefault(run.run_id, []).append(
+            CaseTask(
+                exercise=exercise,
+                variant_id=variant_id,
+                case_id=case_id,
+                target_path=target_path,
+                run=run,
+            )
+        )
 
-    max_concurrency = args.max_concurrency or 1
-    if max_concurrency < 1:
-        raise ValueError("--max-concurrency must be at least 1")
+    def requeue_invalid(run: BenchmarkRun, case_id: str, problem: str) -> None:
+        run.stats.requeued += 1
+        print(f"[{run.run_id}] Re-running {case_id}: result file is {problem}.")
 
-    def execute_case(task: CaseTask) -> tuple[bool, str | None]:
-        manager = VariantManager(task.exercise)
-        try:
-            materialized_dir = manager.materialize_variant(
-                task.variant_id,
-                force=args.force_materialize,
+    recorded_sizes: dict[str, dict[str, int]] = {}
+
+    def existing_result_problem(run: BenchmarkRun, case_id: str) -> str | None:
+        # The sizes journaled when cases finished catch truncated files
+        # without parsing them.
+        if run.run_id not in recorded_sizes:
+            recorded_sizes[run.run_id] = run.journal.load().result_bytes
+        return check_result_file(
+            run.result_path(case_id), recorded_sizes[run.run_id].get(case_id)
+        )
+
+    cases: list[tuple[ExerciseIdentifier, str]] = []
+
+    def add_cases(new_runs: list[BenchmarkRun]) -> None:
+        for exercise, variant_id in cases:
+            for run in new_runs:
+                if skip_existing:
+                    case_id = f"{exercise.relative}/{variant_id}"
+                    problem = existing_result_problem(run, case_id)
+                    if problem is None:
+                        run.stats.skipped += 1
+                        continue
+                    if problem != "missing":
+                        requeue_invalid(run, case_id, problem)
+                add_task(run, exercise, variant_id)
+
+    # A resumed run takes its remaining work from the journal: a case is done
+    # once it has a ``finished`` event and its result file still matches the
+    # size recorded there, so half-written results are redone. Runs recorded
+    # before the journal existed fall back to the results tree.
+    journal_state = None
+    if resuming:
+        journal_state = runs[0].journal.load()
+        if not journal_state.queued:
+            journal_state = None
+
+    if journal_state is not None:
+        run = runs[0]
+        invalid: set[str] = set()
+        for case_id in sorted(journal_state.finished):
+            problem = check_result_file(
+                run.result_path(case_id), journal_state.result_bytes.get(case_id)
             )
-        except Exception as exc:  # noqa: BLE001 - CLI reporting
-            message = f"{task.case_id}: materialize failed ({exc})"
-            return False, message
+            if problem is not None:
+                requeue_invalid(run, case_id, problem)
+                invalid.add(case_id)
+        run.stats.skipped += len(journal_state.finished) - len(invalid)
+        budget.add_prior_spend(
+            journal_state.cost_usd, journal_state.tokens, len(journal_state.finished)
+        )
+        for case_id in sorted(journal_state.pending() | invalid):
+            exercise_path, variant_id = case_id.rsplit("/", 1)
+            exercise = ExerciseIdentifier.parse(exercise_path)
+            if args.exercise and exercise.relative not in {
+                ExerciseIdentifier.parse(value).relative for value in args.exercise
+            }:
+                continue
+            if variant_filter and variant_id not in variant_filter:
+                continue
+            add_task(run, exercise, variant_id)
+    else:
+        for exercise in resolve_exercises(requested_exercises):
+            manager = VariantManager(exercise)
+            for variant_id in determine_variants(manager, variant_filter):
+                cases.append((exercise, variant_id))
+
+        if shard is not None:
+            # Shards split whole cases, so every run of a matrix reads a given
+            # variant on the same machine and it is materialised only once.
+            case_ids = [
+                f"{exercise.relative}/{variant_id}" for exercise, variant_id in cases
+            ]
+            if shard_by == SHARD_BY_DURATION:
+                weights = dict.fromkeys(case_ids, 0.0)
+                for run in runs:
+                    history, _history_runs = history_for(run)
+                    expected, _estimated, _has_history = estimate_durations(
+                        cases,
+                        case_id=lambda case: f"{case[0].relative}/{case[1]}",
+                        size=lambda case: exercise_size(case[0]),
+                        history=history,
+                    )
+                    for case_id, duration in zip(case_ids, expected):
+                        weights[case_id] += duration
+                assignment = balanced_shards(list(weights.items()), shard[1])
+            else:
+                assignment = hash_shards(case_ids, shard[1])
+            for run in runs:
+                run.shard["total_cases"] = len(cases)
+            cases = [
+                case
+                for case, case_id in zip(cases, case_ids)
+                if assignment[case_id] == shard[0]
+            ]
+            for run in runs:
+                run.shard["assigned_cases"] = len(cases)
+
+        add_cases(runs)
+
+    def affinity_key(task: CaseTask) -> tuple[Any, str]:
+        # Variants of an exercise share most of their prompt, but a provider's
+        # prompt cache only serves requests to the same model.
+        return task.run.approach_args.get("model"), task.exercise.relative
+
+    def schedule(new_runs: list[BenchmarkRun]) -> list[CaseTask]:
+        if args.schedule == LONGEST_FIRST:
+            for run in new_runs:
+                if not tasks_by_run[run.run_id]:
+                    continue
+                history, history_runs = history_for(run)
+                tasks_by_run[run.run_id], run.schedule = order_tasks(
+                    tasks_by_run[run.run_id],
+                    args.schedule,
+                    case_id=lambda task: task.case_id,
+                    size=lambda task: exercise_size(task.exercise),
+                    history=history,
+                    history_runs=history_runs,
+                    workers=max_concurrency,
+                )
 
-        try:
-            run_entrypoint(
-                run_case_entrypoint,
-                input_path=materialized_dir,
-                output_path=task.target_path,
-                case_id=task.case_id,
-                approach_args=approach_args,
+        # Alternate between configurations of the same provider and then between
+        # providers, so that no single quota gates the head of the queue.
+        runs_by_provider: dict[str, list[BenchmarkRun]] = {}
+        for run in new_runs:
+            runs_by_provider.setdefault(run.limiter.provider, []).append(run)
+        if args.schedule == AFFINITY:
+            # Whole exercise groups alternate instead, so that the variants of
+            # an exercise still run back to back against the same model.
+            provider_groups = [
+                group_tasks(
+                    [
+                        task
+                        for run in provider_runs
+                        for task in tasks_by_run[run.run_id]
+                    ],
+                    affinity_key,
+                )
+                for provider_runs in runs_by_provider.values()
+            ]
+            for run in new_runs:
+                run.schedule["exercise_groups"] = len(
+                    {affinity_key(task) for task in tasks_by_run[run.run_id]}
+                )
+            return [task for group in interleave(provider_groups) for task in group]
+        return interleave(
+            [
+                interleave([tasks_by_run[run.run_id] for run in provider_runs])
+                for provider_runs in runs_by_provider.values()
+            ]
+        )
+
+    tasks = schedule(runs)
+
+    def run_extra(run: BenchmarkRun) -> dict[str, Any]:
+        extra: dict[str, Any] = {}
+        if run.matrix:
+            extra["matrix"] = run.matrix
+        if run.shard:
+            extra["shard"] = run.shard
+        preflight = preflight_results.get(preflight_key(run.approach_args))
+        if preflight is not None:
+            extra["preflight"] = preflight.describe()
+        return extra
+
+    def record_queued(new_runs: list[BenchmarkRun]) -> None:
+        for run in new_runs:
+            run.journal.queued(task.case_id for task in tasks_by_run[run.run_id])
+            run.metadata_path = write_run_metadata(
+                approach_id=approach_id,
+                run_id=run.run_id,
+                approach_args=run.approach_args,
+                config_path=config_path,
+                extra=run_extra(run),
             )
-            success = True
-            error_message: str | None = None
-        except Exception as exc:  # noqa: BLE001 - CLI reporting
-            success = False
-            error_message = f"{task.case_id}: run failed ({exc})"
-            if task.target_path.exists():
-                task.target_path.unlink()
-        finally:
-            if args.clean_after:
-                manager.clean_variant(
-                    task.variant_id,
-                    keep_outputs=args.keep_outputs,
+
+    record_queued(runs)
+
+    if args.enqueue:
+        queue = WorkQueue(Path(args.enqueue).expanduser())
+        spec = {
+            "config_path": relative_config_path(config_path),
+            "retry": {
+                "max_attempts": retry_policy.max_attempts,
+                "base_delay_s": retry_policy.base_delay_s,
+                "max_delay_s": retry_policy.max_delay_s,
+            },
+            "force_materialize": args.force_materialize,
+            "clean_after": args.clean_after,
+            "keep_outputs": args.keep_outputs,
+            "ignore_rate_limits": args.ignore_rate_limits,
+            "case_timeout": args.case_timeout,
+        }
+        added = queue.enqueue(
+            {
+                run.run_id: (
+                    approach_id,
+                    {
+                        **spec,
+                        "approach_args": run.approach_args,
+                        "extra": run_extra(run),
+                    },
                 )
+                for run in runs
+            },
+            ((task.run.run_id, task.case_id) for task in tasks),
+        )
+        for run in runs:
+            print(f"Run metadata written to {run.metadata_path}")
+        print(
+            f"Enqueued {added} case(s) of {len(runs)} run(s) into {queue.path}. "
+            f"Start workers with: pecv-bench worker --queue {args.enqueue}"
+        )
+        return 0
+
+    case_executor = CaseExecutor(
+        run_case_entrypoint,
+        VariantLeases(task.case_id for task in tasks),
+        retry_policy,
+        force_materialize=args.force_materialize,
+        clean_after=args.clean_after,
+        keep_outputs=args.keep_outputs,
+    )
 
-        return success, error_message
+    progress = ProgressReporter(
+        len(tasks), mode=args.progress, interval_s=args.progress_interval
+    )
 
-    run_interrupted = False
-    try:
-        if tasks:
+    interrupt = GracefulInterrupt()
+
+    # Every task is claimed exactly once, either to run or to be dropped, so
+    # that its variant lease is returned once even when a second Ctrl-C
+    # abandons the queue while slots are still picking up tasks.
+    claimed: set[int] = set()
+    claimed_lock = threading.Lock()
+
+    def claim(task: CaseTask) -> bool:
+        with claimed_lock:
+            if id(task) in claimed:
+                return False
+            claimed.add(id(task))
+            return True
+
+    if budget.enabled:
+        for approach_args, _selection in configurations:
+            budget.seed(*historical_case_usage(approach_id, approach_args))
+
+    # The budget guard holds cases back while the usage of a case is unknown;
+    # a drain ends the wait.
+    def admit_case() -> bool:
+        while True:
+            admitted = budget.admit()
+            if admitted is not None:
+                return admitted
+            if interrupt.draining.wait(BUDGET_POLL_INTERVAL_S):
+                return False
+
+    async def admit_case_async() -> bool:
+        while True:
+            admitted = budget.admit()
+            if admitted is not None:
+                return admitted
+            if interrupt.draining.is_set():
+                return False
+            await asyncio.sleep(BUDGET_POLL_INTERVAL_S)
+
+    # ``None`` stands for a case that the budget guard did not let start and
+    # ``CANCELLED`` for one dropped after Ctrl-C; both stay pending in the
+    # journal for a resumed run.
+    def execute_case(task: CaseTask) -> CaseOutcome:
+        if not claim(task):
+            return CANCELLED
+        if interrupt.draining.is_set():
+            case_executor.skip(task)
+            return CANCELLED
+        if not admit_case():
+            case_executor.skip(task)
+            return CANCELLED if interrupt.draining.is_set() else None
+        progress.case_started()
+        return case_executor.execute(task)
+
+    async def execute_case_async(task: CaseTask, writer: ResultWriter) -> CaseOutcome:
+        if not claim(task):
+            return CANCELLED
+        if interrupt.draining.is_set():
+            await asyncio.to_thread(case_executor.skip, task)
+            return CANCELLED
+        if not await admit_case_async():
+            await asyncio.to_thread(case_executor.skip, task)
+            return CANCELLED if interrupt.draining.is_set() else None
+        progress.case_started()
+        return await case_executor.execute_async(task, writer)
+
+    recorded: set[int] = set()
+    ran: set[int] = set()
+
+    def record_outcome(task: CaseTask, outcome: CaseOutcome) -> None:
+        recorded.add(id(task))
+        if outcome == CANCELLED:
+            task.run.stats.cancelled += 1
+            progress.case_skipped()
+            return
+        if outcome is None:
+            task.run.stats.not_started += 1
+            progress.case_skipped()
+            return
+        ran.add(id(task))
+        success, error_message = outcome
+        budget.case_finished(task.target_path if success else None)
+        progress.case_finished(success, task.target_path)
+        stats = task.run.stats
+        if success:
+            stats.executed += 1
+        elif task.case_id in task.run.attempt_log.timed_out_cases:
+            stats.timed_out += 1
+        else:
+            stats.failed += 1
+        if error_message:
+            task.run.errors.append(error_message)
+
+    def dispatch(round_tasks: list[CaseTask]) -> None:
+        groups = (
+            group_tasks(round_tasks, affinity_key)
+            if args.schedule == AFFINITY
+            else None
+        )
+        if engine == "asyncio":
+            asyncio.run(
+                run_cases_async(
+                    round_tasks,
+                    execute_case_async,
+                    max_concurrency=max_concurrency,
+                    on_result=record_outcome,
+                    groups=groups,
+                )
+            )
+        elif groups is not None:
+            run_affinity_threads(
+                groups,
+                execute_case,
+                max_concurrency=max_concurrency,
+                on_result=record_outcome,
+            )
+        else:
             with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
                 future_to_task = {
-                    executor.submit(execute_case, task): task for task in tasks
+                    executor.submit(execute_case, task): task for task in round_tasks
                 }
-                for future in as_completed(future_to_task):
-                    success, error_message = future.result()
-                    if success:
-                        stats.executed += 1
-                    else:
-                        stats.failed += 1
-                        if error_message:
-                            errors.append(error_message)
+                try:
+                    for future in as_completed(future_to_task):
+                        record_outcome(future_to_task[future], future.result())
+                except KeyboardInterrupt:
+                    # Second Ctrl-C: do not wait for cases that never started.
+                    for future in future_to_task:
+                        future.cancel()
+                    raise
+
+    # Adaptive repetitions: after every round, each configuration whose
+    # micro-F1 interval is still wider than the target gets one more run.
+    active_configurations = set(range(len(configurations)))
+    repetition_decisions: dict[int, dict[str, Any]] = {}
+
+    def decide_repetitions(reason: str | None = None) -> list[BenchmarkRun]:
+        new_runs: list[BenchmarkRun] = []
+        for config_index in sorted(active_configurations):
+            config_runs = [
+                run for run in runs if run.matrix["configuration"] == config_index + 1
+            ]
+            summary = repetition_interval(
+                [collect_case_counts(run.results_dir, DATA_ROOT) for run in config_runs]
+            )
+            stopped = reason
+            if stopped is None:
+                if summary is None:
+                    stopped = "no-scored-cases"
+                elif summary["half_width"] <= args.target_ci_half_width:
+                    stopped = "converged"
+                elif len(config_runs) >= repetitions:
+                    stopped = "max-repetitions"
+                elif budget.stopped:
+                    stopped = "budget"
+            repetition_decisions[config_index] = {
+                "mode": "adaptive",
+                "target_half_width": args.target_ci_half_width,
+                "min_repetitions": min_repetitions,
+                "max_repetitions": repetitions,
+                "completed": len(config_runs),
+                "stopped": stopped,
+                **(summary or {}),
+            }
+            if stopped is None:
+                new_runs.append(open_repetition(config_index, len(config_runs) + 1))
+            else:
+                active_configurations.discard(config_index)
+        return new_runs
+
+    run_interrupted = False
+    startup_probe: threading.Thread | None = None
+    try:
+        interrupt.install()
+        if tasks or args.adaptive_repetitions:
+            if isinstance(run_case_entrypoint, (WorkerPool, BatchEntrypoint)):
+                run_case_entrypoint.start()
+            elif isinstance(run_case_entrypoint, PythonEntrypoint):
+                for approach_args in warm_up_args(configurations):
+                    run_case_entrypoint.warm_up(approach_args)
+            measure_startup = getattr(run_case_entrypoint, "measure_startup", None)
+            if measure_startup is not None:
+                # Timed alongside the cases for the start-up saving in the summary.
+                startup_probe = threading.Thread(target=measure_startup, daemon=True)
+                startup_probe.start()
+            progress.start()
+        if tasks:
+            dispatch(tasks)
+        while (
+            args.adaptive_repetitions
+            and active_configurations
+            and not interrupt.draining.is_set()
+        ):
+            new_runs = decide_repetitions()
+            if not new_runs:
+                break
+            runs.extend(new_runs)
+            add_cases(new_runs)
+            round_tasks = schedule(new_runs)
+            record_queued(new_runs)
+            for task in round_tasks:
+                case_executor.leases.expect(task.case_id)
+            progress.cases_added(len(round_tasks))
+            tasks.extend(round_tasks)
+            dispatch(round_tasks)
     except KeyboardInterrupt:
         run_interrupted = True
-        errors.append("Run interrupted by user")
     finally:
-        metadata_path = write_run_metadata(
-            approach_id=approach_id,
-            run_id=run_id,
-            approach_args=approach_args,
-            config_path=config_path,
-            stats=stats,
-        )
+        interrupt.restore()
+        run_interrupted = run_interrupted or interrupt.draining.is_set()
+        if run_interrupted:
+            # Cases stopped by a second Ctrl-C never reported an outcome; the
+            # ones that never started still hold their variant lease.
+            for task in tasks:
+                if id(task) not in recorded:
+                    task.run.stats.cancelled += 1
+                    if claim(task):
+                        case_executor.skip(task)
+        progress.stop()
+        if args.adaptive_repetitions and active_configurations:
+            decide_repetitions("interrupted" if run_interrupted else "error")
+        if isinstance(run_case_entrypoint, (WorkerPool, BatchEntrypoint)):
+            run_case_entrypoint.close()
+        entrypoint_summary = run_case_entrypoint.describe()
+        if startup_probe is not None and not run_interrupted:
+            startup_probe.join(STARTUP_PROBE_TIMEOUT_S)
+        startup_saved_s = run_case_entrypoint.estimated_startup_saved_s(len(ran))
+        if startup_saved_s is not None:
+            entrypoint_summary["estimated_startup_saved_s"] = startup_saved_s
+        if multi_run:
+            entrypoint_summary["variants_materialized"] = (
+                case_executor.leases.materialized
+            )
+        for run in runs:
+            extra = {
+                "entrypoint": entrypoint_summary,
+                "schedule": run.schedule,
+                "concurrency": concurrency.describe(),
+                "rate_limit": (
+                    run.rate_limiter.describe() if run.rate_limiter else None
+                ),
+                "retries": run.attempt_log.describe(relative_to=RESULTS_ROOT.parent),
+                "journal": str(run.journal.path.relative_to(RUNS_ROOT.parent)),
+                "case_timeout_s": run.case_timeout_s,
+                **run_extra(run),
+            }
+            if budget.enabled:
+                extra["budget"] = {
+                    **budget.describe(),
+                    "cases_not_started": run.stats.not_started,
+                }
+            if budget.stopped:
+                extra["status"] = "budget-stopped"
+            if run_interrupted:
+                extra["status"] = "interrupted"
+            if run.matrix and run.matrix["configuration"] - 1 in repetition_decisions:
+                extra["repetitions"] = repetition_decisions[
+                    run.matrix["configuration"] - 1
+                ]
+            run.metadata_path = write_run_metadata(
+                approach_id=approach_id,
+                run_id=run.run_id,
+                approach_args=run.approach_args,
+                config_path=config_path,
+                stats=run.stats,
+                extra=extra,
+            )
 
-    print(f"Run metadata written to {metadata_path}")
-    print(
-        f"Executed {stats.executed} case(s), skipped {stats.skipped}, "
-        f"failed {stats.failed}."
-    )
+    for run in runs:
+        print(f"Run metadata written to {run.metadata_path}")
+        if run.shard and "assigned_cases" in run.shard:
+            print(
+                f"Shard {run.shard['index']}/{run.shard['count']} "
+                f"({run.shard['strategy']}): {run.shard['assigned_cases']} of "
+                f"{run.shard['total_cases']} case(s)."
+            )
+        if "estimated_makespan_s" in run.schedule:
+            print(
+                f"Longest-first schedule: estimated makespan "
+                f"{run.schedule['estimated_makespan_s']:.0f}s (exercise order: "
+                f"{run.schedule['fifo_estimated_makespan_s']:.0f}s)."
+            )
+        attempt_log = run.attempt_log
+        if attempt_log.retries:
+            wasted_cost = attempt_log.wasted_cost_usd_estimate()
+            cost_note = f", ~${wasted_cost:.4f}" if wasted_cost is not None else ""
+            print(
+                f"Retried {len(attempt_log.retried_cases)} case(s) "
+                f"{attempt_log.retries} time(s); {attempt_log.recovered_cases} "
+                f"recovered ({attempt_log.wasted_s:.1f}s{cost_note} spent on failed "
+                "attempts)."
+            )
+        if run.rate_limiter is not None and run.rate_limiter.waited_s:
+            print(
+                f"Waited {run.rate_limiter.waited_s:.1f}s in total for the "
+                f"'{run.rate_limiter.limit.key}' rate limit."
+            )
+        if attempt_log.timed_out_cases:
+            print(
+                f"{len(attempt_log.timed_out_cases)} case(s) hit the "
+                f"{run.case_timeout_s:g}s case timeout; {attempt_log.timeout_lost_s:.1f} "
+                "slot-second(s) lost to timeouts."
+            )
+        not_started = (
+            f", not started {run.stats.not_started}" if run.stats.not_started else ""
+        )
+        requeued = (
+            f" ({run.stats.requeued} re-run for an incomplete result file)"
+            if run.stats.requeued
+            else ""
+        )
+        print(
+            f"Executed {run.stats.executed} case(s){requeued}, skipped "
+            f"{run.stats.skipped}, failed {run.stats.failed}, timed out "
+            f"{run.stats.timed_out}{not_started}."
+        )
+        if run.stats.cancelled:
+            print(
+                f"Cancelled {run.stats.cancelled} case(s) after Ctrl-C; finish "
+                f"them with --resume-run-id {run.run_id}."
+            )
+    if startup_saved_s is not None:
+        print(
+            f"The {entrypoint_summary['mode']} entrypoint saved an estimated "
+            f"{startup_saved_s:.1f}s of per-case start-up compared with the "
+            "subprocess entrypoint."
+        )
+    if multi_run:
+        print(
+            f"Matrix {matrix_id}: {len(runs)} run(s) shared {case_executor.leases.materialized} "
+            "materialised variant(s)."
+        )
+    for config_index, decision in sorted(repetition_decisions.items()):
+        label = run_slug(approach_id, *configurations[config_index])
+        if "micro_f1" in decision:
+            interval = (
+                f"micro-F1 {decision['micro_f1']:.3f} ± {decision['half_width']:.3f} "
+                f"(dataset interval {decision['dataset_interval'][0]:.3f}–"
+                f"{decision['dataset_interval'][1]:.3f})"
+            )
+        else:
+            interval = "no scored cases"
+        print(
+            f"Adaptive repetitions for {label}: {decision['completed']} of at most "
+            f"{decision['max_repetitions']} run(s), {interval}; stopped: "
+            f"{decision['stopped']}."
+        )
+    if budget.stopped:
+        print(
+            f"Budget reached ({budget.stop_reason}); stopped starting new cases. "
+            "Resume with --resume-run and a higher ceiling to finish the run."
+        )
+    elif budget.enabled:
+        print(
+            f"Budget used: ${budget.cost_usd:.4f} and {budget.tokens} token(s) "
+            "reported by completed cases."
+        )
+    if concurrency.adaptive:
+        for provider, provider_limiter in concurrency.limiters.items():
+            summary = provider_limiter.describe()
+            print(
+                f"Adaptive concurrency for {provider}: started at "
+                f"{summary['initial']}, peaked at {summary['peak_limit']}, ended at "
+                f"{summary['limit']} ({summary['rate_limited']} rate-limited, "
+                f"{summary['server_errors']} server error(s))."
+            )
 
+    errors = [
+        f"{run.run_id}: {error}" if multi_run else error
+        for run in runs
+        for error in run.errors
+    ]
+    if run_interrupted:
+        errors.append("Run interrupted by user")
     if errors:
         print("Encountered issues:")
         for err in errors:
@@ -628,7 +1873,10 @@ def register_subcommand(parser: argparse.ArgumentParser) -> None:
     )
     parser.add_argument(
         "--run-id",
-        help="Explicit run identifier (if omitted, one is generated)",
+        help=(
+            "Explicit run identifier (if omitted, one is generated); with --matrix "
+            "or --repetitions it prefixes the id of every run"
+        ),
     )
     parser.add_argument(
         "--skip-existing",
@@ -659,6 +1907,240 @@ def register_subcommand(parser: argparse.ArgumentParser) -> None:
             "Increase to speed up runs on machines with sufficient capacity."
         ),
     )
+    parser.add_argument(
+        "--adaptive-concurrency",
+        action="store_true",
+        help=(
+            "Adjust the number of in-flight cases between 1 and --max-concurrency: "
+            "grow while latency and error rate stay healthy, halve on 429/5xx "
+            "responses or latency blowups (capped per model provider)"
+        ),
+    )
+    parser.add_argument(
+        "--initial-concurrency",
+        type=int,
+        default=None,
+        help="Starting limit for --adaptive-concurrency (default: 4)",
+    )
+    parser.add_argument(
+        "--matrix",
+        action="store_true",
+        help=(
+            "Run every combination of the argument choices declared in the approach "
+            "config (e.g. all models x reasoning efforts) from one shared queue; "
+            "arguments given explicitly on the command line stay fixed"
+        ),
+    )
+    parser.add_argument(
+        "--repetitions",
+        type=int,
+        default=1,
+        help=(
+            "Independent runs per configuration, each with its own run id; the "
+            "maximum with --adaptive-repetitions (default: 1)"
+        ),
+    )
+    parser.add_argument(
+        "--adaptive-repetitions",
+        action="store_true",
+        help=(
+            "Run --min-repetitions first and add one repetition at a time while the "
+            "bootstrap 95%% interval of a configuration's micro-F1 is wider than "
+            "--target-ci-half-width"
+        ),
+    )
+    parser.add_argument(
+        "--min-repetitions",
+        type=int,
+        default=2,
+        help="Repetitions run before the first stopping decision (default: 2)",
+    )
+    parser.add_argument(
+        "--target-ci-half-width",
+        type=float,
+        default=0.02,
+        help="Stop repeating once the micro-F1 interval is within ± this (default: 0.02)",
+    )
+    parser.add_argument(
+        "--enqueue",
+        default=None,
+        metavar="QUEUE",
+        help=(
+            "Write the cases into a SQLite work queue at QUEUE instead of running "
+            "them; 'pecv-bench worker --queue QUEUE' processes pull and run them"
+        ),
+    )
+    parser.add_argument(
+        "--shard",
+        default=None,
+        metavar="I/N",
+        help=(
+            "Run only the I-th of N deterministic slices of the cases (1-based); "
+            "requires --run-id, and the shard is appended to the run id. Combine "
+            "the shard outputs with merge-runs"
+        ),
+    )
+    parser.add_argument(
+        "--shard-by",
+        choices=SHARD_STRATEGIES,
+        default="hash",
+        help=(
+            "Split cases by a stable hash of the case id, or balance the shards by "
+            "historical duration (every machine needs the same results history; the "
+            "results of the run's own shards are ignored) (default: hash)"
+        ),
+    )
+    parser.add_argument(
+        "--schedule",
+        choices=SCHEDULES,
+        default="fifo",
+        help=(
+            "Order in which cases are started: 'fifo' keeps exercise/variant order; "
+            "'longest-first' starts the cases with the longest historical duration for "
+            "the same model first (prompt size for unseen cases) to shorten the run; "
+            "'exercise-affinity' runs one variant of each exercise first and then the "
+            "rest of its variants close together, so that prompt caches stay warm"
+        ),
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["threads", "workers", "asyncio"],
+        default="threads",
+        help=(
+            "Execution engine: 'threads' runs each case through the configured "
+            "entrypoint from a thread pool; 'workers' keeps --max-concurrency "
+            "pre-warmed worker processes alive for a python run_case entrypoint; "
+            "'asyncio' keeps up to --max-concurrency cases in flight on one event "
+            "loop, awaiting the entrypoint's python_async coroutine when configured"
+        ),
+    )
+    parser.add_argument(
+        "--progress",
+        choices=PROGRESS_MODES,
+        default="auto",
+        help=(
+            "Live progress while cases run: 'line' redraws a status line with counts, "
+            "throughput, p50/p95 latency, tokens/s, cost and ETA; 'json' prints the "
+            "same figures as periodic JSON lines; 'auto' (default) picks 'line' on a "
+            "terminal and 'json' otherwise"
+        ),
+    )
+    parser.add_argument(
+        "--progress-interval",
+        type=float,
+        default=None,
+        help="Seconds between progress updates (default: 1 for 'line', 30 for 'json')",
+    )
+    parser.add_argument(
+        "--case-timeout",
+        type=float,
+        default=None,
+        help=(
+            "Wall-clock limit in seconds for one attempt of a case. The entrypoint "
+            "process is terminated (then killed) or its coroutine cancelled, and the "
+            "case is recorded as timed out instead of retried. Entries under "
+            "'case_timeouts' in the approach config take precedence per model or "
+            "provider (default: no limit)"
+        ),
+    )
+    parser.add_argument(
+        "--force-prepare",
+        action="store_true",
+        help=(
+            "Run the approach's prepare entrypoint even if it already completed for "
+            "the same config, arguments, commit and declared inputs"
+        ),
+    )
+    parser.add_argument(
+        "--skip-preflight",
+        action="store_true",
+        help=(
+            "Start the cases without first sending the approach's pre-flight probe "
+            "('entrypoints.preflight') once per model"
+        ),
+    )
+    parser.add_argument(
+        "--preflight-timeout",
+        type=float,
+        default=DEFAULT_PREFLIGHT_TIMEOUT_S,
+        help=(
+            "Seconds the pre-flight probe of one model may take before the run is "
+            f"aborted (default: {DEFAULT_PREFLIGHT_TIMEOUT_S:g})"
+        ),
+    )
+    parser.add_argument(
+        "--max-cost-usd",
+        type=float,
+        default=None,
+        help=(
+            "Stop starting new cases once the reported cost of completed cases plus "
+            "an estimate for those in flight would exceed this many dollars; the run "
+            "is marked budget-stopped and can be resumed with a higher ceiling"
+        ),
+    )
+    parser.add_argument(
+        "--max-total-tokens",
+        type=int,
+        default=None,
+        help="Like --max-cost-usd, for the total tokens reported by the cases",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help=(
+            "Render the prompts of every selected case without calling a model and "
+            "print the projected tokens, cost and wall time at --max-concurrency"
+        ),
+    )
+    parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=3,
+        help=(
+            "Attempts per case before it is marked as failed (default: 3). Only "
+            "transient failures (timeouts, 429/5xx, unparsable model output) are retried"
+        ),
+    )
+    parser.add_argument(
+        "--retry-base-delay",
+        type=float,
+        default=2.0,
+        help="Backoff before the first retry in seconds, doubled per attempt (default: 2)",
+    )
+    parser.add_argument(
+        "--retry-max-delay",
+        type=float,
+        default=60.0,
+        help="Upper bound for the jittered backoff between attempts (default: 60)",
+    )
+    parser.add_argument(
+        "--ignore-rate-limits",
+        action="store_true",
+        help="Do not enforce the RPM/TPM budgets from the config's rate_limits section",
+    )
+    parser.add_argument(
+        "--child-output",
+        choices=CHILD_OUTPUT_MODES,
+        default="forward",
+        help=(
+            "What subprocess entrypoints print to the terminal: 'forward' (default) "
+            "passes their output through, 'prefix' marks every line with the case id, "
+            "'quiet' prints nothing. The full output is always written to "
+            "results/<approach>/<run_id>/logs/<case>.log"
+        ),
+    )
+    parser.add_argument(
+        "--worker-max-cases",
+        type=int,
+        default=None,
+        help="Recycle a worker process after this many cases (workers engine)",
+    )
+    parser.add_argument(
+        "--worker-max-rss-mb",
+        type=float,
+        default=None,
+        help="Recycle a worker process once its peak RSS exceeds this (workers engine)",
+    )
     parser.add_argument(
         "--resume-run",
         help="Path to an existing run metadata YAML/JSON file to resume",
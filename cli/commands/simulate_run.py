@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+from cli.commands.run import format_duration
+from cli.commands.variants import BASE_ARTIFACTS
+from cli.execution import (
+    SCHEDULES,
+    ScheduleOutcome,
+    estimate_missing_tokens,
+    load_config_rate_limits,
+    load_recorded_run,
+    observed_outcome,
+    recorded_rate_limits,
+    simulate_schedule,
+)
+from cli.execution.rate_limits import (
+    DEFAULT_CHARS_PER_TOKEN,
+    DEFAULT_COMPLETION_TOKENS,
+    DEFAULT_REQUESTS_PER_CASE,
+)
+
+
+def _format_load(outcome: ScheduleOutcome) -> str:
+    return "; ".join(
+        f"{key} {load['requests_per_minute']:g} req/min, "
+        f"{load['tokens_per_minute']:.0f} tok/min"
+        for key, load in outcome.peak_load.items()
+    )
+
+
+def _format_row(outcome: ScheduleOutcome) -> str:
+    concurrency = str(outcome.concurrency) if outcome.concurrency is not None else "-"
+    utilization = (
+        f"{outcome.utilization:.0%}" if outcome.utilization is not None else "-"
+    )
+    return (
+        f"  {outcome.policy:<17} {concurrency:>11} {format_duration(outcome.makespan_s):>9} "
+        f"{utilization:>11} {format_duration(outcome.rate_limit_wait_s):>9} "
+        f"{outcome.peak_in_flight:>9}  {_format_load(outcome)}"
+    )
+
+
+def simulate_run_command(args: argparse.Namespace) -> int:
+    if any(concurrency < 1 for concurrency in args.max_concurrency):
+        raise ValueError("--max-concurrency must be at least 1")
+    for name in ("rpm", "tpm"):
+        value = getattr(args, name)
+        if value is not None and value <= 0:
+            raise ValueError(f"--{name} must be positive")
+
+    try:
+        runs = [load_recorded_run(args.approach, run_id) for run_id in args.run_ids]
+    except ValueError as exc:
+        print(f"Error: {exc}")
+        return 1
+
+    section = None if args.ignore_rate_limits else load_config_rate_limits(runs[0])
+    limits = recorded_rate_limits(runs, section, rpm=args.rpm, tpm=args.tpm)
+    estimate = (section or {}).get("estimate") or {}
+    requests_per_case = args.requests_per_case
+    if requests_per_case is None:
+        requests_per_case = int(
+            estimate.get("requests_per_case", DEFAULT_REQUESTS_PER_CASE)
+        )
+    chars_per_token = float(estimate.get("chars_per_token", DEFAULT_CHARS_PER_TOKEN))
+    estimated = estimate_missing_tokens(
+        runs,
+        BASE_ARTIFACTS,
+        requests_per_case=requests_per_case,
+        chars_per_token=chars_per_token,
+        completion_tokens=int(
+            estimate.get("completion_tokens", DEFAULT_COMPLETION_TOKENS)
+        ),
+    )
+
+    observed = {
+        run.run_id: observed_outcome(run, limits, requests_per_case=requests_per_case)
+        for run in runs
+    }
+    outcomes = [
+        simulate_schedule(
+            runs,
+            limits,
+            policy=policy,
+            concurrency=concurrency,
+            requests_per_case=requests_per_case,
+        )
+        for policy in args.schedule
+        for concurrency in args.max_concurrency
+    ]
+
+    cases = sum(len(run.cases) for run in runs)
+    print(
+        f"Replaying {cases} case(s) from {len(runs)} run(s) at {requests_per_case} "
+        "request(s) per case."
+    )
+    active = {limit.key: limit for limit in limits.values() if limit is not None}
+    for key, limit in sorted(active.items()):
+        parts = [
+            f"{value:g} {unit}"
+            for value, unit in ((limit.rpm, "req/min"), (limit.tpm, "tok/min"))
+            if value
+        ]
+        print(f"Rate limit {key}: {', '.join(parts)}")
+    if estimated:
+        print(
+            f"Warning: {estimated} case(s) report no token usage; their tokens are "
+            f"estimated from the exercise size at {chars_per_token:g} characters per token."
+        )
+    if not active:
+        print("No rate limits apply.")
+    print(
+        f"  {'schedule':<17} {'concurrency':>11} {'makespan':>9} {'utilization':>11} "
+        f"{'rl wait':>9} {'in flight':>9}  peak load"
+    )
+    for outcome in outcomes:
+        print(_format_row(outcome))
+    for run_id, outcome in observed.items():
+        if outcome is None or outcome.utilization is None:
+            continue
+        print(
+            f"Recorded {run_id}: {format_duration(outcome.makespan_s)} for "
+            f"{outcome.cases} case(s), at most {outcome.peak_in_flight} in flight "
+            f"({outcome.utilization:.0%} busy), peak {_format_load(outcome)}"
+        )
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "approach_id": args.approach,
+            "run_ids": list(args.run_ids),
+            "cases": cases,
+            "requests_per_case": requests_per_case,
+            "estimated_token_cases": estimated,
+            "rate_limits": {
+                key: {"rpm": limit.rpm, "tpm": limit.tpm}
+                for key, limit in sorted(active.items())
+            },
+            "recorded": {
+                run_id: outcome.to_dict() if outcome is not None else None
+                for run_id, outcome in observed.items()
+            },
+            "simulated": [outcome.to_dict() for outcome in outcomes],
+        }
+        output_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        print(f"Simulation written to {output_path}")
+    return 0
+
+
+def register_subcommand(parser: argparse.ArgumentParser) -> None:
+    parser.set_defaults(handler=simulate_run_command)
+    parser.add_argument(
+        "run_ids",
+        nargs="+",
+        metavar="RUN_ID",
+        help="Earlier runs whose recorded case durations are replayed together",
+    )
+    parser.add_argument(
+        "--approach",
+        default="pecv-reference",
+        help="Approach identifier under runs/ and results/ (default: pecv-reference)",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        nargs="+",
+        default=[1, 5, 10, 20],
+        help="Concurrency limits to simulate (default: 1 5 10 20)",
+    )
+    parser.add_argument(
+        "--schedule",
+        choices=SCHEDULES,
+        nargs="+",
+        default=list(SCHEDULES),
+        help="Scheduling policies to simulate (default: all)",
+    )
+    parser.add_argument(
+        "--rpm",
+        type=float,
+        default=None,
+        help="Requests per minute per provider, instead of the approach config's rate_limits",
+    )
+    parser.add_argument(
+        "--tpm",
+        type=float,
+        default=None,
+        help="Tokens per minute per provider, instead of the approach config's rate_limits",
+    )
+    parser.add_argument(
+        "--ignore-rate-limits",
+        action="store_true",
+        help="Simulate without the rate_limits section of the approach config",
+    )
+    parser.add_argument(
+        "--requests-per-case",
+        type=int,
+        default=None,
+        help=(
+            "Model requests each case sends, for the peak load "
+            "(default: rate_limits.estimate.requests_per_case, or 1)"
+        ),
+    )
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="Also write the simulation as JSON to this path",
+    )
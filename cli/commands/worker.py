@@ -0,0 +1,349 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import threading
+from pathlib import Path
+from typing import Any
+
+from cli.commands.run import (
+    BenchmarkRun,
+    CaseExecutor,
+    CaseTask,
+    RunStats,
+    load_config,
+    open_run,
+    prepare_approach,
+    write_run_metadata,
+)
+from cli.execution import (
+    CHILD_OUTPUT_MODES,
+    ConcurrencyController,
+    PythonEntrypoint,
+    RetryPolicy,
+    VariantLeases,
+    WorkQueue,
+    load_case_entrypoint,
+)
+from cli.execution.work_queue import (
+    DEFAULT_LEASE_S,
+    DEFAULT_MAX_CLAIMS,
+    DONE,
+    FAILED,
+    LEASED,
+    PENDING,
+    QueuedCase,
+)
+from cli.utils import CONFIGS_ROOT, RUNS_ROOT, ExerciseIdentifier
+
+
+class QueueWorker:
+    """Pull cases from a :class:`WorkQueue` and run them with ``CaseExecutor``.
+
+    Runs are opened lazily the first time one of their cases is claimed, so a
+    worker also picks up runs that were enqueued after it started.
+    """
+
+    def __init__(
+        self,
+        queue: WorkQueue,
+        worker_id: str,
+        *,
+        max_concurrency: int,
+        lease_s: float,
+        max_claims: int,
+        poll_interval_s: float,
+        wait: bool,
+        child_output: str = "forward",
+    ) -> None:
+        self.queue = queue
+        self.worker_id = worker_id
+        self.max_concurrency = max_concurrency
+        self.lease_s = lease_s
+        self.max_claims = max_claims
+        self.poll_interval_s = poll_interval_s
+        self.wait = wait
+        self.child_output = child_output
+
+        self.concurrency = ConcurrencyController(max_concurrency=max_concurrency)
+        self.leases = VariantLeases([])
+        self.runs: dict[str, BenchmarkRun] = {}
+        self.run_specs: dict[str, tuple[str, Path, dict[str, Any]]] = {}
+        self.errors: list[str] = []
+        self.lost_leases = 0
+
+        self._executors: dict[str, CaseExecutor] = {}
+        self._prepared: set[str] = set()
+        self._lock = threading.Lock()
+        self._held: set[int] = set()
+        self._held_lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def _open(self, run_id: str) -> tuple[BenchmarkRun, CaseExecutor]:
+        with self._lock:
+            if run_id in self.runs:
+                config_path = self.run_specs[run_id][1]
+                return self.runs[run_id], self._executors[str(config_path)]
+
+            approach_id, spec = self.queue.runs()[run_id]
+            config_path = Path(spec["config_path"])
+            if not config_path.is_absolute():
+                config_path = CONFIGS_ROOT.parent / config_path
+            config = load_config(config_path)
+            retry_policy = RetryPolicy(**spec["retry"])
+
+            executor = self._executors.get(str(config_path))
+            if executor is None:
+                run_case_spec = (config.get("entrypoints", {}) or {}).get("run_case")
+                if not run_case_spec:
+                    raise ValueError(f"{config_path} has no 'entrypoints.run_case'")
+                executor = CaseExecutor(
+                    load_case_entrypoint(run_case_spec, child_output=self.child_output),
+                    self.leases,
+                    retry_policy,
+                    force_materialize=spec["force_materialize"],
+                    clean_after=spec["clean_after"],
+                    keep_outputs=spec["keep_outputs"],
+                )
+                self._executors[str(config_path)] = executor
+
+            approach_args = spec["approach_args"]
+            prepared_key = json.dumps(
+                [str(config_path), approach_args], sort_keys=True, default=str
+            )
+            if prepared_key not in self._prepared:
+                prepare_approach(config, config_path, [approach_args])
+                if isinstance(executor.entrypoint, PythonEntrypoint):
+                    executor.entrypoint.warm_up(approach_args)
+                self._prepared.add(prepared_key)
+
+            run = open_run(
+                approach_id,
+                run_id,
+                approach_args,
+                config=config,
+                concurrency=self.concurrency,
+                retry_policy=retry_policy,
+                ignore_rate_limits=spec["ignore_rate_limits"],
+                case_timeout_s=spec.get("case_timeout"),
+            )
+            self.runs[run_id] = run
+            self.run_specs[run_id] = (approach_id, config_path, spec)
+            return run, executor
+
+    def _execute(self, entry: QueuedCase) -> tuple[bool, str | None]:
+        try:
+            run, executor = self._open(entry.run_id)
+            exercise_path, variant_id = entry.case_id.rsplit("/", 1)
+            exercise = ExerciseIdentifier.parse(exercise_path)
+            task = CaseTask(
+                exercise=exercise,
+                variant_id=variant_id,
+                case_id=entry.case_id,
+                target_path=run.result_path(entry.case_id),
+                run=run,
+            )
+            task.target_path.parent.mkdir(parents=True, exist_ok=True)
+        except Exception as exc:  # noqa: BLE001 - CLI reporting
+            return False, f"{entry.case_id}: could not start ({exc})"
+        self.leases.expect(task.case_id)
+        success, error_message = executor.execute(task)
+        with self._lock:
+            if success:
+                run.stats.executed += 1
+            elif task.case_id in run.attempt_log.timed_out_cases:
+                run.stats.timed_out += 1
+            else:
+                run.stats.failed += 1
+        return success, error_message
+
+    def _slot(self) -> None:
+        while not self._stop.is_set():
+            entry = self.queue.claim(
+                self.worker_id, lease_s=self.lease_s, max_claims=self.max_claims
+            )
+            if entry is None:
+                counts = self.queue.counts()
+                # Leases held elsewhere may still expire and need a new owner.
+                if not self.wait and counts[PENDING] == 0 and counts[LEASED] == 0:
+                    return
+                self._stop.wait(self.poll_interval_s)
+                continue
+            with self._held_lock:
+                self._held.add(entry.entry_id)
+            try:
+                success, error_message = self._execute(entry)
+            finally:
+                with self._held_lock:
+                    self._held.discard(entry.entry_id)
+            if not self.queue.complete(
+                entry.entry_id, self.worker_id, success=success, error=error_message
+            ):
+                with self._lock:
+                    self.lost_leases += 1
+                continue
+            if error_message:
+                with self._lock:
+                    self.errors.append(f"{entry.run_id}: {error_message}")
+
+    def _heartbeat(self) -> None:
+        while not self._stop.wait(self.lease_s / 3):
+            with self._held_lock:
+                held = set(self._held)
+            try:
+                self.queue.heartbeat(held, self.worker_id, lease_s=self.lease_s)
+            except Exception as exc:  # noqa: BLE001 - keep the worker alive
+                print(f"[worker] heartbeat failed: {exc}")
+
+    def run(self) -> bool:
+        """Process cases until the queue is drained; ``False`` if interrupted."""
+        heartbeat = threading.Thread(target=self._heartbeat, daemon=True)
+        heartbeat.start()
+        slots = [
+            threading.Thread(target=self._slot, daemon=True)
+            for _ in range(self.max_concurrency)
+        ]
+        for slot in slots:
+            slot.start()
+        try:
+            for slot in slots:
+                while slot.is_alive():
+                    slot.join(0.5)
+        except KeyboardInterrupt:
+            self._stop.set()
+            with self._held_lock:
+                held = set(self._held)
+            self.queue.release(held, self.worker_id)
+            return False
+        finally:
+            self._stop.set()
+        return True
+
+    def write_metadata(self) -> list[Path]:
+        written: list[Path] = []
+        for run_id, run in self.runs.items():
+            approach_id, config_path, spec = self.run_specs[run_id]
+            counts = self.queue.counts(run_id)
+            written.append(
+                write_run_metadata(
+                    approach_id=approach_id,
+                    run_id=run_id,
+                    approach_args=run.approach_args,
+                    config_path=config_path,
+                    stats=RunStats(executed=counts[DONE], failed=counts[FAILED]),
+                    extra={
+                        "journal": str(run.journal.path.relative_to(RUNS_ROOT.parent)),
+                        "queue": {"path": str(self.queue.path), **counts},
+                        **(spec.get("extra") or {}),
+                    },
+                )
+            )
+        return written
+
+
+def worker_command(args: argparse.Namespace) -> int:
+    queue_path = Path(args.queue).expanduser()
+    if not queue_path.exists():
+        print(f"Error: work queue not found: {queue_path}")
+        return 1
+    if args.max_concurrency < 1:
+        raise ValueError("--max-concurrency must be at least 1")
+    if args.lease_seconds <= 0:
+        raise ValueError("--lease-seconds must be positive")
+
+    worker = QueueWorker(
+        WorkQueue(queue_path),
+        args.worker_id or f"{socket.gethostname()}-{os.getpid()}",
+        max_concurrency=args.max_concurrency,
+        lease_s=args.lease_seconds,
+        max_claims=args.max_claims,
+        poll_interval_s=args.poll_interval,
+        wait=args.wait,
+        child_output=args.child_output,
+    )
+    completed = worker.run()
+    for metadata_path in worker.write_metadata():
+        print(f"Run metadata written to {metadata_path}")
+    for run_id, run in worker.runs.items():
+        counts = worker.queue.counts(run_id)
+        print(
+            f"{run_id}: this worker executed {run.stats.executed} case(s), failed "
+            f"{run.stats.failed}; queue has {counts[DONE]} done, {counts[FAILED]} "
+            f"failed, {counts[PENDING]} pending, {counts[LEASED]} leased."
+        )
+    if worker.lost_leases:
+        print(
+            f"{worker.lost_leases} case(s) finished after their lease had passed to "
+            "another worker; consider a longer --lease-seconds."
+        )
+
+    errors = list(worker.errors)
+    if not completed:
+        errors.append("Worker interrupted by user; its unfinished cases were requeued")
+    if errors:
+        print("Encountered issues:")
+        for err in errors:
+            print(f"  - {err}")
+        return 1 if completed else 130
+    return 0
+
+
+def register_subcommand(parser: argparse.ArgumentParser) -> None:
+    parser.set_defaults(handler=worker_command)
+    parser.add_argument(
+        "--queue",
+        required=True,
+        help="SQLite work queue written by 'run-benchmark --enqueue'",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=1,
+        help="Cases this worker runs at the same time (default: 1)",
+    )
+    parser.add_argument(
+        "--worker-id",
+        default=None,
+        help="Name recorded on claimed cases (default: <hostname>-<pid>)",
+    )
+    parser.add_argument(
+        "--lease-seconds",
+        type=float,
+        default=DEFAULT_LEASE_S,
+        help=(
+            "How long a claimed case stays reserved without a heartbeat before "
+            f"another worker may take it over (default: {DEFAULT_LEASE_S:.0f})"
+        ),
+    )
+    parser.add_argument(
+        "--max-claims",
+        type=int,
+        default=DEFAULT_MAX_CLAIMS,
+        help=(
+            "Mark a case failed once its lease has expired this many times "
+            f"(default: {DEFAULT_MAX_CLAIMS})"
+        ),
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=5.0,
+        help="Seconds to wait before asking an empty queue again (default: 5)",
+    )
+    parser.add_argument(
+        "--child-output",
+        choices=CHILD_OUTPUT_MODES,
+        default="forward",
+        help=(
+            "What subprocess entrypoints print to the terminal: 'forward' (default), "
+            "'prefix' (each line marked with the case id) or 'quiet'; the full output "
+            "is always kept in the run's logs/ directory"
+        ),
+    )
+    parser.add_argument(
+        "--wait",
+        action="store_true",
+        help="Keep polling for newly enqueued cases instead of exiting once drained",
+    )
@@ -0,0 +1,216 @@
+"""Case execution helpers used by ``run-benchmark``."""
+
+from .affinity import AffinityQueue, run_affinity_threads
+from .async_engine import ResultWriter, run_cases_async
+from .batch import BatchEntrypoint
+from .budget import BudgetGuard, historical_case_usage, reported_cost
+from .concurrency import (
+    AdaptiveLimiter,
+    ConcurrencyController,
+    ConcurrencyLimiter,
+    provider_of,
+)
+from .entrypoints import (
+    CHILD_OUTPUT_MODES,
+    CaseEntrypoint,
+    PythonEntrypoint,
+    SubprocessEntrypoint,
+    build_command,
+    build_entrypoint_env,
+    check_result_file,
+    emit_flags,
+    is_python_spec,
+    load_case_entrypoint,
+    run_entrypoint,
+    write_result_file,
+)
+from .estimate import (
+    ConfigurationEstimate,
+    PromptCensus,
+    estimate_configuration,
+    estimate_wall_time,
+    load_estimate_entrypoint,
+    load_tokenizer,
+    take_census,
+)
+from .failures import (
+    PERMANENT,
+    TIMED_OUT,
+    TRANSIENT,
+    CaseTimeoutError,
+    classify_failure,
+    congestion_signal,
+)
+from .interrupts import ChildProcesses, GracefulInterrupt, children
+from .journal import JournalState, RunJournal, journal_path, load_journal
+from .materialize import VariantLeases
+from .preflight import (
+    DEFAULT_PREFLIGHT_TIMEOUT_S,
+    ProbeResult,
+    load_preflight_entrypoint,
+    preflight_key,
+    run_preflight,
+)
+from .prepare_cache import (
+    PREPARE_MARKERS_ROOT,
+    is_prepared,
+    mark_prepared,
+    prepare_fingerprint,
+    prepare_marker_path,
+)
+from .progress import PROGRESS_MODES, ProgressReporter
+from .rate_limits import (
+    BucketCoordinator,
+    RateLimit,
+    RateLimiter,
+    read_reported_tokens,
+    reported_tokens,
+    resolve_rate_limit,
+)
+from .retry import AttemptLog, RetryPolicy, arun_with_retries, run_with_retries
+from .scheduling import (
+    AFFINITY,
+    FIFO,
+    LONGEST_FIRST,
+    SCHEDULES,
+    estimate_durations,
+    estimate_makespan,
+    group_tasks,
+    interleave,
+    iter_historical_results,
+    load_historical_durations,
+    order_tasks,
+    prompt_chars,
+)
+from .sharding import (
+    SHARD_BY_DURATION,
+    SHARD_BY_HASH,
+    SHARD_STRATEGIES,
+    balanced_shards,
+    hash_shards,
+    parse_shard,
+    shard_run_id,
+    split_shard_run_id,
+)
+from .simulation import (
+    RecordedRun,
+    ScheduleOutcome,
+    estimate_missing_tokens,
+    load_config_rate_limits,
+    load_recorded_run,
+    observed_outcome,
+    recorded_rate_limits,
+    simulate_schedule,
+)
+from .stages import MATERIALIZE, RESULT_WRITE, record_stages, stage
+from .timeouts import call_with_timeout, resolve_case_timeout
+from .work_queue import QueuedCase, WorkQueue
+from .worker_pool import WorkerCrashedError, WorkerPool
+
+__all__ = [
+    "AdaptiveLimiter",
+    "AffinityQueue",
+    "AttemptLog",
+    "BucketCoordinator",
+    "BudgetGuard",
+    "historical_case_usage",
+    "BatchEntrypoint",
+    "CHILD_OUTPUT_MODES",
+    "CaseEntrypoint",
+    "ConcurrencyController",
+    "ConcurrencyLimiter",
+    "PythonEntrypoint",
+    "RateLimit",
+    "RateLimiter",
+    "RetryPolicy",
+    "SubprocessEntrypoint",
+    "VariantLeases",
+    "build_command",
+    "build_entrypoint_env",
+    "check_result_file",
+    "emit_flags",
+    "is_python_spec",
+    "load_case_entrypoint",
+    "run_entrypoint",
+    "write_result_file",
+    "run_affinity_threads",
+    "ResultWriter",
+    "run_cases_async",
+    "ConfigurationEstimate",
+    "PromptCensus",
+    "estimate_configuration",
+    "estimate_wall_time",
+    "load_estimate_entrypoint",
+    "load_tokenizer",
+    "take_census",
+    "classify_failure",
+    "congestion_signal",
+    "CaseTimeoutError",
+    "PERMANENT",
+    "TIMED_OUT",
+    "TRANSIENT",
+    "ChildProcesses",
+    "GracefulInterrupt",
+    "children",
+    "JournalState",
+    "RunJournal",
+    "journal_path",
+    "load_journal",
+    "arun_with_retries",
+    "run_with_retries",
+    "AFFINITY",
+    "FIFO",
+    "LONGEST_FIRST",
+    "SCHEDULES",
+    "estimate_durations",
+    "estimate_makespan",
+    "group_tasks",
+    "iter_historical_results",
+    "load_historical_durations",
+    "interleave",
+    "order_tasks",
+    "prompt_chars",
+    "provider_of",
+    "DEFAULT_PREFLIGHT_TIMEOUT_S",
+    "ProbeResult",
+    "load_preflight_entrypoint",
+    "preflight_key",
+    "run_preflight",
+    "PREPARE_MARKERS_ROOT",
+    "is_prepared",
+    "mark_prepared",
+    "prepare_fingerprint",
+    "prepare_marker_path",
+    "PROGRESS_MODES",
+    "ProgressReporter",
+    "read_reported_tokens",
+    "reported_cost",
+    "reported_tokens",
+    "resolve_rate_limit",
+    "SHARD_BY_DURATION",
+    "SHARD_BY_HASH",
+    "SHARD_STRATEGIES",
+    "balanced_shards",
+    "hash_shards",
+    "parse_shard",
+    "shard_run_id",
+    "split_shard_run_id",
+    "RecordedRun",
+    "ScheduleOutcome",
+    "estimate_missing_tokens",
+    "load_config_rate_limits",
+    "load_recorded_run",
+    "observed_outcome",
+    "recorded_rate_limits",
+    "simulate_schedule",
+    "MATERIALIZE",
+    "RESULT_WRITE",
+    "record_stages",
+    "stage",
+    "call_with_timeout",
+    "resolve_case_timeout",
+    "QueuedCase",
+    "WorkQueue",
+    "WorkerCrashedError",
+    "WorkerPool",
+]
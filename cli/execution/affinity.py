@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Generic, Sequence, TypeVar
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+POLL_INTERVAL_S = 0.5
+
+
+class _Group(Generic[T]):
+    def __init__(self, index: int, tasks: Sequence[T]) -> None:
+        self.index = index
+        self.pending: deque[T] = deque(tasks)
+        self.primer: T | None = None
+        self.primed = False
+
+
+class AffinityQueue(Generic[T]):
+    """Hand out grouped tasks so that each group warms its caches once.
+
+    The first task of a group is its primer and runs alone; the remaining
+    tasks are released once it has finished, whether or not it succeeded.
+    A slot stays on the group it primed or last took a task from while that
+    group has tasks, then helps finish the oldest primed group, and only then
+    starts a new one. That keeps the cases of a group close together in time
+    and on as few slots as possible.
+    """
+
+    def __init__(self, groups: Sequence[Sequence[T]]) -> None:
+        self._groups = [
+            _Group(index, tasks) for index, tasks in enumerate(groups) if tasks
+        ]
+        self._unstarted: deque[_Group[T]] = deque(self._groups)
+        self._primed: list[_Group[T]] = []
+        self._pinned: dict[int, _Group[T]] = {}
+        self._primers: dict[int, _Group[T]] = {}
+        self._lock = threading.RLock()
+        self._changed = threading.Condition(self._lock)
+        self._closed = False
+
+    @property
+    def exhausted(self) -> bool:
+        """Whether every task has been handed out (or the queue was closed)."""
+        with self._lock:
+            return self._exhausted()
+
+    def _exhausted(self) -> bool:
+        return self._closed or not any(group.pending for group in self._groups)
+
+    def take(self, slot: int) -> T | None:
+        """The next task for ``slot``, or ``None`` if none may start right now."""
+        with self._lock:
+            if self._closed:
+                return None
+            pinned = self._pinned.get(slot)
+            if pinned is not None and pinned.primed and pinned.pending:
+                return pinned.pending.popleft()
+            for group in self._primed:
+                if group.pending:
+                    self._pinned[slot] = group
+                    return group.pending.popleft()
+            while self._unstarted:
+                group = self._unstarted.popleft()
+                if not group.pending:
+                    continue
+                task = group.pending.popleft()
+                group.primer = task
+                self._primers[id(task)] = group
+                self._pinned[slot] = group
+                return task
+            return None
+
+    def done(self, task: T) -> None:
+        with self._changed:
+            group = self._primers.pop(id(task), None)
+            if group is not None and not group.primed:
+                group.primed = True
+                self._primed.append(group)
+                self._primed.sort(key=lambda primed: primed.index)
+                self._changed.notify_all()
+
+    def next(self, slot: int) -> T | None:
+        """Blocking :meth:`take`: wait for a primer to finish; ``None`` when done."""
+        with self._changed:
+            while True:
+                task = self.take(slot)
+                if task is not None or self._exhausted():
+                    return task
+                self._changed.wait(POLL_INTERVAL_S)
+
+    def close(self) -> None:
+        """Hand out nothing more; waiting slots return ``None``."""
+        with self._changed:
+            self._closed = True
+            self._changed.notify_all()
+
+
+def run_affinity_threads(
+    groups: Sequence[Sequence[T]],
+    run_case: Callable[[T], R],
+    *,
+    max_concurrency: int,
+    on_result: Callable[[T, R], None],
+) -> None:
+    """Run grouped tasks on ``max_concurrency`` slot threads.
+
+    Each slot pulls from an :class:`AffinityQueue`; outcomes are handed to
+    ``on_result`` on the calling thread, in the order the cases finish.
+    """
+    affinity: AffinityQueue[T] = AffinityQueue(groups)
+    outcomes: queue.Queue[tuple[T, R]] = queue.Queue()
+
+    def slot_loop(slot: int) -> None:
+        while True:
+            task = affinity.next(slot)
+            if task is None:
+                return
+            try:
+                outcome = run_case(task)
+            finally:
+                affinity.done(task)
+            outcomes.put((task, outcome))
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        slots = [executor.submit(slot_loop, slot) for slot in range(max_concurrency)]
+        try:
+            while True:
+                try:
+                    task, outcome = outcomes.get(timeout=POLL_INTERVAL_S)
+                except queue.Empty:
+                    failed = [
+                        slot for slot in slots if slot.done() and slot.exception()
+                    ]
+                    if failed:
+                        affinity.close()
+                        failed[0].result()
+                    if all(slot.done() for slot in slots) and outcomes.empty():
+                        break
+                    continue
+                on_result(task, outcome)
+        except BaseException:
+            # Covers the second Ctrl-C: running cases end, nothing new starts.
+            affinity.close()
+            raise
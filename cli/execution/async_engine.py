@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterable, Sequence, TypeVar
+
+from .affinity import AffinityQueue
+from .entrypoints import write_result_file
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Threads left for the result writer and short blocking helpers on top of one
+# per in-flight case (materialisation, file loading, usage polling).
+EXTRA_EXECUTOR_THREADS = 4
+
+
+class ResultWriter:
+    """Single task that writes result payloads handed over through a bounded queue."""
+
+    def __init__(self, max_pending: int) -> None:
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max(max_pending, 1))
+        self._task: asyncio.Task | None = None
+        self.written = 0
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="result-writer")
+
+    async def _run(self) -> None:
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+            path, payload, done = item
+            try:
+                await asyncio.to_thread(write_result_file, path, payload)
+            except Exception as exc:  # noqa: BLE001 - surfaced to the case
+                if not done.cancelled():
+                    done.set_exception(exc)
+            else:
+                self.written += 1
+                if not done.cancelled():
+                    done.set_result(None)
+
+    async def write(self, path: Path, payload: dict[str, Any]) -> None:
+        done = asyncio.get_running_loop().create_future()
+        await self._queue.put((path, payload, done))
+        await done
+
+    async def close(self) -> None:
+        if self._task is None:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+
+
+async def run_cases_async(
+    tasks: Iterable[T],
+    run_case: Callable[[T, ResultWriter], Awaitable[R]],
+    *,
+    max_concurrency: int,
+    on_result: Callable[[T, R], None],
+    writer_queue_size: int | None = None,
+    groups: Sequence[Sequence[T]] | None = None,
+) -> None:
+    """Run ``run_case`` for every task on the current event loop.
+
+    At most ``max_concurrency`` cases are in flight; each completed case is
+    reported through ``on_result`` as soon as it finishes. With ``groups``,
+    ``max_concurrency`` slots take the tasks from an :class:`AffinityQueue`
+    instead, and ``tasks`` is ignored.
+    """
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(
+        ThreadPoolExecutor(max_workers=max_concurrency + EXTRA_EXECUTOR_THREADS)
+    )
+    semaphore = asyncio.Semaphore(max_concurrency)
+    writer = ResultWriter(max_pending=writer_queue_size or max_concurrency)
+    writer.start()
+
+    async def guarded(task: T) -> None:
+        async with semaphore:
+            outcome = await run_case(task, writer)
+        on_result(task, outcome)
+
+    affinity = AffinityQueue(groups) if groups is not None else None
+    changed = asyncio.Condition()
+
+    async def slot(index: int) -> None:
+        assert affinity is not None
+        while True:
+            async with changed:
+                task = affinity.take(index)
+                while task is None and not affinity.exhausted:
+                    await changed.wait()
+                    task = affinity.take(index)
+            if task is None:
+                return
+            try:
+                outcome = await run_case(task, writer)
+            finally:
+                affinity.done(task)
+                async with changed:
+                    changed.notify_all()
+            on_result(task, outcome)
+
+    try:
+        if affinity is None:
+            await asyncio.gather(*(guarded(task) for task in tasks))
+        else:
+            await asyncio.gather(*(slot(index) for index in range(max_concurrency)))
+    finally:
+        await writer.close()
@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import subprocess
+import sys
+import threading
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from pathlib import Path
+from typing import Any
+
+from .entrypoints import (
+    _forward_stream,
+    build_command,
+    build_entrypoint_env,
+    write_result_file,
+)
+from .failures import CaseTimeoutError
+from .interrupts import children
+from .stages import RESULT_WRITE, stage
+
+
+SHUTDOWN_TIMEOUT_S = 30.0
+MAX_RESTARTS = 3
+STDERR_TAIL_LINES = 50
+
+
+class BatchEntrypoint:
+    """Stream cases to one long-running ``entrypoints.run_batch`` process.
+
+    The command is started once with the approach arguments as flags. Each case
+    is written to its stdin as a JSON line::
+
+        {"id": "...", "case_id": "...", "input_path": "...", "output_path": "...",
+         "args": {...}}
+
+    and the process answers with one JSON line per case on stdout::
+
+        {"id": "...", "status": "ok", "result": {...}}
+        {"id": "...", "status": "error", "error": "..."}
+
+    ``result`` is optional; when present the harness writes it to
+    ``output_path``, otherwise the approach must have written the file itself.
+    Stdout lines that are not protocol records are forwarded as log output. At
+    most ``max_in_flight`` cases are outstanding at any time.
+
+    The process is shared by every case, so a case that runs past its timeout
+    is abandoned rather than killed: its answer is ignored when it arrives.
+    """
+
+    mode = "batch"
+
+    def __init__(
+        self,
+        command: str,
+        *,
+        approach_args: dict[str, Any],
+        max_in_flight: int,
+    ) -> None:
+        if max_in_flight < 1:
+            raise ValueError("Batch entrypoint needs at least one in-flight case")
+        self.command = command
+        self.approach_args = dict(approach_args)
+        self.max_in_flight = max_in_flight
+
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._pending: dict[str, tuple[subprocess.Popen, Future]] = {}
+        # Output paths of timed-out cases; a late answer must not leave a result
+        # file that a resumed run would take for a completed case.
+        self._abandoned: dict[str, Path] = {}
+        self._process: subprocess.Popen | None = None
+        self._readers: list[threading.Thread] = []
+        self._stderr_tail: deque[str] = deque(maxlen=STDERR_TAIL_LINES)
+        self._closed = False
+
+        self.starts = 0
+        self.cases_sent = 0
+        self.case_errors = 0
+        self.timed_out = 0
+
+    def __enter__(self) -> "BatchEntrypoint":
+        self.start()
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.close()
+
+    def start(self) -> None:
+        with self._lock:
+            self._ensure_process()
+
+    def _ensure_process(self) -> subprocess.Popen:
+        if self._process is not None and self._process.poll() is None:
+            return self._process
+        if self.starts > MAX_RESTARTS:
+            raise RuntimeError(
+                f"Batch entrypoint exited {self.starts} times; giving up"
+            )
+        cmd = build_command(self.command, approach_args=self.approach_args)
+        process = subprocess.Popen(  # noqa: S603,B404 - intentional execution
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+            env=build_entrypoint_env(),
+            start_new_session=True,
+        )
+        children.add(process)
+        self.starts += 1
+        self._process = process
+        self._readers = [
+            threading.Thread(target=self._read_results, args=(process,), daemon=True),
+            threading.Thread(
+                target=_forward_stream,
+                args=(process.stderr, sys.stderr, self._stderr_tail),
+                daemon=True,
+            ),
+        ]
+        for reader in self._readers:
+            reader.start()
+        return process
+
+    def _read_results(self, process: subprocess.Popen) -> None:
+        assert process.stdout is not None
+        try:
+            for line in iter(process.stdout.readline, ""):
+                record = _parse_record(line)
+                if record is None:
+                    sys.stdout.write(line)
+                    sys.stdout.flush()
+                    continue
+                with self._lock:
+                    entry = self._pending.pop(str(record.get("id")), None)
+                    abandoned = (
+                        self._abandoned.pop(str(record.get("id")), None)
+                        if entry is None
+                        else None
+                    )
+                if abandoned is not None:
+                    abandoned.unlink(missing_ok=True)
+                    continue
+                if entry is None:
+                    sys.stdout.write(line)
+                    sys.stdout.flush()
+                    continue
+                entry[1].set_result(record)
+        finally:
+            process.stdout.close()
+            returncode = process.wait()
+            with self._lock:
+                orphaned_ids = [
+                    request_id
+                    for request_id, (owner, _future) in self._pending.items()
+                    if owner is process
+                ]
+                orphaned = [self._pending.pop(key)[1] for key in orphaned_ids]
+            if orphaned:
+                message = (
+                    f"Batch entrypoint exited with code {returncode} while cases "
+                    "were in flight"
+                )
+                tail = "".join(self._stderr_tail).strip()
+                if tail:
+                    message += f"\n--- stderr ---\n{tail}"
+                error = RuntimeError(message)
+                for future in orphaned:
+                    future.set_exception(error)
+
+    def __call__(
+        self,
+        *,
+        input_path: Path,
+        output_path: Path,
+        case_id: str,
+        approach_args: dict[str, Any],
+        timeout_s: float | None = None,
+        log_path: Path | None = None,
+    ) -> None:
+        if self._closed:
+            raise RuntimeError("Batch entrypoint is closed")
+        with self._slots:
+            future: Future = Future()
+            request_id = str(next(self._ids))
+            manifest = {
+                "id": request_id,
+                "case_id": case_id,
+                "input_path": str(input_path),
+                "output_path": str(output_path),
+                "args": approach_args,
+            }
+            with self._lock:
+                process = self._ensure_process()
+                self._pending[request_id] = (process, future)
+                self.cases_sent += 1
+            # Write outside the result lock so a full stdin pipe cannot stall
+            # the reader that drains the process's stdout.
+            try:
+                assert process.stdin is not None
+                with self._write_lock:
+                    process.stdin.write(json.dumps(manifest) + "\n")
+                    process.stdin.flush()
+            except (BrokenPipeError, OSError, ValueError) as exc:
+                with self._lock:
+                    self._pending.pop(request_id, None)
+                raise RuntimeError(
+                    f"Batch entrypoint is not accepting cases: {exc}"
+                ) from exc
+
+            try:
+                record = future.result(timeout=timeout_s)
+            except FutureTimeoutError:
+                with self._lock:
+                    self._pending.pop(request_id, None)
+                    self._abandoned[request_id] = output_path
+                    self.timed_out += 1
+                assert timeout_s is not None
+                raise CaseTimeoutError(timeout_s) from None
+
+        if record.get("status") != "ok":
+            with self._lock:
+                self.case_errors += 1
+            raise RuntimeError(
+                f"Batch entrypoint reported an error: {record.get('error') or record}"
+            )
+
+        result = record.get("result")
+        if isinstance(result, dict):
+            with stage(RESULT_WRITE):
+                write_result_file(output_path, result)
+        elif not output_path.exists():
+            raise RuntimeError(
+                f"Batch entrypoint reported success for {case_id} but wrote no "
+                f"result to {output_path}"
+            )
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        process = self._process
+        if process is None:
+            return
+        try:
+            if process.stdin is not None:
+                process.stdin.close()
+        except (BrokenPipeError, OSError):
+            pass
+        try:
+            process.wait(timeout=SHUTDOWN_TIMEOUT_S)
+        except subprocess.TimeoutExpired:
+            process.terminate()
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        children.discard(process)
+        for reader in self._readers:
+            reader.join(timeout=5)
+        with self._lock:
+            abandoned = list(self._abandoned.values())
+            self._abandoned.clear()
+        for output_path in abandoned:
+            output_path.unlink(missing_ok=True)
+
+    def describe(self) -> dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "command": self.command,
+            "max_in_flight": self.max_in_flight,
+            "process_starts": self.starts,
+            "cases_sent": self.cases_sent,
+            "case_errors": self.case_errors,
+            "timed_out": self.timed_out,
+        }
+
+    def estimated_startup_saved_s(self, cases_run: int) -> float | None:
+        return None
+
+    async def acall(
+        self,
+        *,
+        input_path: Path,
+        output_path: Path,
+        case_id: str,
+        approach_args: dict[str, Any],
+        timeout_s: float | None = None,
+        log_path: Path | None = None,
+    ) -> dict[str, Any] | None:
+        await asyncio.to_thread(
+            self,
+            input_path=input_path,
+            output_path=output_path,
+            case_id=case_id,
+            approach_args=approach_args,
+            timeout_s=timeout_s,
+            log_path=log_path,
+        )
+        return None
+
+
+def _parse_record(line: str) -> dict[str, Any] | None:
+    stripped = line.strip()
+    if not stripped.startswith("{"):
+        return None
+    try:
+        record = json.loads(stripped)
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(record, dict) or "id" not in record or "status" not in record:
+        return None
+    return record
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+from typing import Any
+
+from .rate_limits import reported_tokens
+from .scheduling import iter_historical_results
+
+
+def reported_cost(payload: Any) -> float | None:
+    if not isinstance(payload, dict):
+        return None
+    cost = payload.get("cost")
+    total = cost.get("total_usd") if isinstance(cost, dict) else None
+    return float(total) if isinstance(total, (int, float)) else None
+
+
+def historical_case_usage(
+    approach_id: str, approach_args: dict[str, Any]
+) -> tuple[float | None, float | None]:
+    """Mean cost and token count per case in earlier runs of the same model."""
+    costs: list[float] = []
+    tokens: list[int] = []
+    for _run_id, _case_id, payload in iter_historical_results(
+        approach_id, approach_args
+    ):
+        cost, total = reported_cost(payload), reported_tokens(payload)
+        if cost is not None:
+            costs.append(cost)
+        if total is not None:
+            tokens.append(total)
+    return (
+        sum(costs) / len(costs) if costs else None,
+        sum(tokens) / len(tokens) if tokens else None,
+    )
+
+
+class BudgetGuard:
+    """Stop starting cases once the projected spend would pass a ceiling.
+
+    The projection is the cost and token count reported by completed cases
+    plus, for every case in flight and the one about to start, the mean of
+    the completed cases. Until a case has completed, the mean of earlier runs
+    passed to :meth:`seed` stands in; without one, a single case runs at a time
+    until its usage is known. Once a case is refused, every later case is
+    refused as well, so a stopped run can be resumed with a higher ceiling.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_cost_usd: float | None = None,
+        max_tokens: int | None = None,
+    ) -> None:
+        for name, value in (
+            ("--max-cost-usd", max_cost_usd),
+            ("--max-total-tokens", max_tokens),
+        ):
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be positive")
+        self.max_cost_usd = max_cost_usd
+        self.max_tokens = max_tokens
+        self.cost_usd = 0.0
+        self.tokens = 0
+        self.prior_cost_usd = 0.0
+        self.prior_tokens = 0
+        self.in_flight = 0
+        self.refused = 0
+        self.stop_reason: str | None = None
+        self.seed_cost_usd: float | None = None
+        self.seed_tokens: float | None = None
+        self._costed_cases = 0
+        self._counted_cases = 0
+        self._reported_cases = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_cost_usd is not None or self.max_tokens is not None
+
+    @property
+    def stopped(self) -> bool:
+        return self.stop_reason is not None
+
+    def add_prior_spend(self, cost_usd: float, tokens: int, cases: int) -> None:
+        """Count what earlier invocations of a resumed run already spent."""
+        with self._lock:
+            self.cost_usd += cost_usd
+            self.tokens += tokens
+            self.prior_cost_usd += cost_usd
+            self.prior_tokens += tokens
+            if cost_usd:
+                self._costed_cases += cases
+            if tokens:
+                self._counted_cases += cases
+            self._reported_cases += cases
+
+    def seed(self, cost_usd: float | None, tokens: float | None) -> None:
+        """Set the per-case usage assumed until a case has completed.
+
+        Called once per configuration; the most expensive one is kept.
+        """
+        with self._lock:
+            if cost_usd is not None:
+                self.seed_cost_usd = max(self.seed_cost_usd or 0.0, cost_usd)
+            if tokens is not None:
+                self.seed_tokens = max(self.seed_tokens or 0.0, tokens)
+
+    def admit(self) -> bool | None:
+        """Reserve room for one more case; ``False`` once the ceiling is reached.
+
+        ``None`` asks the caller to try again later: no usage per case is known
+        yet, neither from completed cases nor from :meth:`seed`, and another
+        case is already in flight.
+        """
+        if not self.enabled:
+            return True
+        with self._lock:
+            if self.stop_reason is None:
+                unknown = not self._reported_cases and (
+                    (self.max_cost_usd is not None and self.seed_cost_usd is None)
+                    or (self.max_tokens is not None and self.seed_tokens is None)
+                )
+                if unknown and self.in_flight:
+                    return None
+                pending = self.in_flight + 1
+                if self.max_cost_usd is not None:
+                    mean_cost = (
+                        self.cost_usd / self._costed_cases
+                        if self._costed_cases
+                        else self.seed_cost_usd or 0.0
+                    )
+                    # Rounded so that float sums do not overshoot an exact ceiling.
+                    projected = round(self.cost_usd + pending * mean_cost, 9)
+                    if projected > self.max_cost_usd:
+                        self.stop_reason = (
+                            f"projected cost ${projected:.4f} would exceed "
+                            f"--max-cost-usd ${self.max_cost_usd:g}"
+                        )
+                if self.stop_reason is None and self.max_tokens is not None:
+                    mean_tokens = (
+                        self.tokens / self._counted_cases
+                        if self._counted_cases
+                        else self.seed_tokens or 0.0
+                    )
+                    projected_tokens = self.tokens + pending * mean_tokens
+                    if projected_tokens > self.max_tokens:
+                        self.stop_reason = (
+                            f"projected {projected_tokens:.0f} tokens would exceed "
+                            f"--max-total-tokens {self.max_tokens}"
+                        )
+            if self.stop_reason is not None:
+                self.refused += 1
+                return False
+            self.in_flight += 1
+            return True
+
+    def case_finished(self, result_path: Path | None) -> None:
+        """Release an admitted case and add the usage its result file reports."""
+        if not self.enabled:
+            return
+        cost = tokens = None
+        if result_path is not None:
+            try:
+                payload = json.loads(result_path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError):
+                payload = None
+            cost, tokens = reported_cost(payload), reported_tokens(payload)
+        with self._lock:
+            self.in_flight = max(self.in_flight - 1, 0)
+            if result_path is not None:
+                self._reported_cases += 1
+            if cost is not None:
+                self.cost_usd += cost
+                self._costed_cases += 1
+            if tokens is not None:
+                self.tokens += tokens
+                self._counted_cases += 1
+
+    def describe(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "max_cost_usd": self.max_cost_usd,
+                "max_total_tokens": self.max_tokens,
+                "spent_cost_usd": round(self.cost_usd, 6),
+                "spent_tokens": self.tokens,
+                "prior_cost_usd": round(self.prior_cost_usd, 6),
+                "prior_tokens": self.prior_tokens,
+                "seed_cost_usd": (
+                    round(self.seed_cost_usd, 6)
+                    if self.seed_cost_usd is not None
+                    else None
+                ),
+                "seed_tokens": (
+                    round(self.seed_tokens) if self.seed_tokens is not None else None
+                ),
+                "stopped": self.stop_reason is not None,
+                "stop_reason": self.stop_reason,
+            }
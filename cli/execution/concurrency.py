@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Iterator
+
+from .failures import RATE_LIMITED, SERVER_ERROR, congestion_signal
+
+
+# Upper bounds for the adaptive controller per provider prefix of the
+# ``model`` argument. They sit below the default tier limits of each API so a
+# run never starts by provoking throttling; --max-concurrency caps them further.
+PROVIDER_CEILINGS: dict[str, int] = {
+    "openai": 32,
+    "azure_openai": 16,
+    "openrouter": 16,
+    "anthropic": 8,
+    "google_genai": 8,
+    "ollama": 2,
+}
+DEFAULT_PROVIDER_CEILING = 8
+DEFAULT_INITIAL_CONCURRENCY = 4
+
+
+def provider_of(model: Any) -> str:
+    """Return the provider prefix of a ``provider:model`` identifier."""
+    if isinstance(model, str) and ":" in model:
+        return model.split(":", 1)[0].strip().lower() or "default"
+    return "default"
+
+
+def _resolve(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class ConcurrencyLimiter:
+    """Bound the number of in-flight cases for one provider.
+
+    The base limiter keeps the limit fixed; ``AdaptiveLimiter`` moves it in
+    response to the outcome of each case. Both thread and asyncio callers wait
+    on the same counter, so the limit applies regardless of the engine.
+    """
+
+    mode = "fixed"
+
+    def __init__(self, provider: str, limit: int) -> None:
+        if limit < 1:
+            raise ValueError("Concurrency limit must be at least 1")
+        self.provider = provider
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._async_waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self._in_flight = 0
+        self._epoch = 0
+        self._started = time.monotonic()
+
+        self.completed = 0
+        self.rate_limited = 0
+        self.server_errors = 0
+
+    def acquire(self) -> int:
+        with self._changed:
+            while self._in_flight >= self.limit:
+                self._changed.wait()
+            self._in_flight += 1
+            return self._epoch
+
+    async def acquire_async(self) -> int:
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                if self._in_flight < self.limit:
+                    self._in_flight += 1
+                    return self._epoch
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            await waiter
+
+    def release(
+        self,
+        latency_s: float,
+        *,
+        failed: bool,
+        signal: str | None = None,
+        epoch: int = 0,
+    ) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self.completed += 1
+            if signal == RATE_LIMITED:
+                self.rate_limited += 1
+            elif signal == SERVER_ERROR:
+                self.server_errors += 1
+            self._on_complete(latency_s, failed=failed, signal=signal, epoch=epoch)
+            self._wake_waiters()
+
+    def _on_complete(
+        self, latency_s: float, *, failed: bool, signal: str | None, epoch: int
+    ) -> None:
+        """Hook for subclasses; called with the lock held."""
+
+    def _wake_waiters(self) -> None:
+        self._changed.notify_all()
+        waiters, self._async_waiters = self._async_waiters, []
+        for loop, waiter in waiters:
+            loop.call_soon_threadsafe(_resolve, waiter)
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        epoch = self.acquire()
+        started = time.perf_counter()
+        try:
+            yield
+        except BaseException as exc:
+            signal = congestion_signal(exc) if isinstance(exc, Exception) else None
+            self.release(
+                time.perf_counter() - started, failed=True, signal=signal, epoch=epoch
+            )
+            raise
+        self.release(time.perf_counter() - started, failed=False, epoch=epoch)
+
+    @asynccontextmanager
+    async def aslot(self) -> AsyncIterator[None]:
+        epoch = await self.acquire_async()
+        started = time.perf_counter()
+        try:
+            yield
+        except BaseException as exc:
+            signal = congestion_signal(exc) if isinstance(exc, Exception) else None
+            self.release(
+                time.perf_counter() - started, failed=True, signal=signal, epoch=epoch
+            )
+            raise
+        self.release(time.perf_counter() - started, failed=False, epoch=epoch)
+
+    def describe(self) -> dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "limit": self.limit,
+            "completed": self.completed,
+            "rate_limited": self.rate_limited,
+            "server_errors": self.server_errors,
+        }
+
+
+class AdaptiveLimiter(ConcurrencyLimiter):
+    """AIMD limit driven by case latency and provider throttling.
+
+    After ``limit`` consecutive successes the limit grows by one as long as the
+    error rate over the last ``window`` cases stays below ``max_error_rate``
+    and the p95 latency has not blown up. A 429/5xx response, or a p95 latency
+    above ``latency_factor`` times the baseline, multiplies the limit by
+    ``decrease_factor``. Cases that were already in flight when the limit was
+    cut do not trigger a second cut, and the latency baseline is re-measured
+    at the new level so slower exercises cannot ratchet the limit down to one.
+    """
+
+    mode = "adaptive"
+
+    def __init__(
+        self,
+        provider: str,
+        *,
+        initial: int,
+        ceiling: int,
+        floor: int = 1,
+        window: int = 20,
+        latency_factor: float = 2.0,
+        max_error_rate: float = 0.1,
+        decrease_factor: float = 0.5,
+    ) -> None:
+        super().__init__(provider, max(floor, min(initial, ceiling)))
+        self.initial = self.limit
+        self.ceiling = ceiling
+        self.floor = floor
+        self.window = window
+        self.latency_factor = latency_factor
+        self.max_error_rate = max_error_rate
+        self.decrease_factor = decrease_factor
+
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._failures: deque[bool] = deque(maxlen=window)
+        self._successes_at_limit = 0
+        self.baseline_p95_s: float | None = None
+        self.peak_limit = self.limit
+        self.timeline: list[dict[str, Any]] = []
+        self._record("start")
+
+    def _p95(self) -> float | None:
+        if len(self._latencies) < self.window:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, math.ceil(0.95 * len(ordered)) - 1)]
+
+    def _error_rate(self) -> float:
+        if not self._failures:
+            return 0.0
+        return sum(self._failures) / len(self._failures)
+
+    def _record(self, reason: str, p95_s: float | None = None) -> None:
+        entry: dict[str, Any] = {
+            "t_s": round(time.monotonic() - self._started, 1),
+            "limit": self.limit,
+            "reason": reason,
+        }
+        if p95_s is not None:
+            entry["p95_s"] = round(p95_s, 2)
+        self.timeline.append(entry)
+
+    def _decrease(self, reason: str, p95_s: float | None = None) -> None:
+        self._epoch += 1
+        self._successes_at_limit = 0
+        self._latencies.clear()
+        self.baseline_p95_s = None
+        reduced = max(self.floor, int(self.limit * self.decrease_factor))
+        if reduced != self.limit:
+            self.limit = reduced
+            self._record(reason, p95_s)
+
+    def _on_complete(
+        self, latency_s: float, *, failed: bool, signal: str | None, epoch: int
+    ) -> None:
+        current = epoch == self._epoch
+        self._failures.append(failed)
+        if signal is not None:
+            if current:
+                self._decrease(signal)
+            return
+        if failed or not current:
+            return
+
+        self._latencies.append(latency_s)
+        p95_s = self._p95()
+        if p95_s is not None:
+            if self.baseline_p95_s is None:
+                self.baseline_p95_s = p95_s
+            elif p95_s > self.latency_factor * self.baseline_p95_s:
+                self._decrease("latency", p95_s)
+                return
+
+        self._successes_at_limit += 1
+        if (
+            self._successes_at_limit >= self.limit
+            and self.limit < self.ceiling
+            and self._error_rate() <= self.max_error_rate
+        ):
+            self.limit += 1
+            self.peak_limit = max(self.peak_limit, self.limit)
+            self._successes_at_limit = 0
+            self._record("increase", p95_s)
+
+    def describe(self) -> dict[str, Any]:
+        summary = super().describe()
+        summary.update(
+            {
+                "initial": self.initial,
+                "ceiling": self.ceiling,
+                "peak_limit": self.peak_limit,
+                "baseline_p95_s": (
+                    round(self.baseline_p95_s, 2)
+                    if self.baseline_p95_s is not None
+                    else None
+                ),
+                "timeline": list(self.timeline),
+            }
+        )
+        return summary
+
+
+class ConcurrencyController:
+    """Hand out one limiter per provider inferred from the ``model`` argument."""
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: int,
+        adaptive: bool = False,
+        initial: int | None = None,
+    ) -> None:
+        if initial is not None and initial < 1:
+            raise ValueError("--initial-concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.adaptive = adaptive
+        self.initial = initial or DEFAULT_INITIAL_CONCURRENCY
+        self._lock = threading.Lock()
+        self._limiters: dict[str, ConcurrencyLimiter] = {}
+
+    def limiter_for(self, model: Any) -> ConcurrencyLimiter:
+        provider = provider_of(model)
+        with self._lock:
+            limiter = self._limiters.get(provider)
+            if limiter is None:
+                limiter = self._build(provider)
+                self._limiters[provider] = limiter
+            return limiter
+
+    def _build(self, provider: str) -> ConcurrencyLimiter:
+        if not self.adaptive:
+            return ConcurrencyLimiter(provider, self.max_concurrency)
+        ceiling = min(
+            self.max_concurrency,
+            PROVIDER_CEILINGS.get(provider, DEFAULT_PROVIDER_CEILING),
+        )
+        return AdaptiveLimiter(provider, initial=self.initial, ceiling=ceiling)
+
+    @property
+    def limiters(self) -> dict[str, ConcurrencyLimiter]:
+        with self._lock:
+            return dict(self._limiters)
+
+    def describe(self) -> dict[str, Any]:
+        return {
+            "mode": "adaptive" if self.adaptive else "fixed",
+            "max_concurrency": self.max_concurrency,
+            "providers": {
+                provider: limiter.describe()
+                for provider, limiter in self.limiters.items()
+            },
+        }
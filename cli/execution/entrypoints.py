@@ -0,0 +1,575 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import json
+import os
+import shlex
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from importlib import import_module
+from pathlib import Path
+from typing import Any, Callable, Union
+
+from cli.utils import REFERENCE_ROOT
+
+from .failures import CaseTimeoutError
+from .interrupts import children
+from .stages import RESULT_WRITE, stage
+from .timeouts import TERMINATE_GRACE_S, call_with_timeout
+
+
+# How the output of subprocess entrypoints reaches the terminal; every line is
+# also written to the case's log file.
+FORWARD = "forward"
+PREFIX = "prefix"
+QUIET = "quiet"
+CHILD_OUTPUT_MODES = (FORWARD, PREFIX, QUIET)
+
+# Lines of each stream kept in memory for the error message of a failed case.
+OUTPUT_TAIL_LINES = 50
+# Bytes read from each end of a result file to check that it is complete.
+RESULT_CHECK_BYTES = 64
+
+# Limit for timing one interpreter that starts and imports the approach.
+STARTUP_PROBE_TIMEOUT_S = 120.0
+
+
+class _CaseLog:
+    """Buffered log file shared by the stdout and stderr readers of one case."""
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._handle = path.open("a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def write(self, text: str) -> None:
+        with self._lock:
+            # Grandchildren of a killed process may still write after close().
+            if not self._handle.closed:
+                self._handle.write(text)
+
+    def close(self) -> None:
+        with self._lock:
+            self._handle.close()
+
+
+def _forward_stream(
+    stream: Any,
+    sink: Any,
+    buffer: Any,
+    *,
+    prefix: str | None = None,
+    log: _CaseLog | None = None,
+) -> None:
+    """Copy ``stream`` line by line to ``sink``, ``log`` and ``buffer``.
+
+    ``sink`` may be ``None`` to keep the lines off the terminal. ``buffer``
+    only needs ``append``; a bounded deque keeps the memory per case fixed.
+    """
+    if stream is None:
+        return
+    try:
+        for line in iter(stream.readline, ""):
+            if log is not None:
+                log.write(line)
+            if sink is not None:
+                if prefix and line:
+                    formatted = f"{prefix}{line}"
+                else:
+                    formatted = line
+                sink.write(formatted)
+                sink.flush()
+            buffer.append(line)
+    finally:
+        stream.close()
+
+
+def write_result_file(output_path: Path, payload: dict[str, Any]) -> None:
+    """Write ``payload`` so that ``output_path`` never holds a partial result.
+
+    The JSON goes to a temporary file next to the target, is flushed to disk
+    and then renamed over the target in one step.
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = output_path.with_name(
+        f".{output_path.name}.{os.getpid()}-{threading.get_ident()}.tmp"
+    )
+    try:
+        with temp_path.open("w", encoding="utf-8") as handle:
+            json.dump(payload, handle, indent=2)
+            handle.write("\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, output_path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+
+def check_result_file(path: Path, expected_bytes: int | None = None) -> str | None:
+    """Why ``path`` is not a complete result file, or ``None`` if it looks complete.
+
+    Only the size and the first and last bytes are read: the file must match
+    the size recorded when the case finished, if known, and hold a JSON
+    object. A write cut short by a crash fails one of these checks.
+    """
+    try:
+        size = path.stat().st_size
+    except FileNotFoundError:
+        return "missing"
+    except OSError as exc:
+        return f"unreadable ({exc})"
+    if size == 0:
+        return "empty"
+    if expected_bytes is not None and size != expected_bytes:
+        return f"{size} bytes instead of the {expected_bytes} recorded"
+    try:
+        with path.open("rb") as handle:
+            head = handle.read(RESULT_CHECK_BYTES).lstrip()
+            handle.seek(max(size - RESULT_CHECK_BYTES, 0))
+            tail = handle.read().rstrip()
+    except OSError as exc:
+        return f"unreadable ({exc})"
+    if not head.startswith(b"{") or not tail.endswith(b"}"):
+        return "truncated"
+    return None
+
+
+def emit_flags(values: dict[str, Any]) -> list[str]:
+    result: list[str] = []
+    for key, raw_value in values.items():
+        if raw_value is None:
+            continue
+        flag = f"--{key.replace('_', '-')}"
+        if isinstance(raw_value, bool):
+            if raw_value:
+                result.append(flag)
+        elif isinstance(raw_value, (list, tuple)):
+            for item in raw_value:
+                result.extend([flag, str(item)])
+        else:
+            result.extend([flag, str(raw_value)])
+    return result
+
+
+def build_command(
+    command: str,
+    *,
+    input_path: Path | None = None,
+    output_path: Path | None = None,
+    case_id: str | None = None,
+    approach_args: dict[str, Any] | None = None,
+    extra_flags: dict[str, Any] | None = None,
+) -> list[str]:
+    if not command:
+        raise ValueError("Approach configuration is missing an executable entrypoint")
+
+    cmd = shlex.split(command)
+    if input_path is not None:
+        cmd.extend(["--input-path", str(input_path)])
+    if output_path is not None:
+        cmd.extend(["--output-path", str(output_path)])
+    if case_id is not None:
+        cmd.extend(["--case-id", case_id])
+
+    if approach_args:
+        cmd.extend(emit_flags(approach_args))
+    if extra_flags:
+        cmd.extend(emit_flags(extra_flags))
+
+    if cmd and cmd[0] in {"python", "python3"}:
+        cmd[0] = sys.executable
+    return cmd
+
+
+def build_entrypoint_env() -> dict[str, str]:
+    env = os.environ.copy()
+    pythonpath_parts = [str(REFERENCE_ROOT)]
+    if existing := env.get("PYTHONPATH"):
+        pythonpath_parts.append(existing)
+    env["PYTHONPATH"] = os.pathsep.join(pythonpath_parts)
+    return env
+
+
+def measure_subprocess_startup(target: str) -> float | None:
+    """Seconds a fresh interpreter takes to start and import ``target``'s module.
+
+    That is what the subprocess entrypoint pays for every case before the
+    approach does any work. ``None`` if the import fails.
+    """
+    module_path = target.partition(":")[0]
+    started = time.perf_counter()
+    try:
+        completed = subprocess.run(  # noqa: S603 - same interpreter, no shell
+            [
+                sys.executable,
+                "-c",
+                "import importlib, sys; importlib.import_module(sys.argv[1])",
+                module_path,
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            env=build_entrypoint_env(),
+            timeout=STARTUP_PROBE_TIMEOUT_S,
+            check=False,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if completed.returncode != 0:
+        return None
+    return time.perf_counter() - started
+
+
+def run_entrypoint(
+    command: str,
+    *,
+    input_path: Path | None = None,
+    output_path: Path | None = None,
+    case_id: str | None = None,
+    approach_args: dict[str, Any] | None = None,
+    extra_flags: dict[str, Any] | None = None,
+    timeout_s: float | None = None,
+    log_path: Path | None = None,
+    child_output: str = FORWARD,
+) -> None:
+    """Run ``command`` to completion and raise if it fails or times out.
+
+    With ``log_path`` both streams are appended to that file. Only the last
+    :data:`OUTPUT_TAIL_LINES` lines of each are kept for the error message.
+    """
+    if child_output not in CHILD_OUTPUT_MODES:
+        raise ValueError(f"Unknown child output mode '{child_output}'")
+    cmd = build_command(
+        command,
+        input_path=input_path,
+        output_path=output_path,
+        case_id=case_id,
+        approach_args=approach_args,
+        extra_flags=extra_flags,
+    )
+
+    stdout_lines: deque[str] = deque(maxlen=OUTPUT_TAIL_LINES)
+    stderr_lines: deque[str] = deque(maxlen=OUTPUT_TAIL_LINES)
+    process = subprocess.Popen(  # noqa: S603,B404 - intentional execution
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        env=build_entrypoint_env(),
+        # Keep the terminal's Ctrl-C away from the child; the harness decides.
+        start_new_session=True,
+    )
+    children.add(process)
+    log = _CaseLog(log_path) if log_path is not None else None
+    if log is not None:
+        # Retries of a case append to the same file, one header per attempt.
+        log.write(f"===== {datetime.now(timezone.utc).isoformat()} {shlex.join(cmd)}\n")
+
+    quiet = child_output == QUIET
+    prefix = f"[{case_id}] " if child_output == PREFIX and case_id else None
+    threads = [
+        threading.Thread(
+            target=_forward_stream,
+            args=(process.stdout, None if quiet else sys.stdout, stdout_lines),
+            kwargs={"prefix": prefix, "log": log},
+        ),
+        threading.Thread(
+            target=_forward_stream,
+            args=(process.stderr, None if quiet else sys.stderr, stderr_lines),
+            kwargs={"prefix": prefix, "log": log},
+        ),
+    ]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+
+    timed_out = False
+    try:
+        returncode = process.wait(timeout=timeout_s)
+    except subprocess.TimeoutExpired:
+        timed_out = True
+        _stop_process(process)
+    except KeyboardInterrupt:  # pragma: no cover - interactive flow
+        _stop_process(process)
+        raise
+    finally:
+        for thread in threads:
+            # Grandchildren of a killed process may still hold the pipes open.
+            thread.join(TERMINATE_GRACE_S if timed_out else None)
+        if log is not None:
+            log.close()
+        children.discard(process)
+
+    if timed_out:
+        assert timeout_s is not None
+        raise CaseTimeoutError(timeout_s)
+
+    if returncode != 0:
+        raise RuntimeError(
+            "\n".join(
+                [f"Command failed: {' '.join(cmd)}"]
+                + ([f"Full output: {log_path}"] if log_path is not None else [])
+                + [
+                    f"--- stdout (last {OUTPUT_TAIL_LINES} lines) ---",
+                    "".join(stdout_lines).strip(),
+                    f"--- stderr (last {OUTPUT_TAIL_LINES} lines) ---",
+                    "".join(stderr_lines).strip(),
+                ]
+            )
+        )
+
+
+def _stop_process(process: subprocess.Popen) -> None:
+    process.terminate()
+    try:
+        process.wait(timeout=TERMINATE_GRACE_S)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+@dataclass
+class SubprocessEntrypoint:
+    """Run each case in a fresh interpreter via the configured shell command.
+
+    The child's output goes to the case's log file and, depending on
+    ``child_output``, to the terminal as is, prefixed with the case id, or not
+    at all.
+    """
+
+    command: str
+    child_output: str = FORWARD
+    mode: str = "subprocess"
+
+    def __call__(
+        self,
+        *,
+        input_path: Path,
+        output_path: Path,
+        case_id: str,
+        approach_args: dict[str, Any],
+        timeout_s: float | None = None,
+        log_path: Path | None = None,
+    ) -> None:
+        run_entrypoint(
+            self.command,
+            input_path=input_path,
+            output_path=output_path,
+            case_id=case_id,
+            approach_args=approach_args,
+            timeout_s=timeout_s,
+            log_path=log_path,
+            child_output=self.child_output,
+        )
+
+    def describe(self) -> dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "command": self.command,
+            "child_output": self.child_output,
+        }
+
+    def estimated_startup_saved_s(self, cases_run: int) -> float | None:
+        return None
+
+    async def acall(
+        self,
+        *,
+        input_path: Path,
+        output_path: Path,
+        case_id: str,
+        approach_args: dict[str, Any],
+        timeout_s: float | None = None,
+        log_path: Path | None = None,
+    ) -> dict[str, Any] | None:
+        # The timeout is enforced by the thread so that the child gets killed.
+        await asyncio.to_thread(
+            self,
+            input_path=input_path,
+            output_path=output_path,
+            case_id=case_id,
+            approach_args=approach_args,
+            timeout_s=timeout_s,
+            log_path=log_path,
+        )
+        return None
+
+
+@dataclass
+class PythonEntrypoint:
+    """Call a ``module:function`` target inside the harness process.
+
+    The callable receives ``input_path``, ``output_path`` and ``case_id`` plus
+    every approach argument as keyword arguments, mirroring the flags passed to
+    subprocess entrypoints. It either writes the result JSON to ``output_path``
+    itself or returns the result mapping for the harness to write.
+    An optional ``warmup`` target is called once with the approach arguments
+    before the first case, e.g. to build the chat model client, and an optional
+    ``python_async`` coroutine function is preferred by the asyncio engine.
+    Cases share the harness streams, so no per-case log file is written.
+    """
+
+    target: str
+    func: Callable[..., Any]
+    load_s: float
+    warmup: Callable[..., Any] | None = None
+    async_func: Callable[..., Any] | None = None
+    mode: str = "python"
+    subprocess_startup_s: float | None = None
+
+    @classmethod
+    def load(
+        cls,
+        target: str,
+        warmup: str | None = None,
+        async_target: str | None = None,
+    ) -> "PythonEntrypoint":
+        started = time.perf_counter()
+        func = _import_callable(target)
+        warmup_func = _import_callable(warmup) if warmup else None
+        async_func = _import_callable(async_target) if async_target else None
+        if async_func is None and inspect.iscoroutinefunction(func):
+            async_func = func
+        return cls(
+            target=target,
+            func=func,
+            load_s=time.perf_counter() - started,
+            warmup=warmup_func,
+            async_func=async_func,
+        )
+
+    def warm_up(self, approach_args: dict[str, Any]) -> None:
+        if self.warmup is not None:
+            self.warmup(**approach_args)
+
+    def __call__(
+        self,
+        *,
+        input_path: Path,
+        output_path: Path,
+        case_id: str,
+        approach_args: dict[str, Any],
+        timeout_s: float | None = None,
+        log_path: Path | None = None,
+    ) -> None:
+        kwargs = dict(
+            input_path=input_path,
+            output_path=output_path,
+            case_id=case_id,
+            **approach_args,
+        )
+        if inspect.iscoroutinefunction(self.func):
+            result = asyncio.run(_wait_for(self.func(**kwargs), timeout_s))
+        else:
+            result = call_with_timeout(self.func, timeout_s, **kwargs)
+        if isinstance(result, dict):
+            with stage(RESULT_WRITE):
+                write_result_file(output_path, result)
+
+    async def acall(
+        self,
+        *,
+        input_path: Path,
+        output_path: Path,
+        case_id: str,
+        approach_args: dict[str, Any],
+        timeout_s: float | None = None,
+        log_path: Path | None = None,
+    ) -> dict[str, Any] | None:
+        kwargs = dict(
+            input_path=input_path,
+            output_path=output_path,
+            case_id=case_id,
+            **approach_args,
+        )
+        if self.async_func is not None:
+            result = await _wait_for(self.async_func(**kwargs), timeout_s)
+        else:
+            # Cancelling the await leaves the thread running; its result is dropped.
+            result = await _wait_for(asyncio.to_thread(self.func, **kwargs), timeout_s)
+        return result if isinstance(result, dict) else None
+
+    def describe(self) -> dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "target": self.target,
+            "load_s": round(self.load_s, 3),
+        }
+
+    def measure_startup(self) -> None:
+        """Time the interpreter start-up that the subprocess entrypoint pays per case."""
+        self.subprocess_startup_s = measure_subprocess_startup(self.target)
+
+    def estimated_startup_saved_s(self, cases_run: int) -> float | None:
+        # Under the subprocess entrypoint every case starts an interpreter that
+        # imports the approach; in process the import happened once.
+        if not cases_run or self.subprocess_startup_s is None:
+            return None
+        return round(max(self.subprocess_startup_s * cases_run - self.load_s, 0.0), 3)
+
+
+async def _wait_for(awaitable: Any, timeout_s: float | None) -> Any:
+    # Unlike asyncio.wait_for, a TimeoutError raised by the approach itself is
+    # passed through unchanged instead of being reported as a case timeout.
+    if timeout_s is None:
+        return await awaitable
+    task = asyncio.ensure_future(awaitable)
+    try:
+        done, _ = await asyncio.wait({task}, timeout=timeout_s)
+    except asyncio.CancelledError:
+        task.cancel()
+        raise
+    if not done:
+        task.cancel()
+        await asyncio.wait({task}, timeout=TERMINATE_GRACE_S)
+        raise CaseTimeoutError(timeout_s)
+    return task.result()
+
+
+def _import_callable(target: str) -> Callable[..., Any]:
+    module_path, _, attribute = target.partition(":")
+    if not module_path or not attribute:
+        raise ValueError(
+            f"Python entrypoint must use the 'module:function' form, got '{target}'"
+        )
+    module = import_module(module_path)
+    func = getattr(module, attribute, None)
+    if not callable(func):
+        raise ValueError(f"Python entrypoint {target} is not callable")
+    return func
+
+
+CaseEntrypoint = Union[SubprocessEntrypoint, PythonEntrypoint]
+
+
+def is_python_spec(spec: Any) -> bool:
+    return isinstance(spec, dict) and bool(spec.get("python"))
+
+
+def load_case_entrypoint(spec: Any, *, child_output: str = FORWARD) -> CaseEntrypoint:
+    if child_output not in CHILD_OUTPUT_MODES:
+        raise ValueError(f"Unknown child output mode '{child_output}'")
+    if isinstance(spec, str):
+        return SubprocessEntrypoint(command=spec, child_output=child_output)
+    if isinstance(spec, dict):
+        if is_python_spec(spec):
+            return PythonEntrypoint.load(
+                str(spec["python"]),
+                warmup=spec.get("warmup") or None,
+                async_target=spec.get("python_async") or None,
+            )
+        if spec.get("command"):
+            return SubprocessEntrypoint(
+                command=str(spec["command"]), child_output=child_output
+            )
+    raise ValueError(
+        "Entrypoint must be a command string or a mapping with a 'python' "
+        "('module:function') or 'command' key"
+    )
@@ -0,0 +1,350 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from statistics import mean
+from typing import Any, Callable, Sequence
+
+try:
+    import tiktoken  # type: ignore[import]
+except ImportError:  # pragma: no cover - optional dependency
+    tiktoken = None  # type: ignore[assignment]
+
+from .entrypoints import _import_callable
+from .rate_limits import (
+    DEFAULT_CHARS_PER_TOKEN,
+    DEFAULT_COMPLETION_TOKENS,
+    DEFAULT_REQUESTS_PER_CASE,
+    estimate_context_chars,
+    resolve_rate_limit,
+)
+from .scheduling import estimate_durations, estimate_makespan, iter_historical_results
+
+
+TOKENIZER_ENCODING = "o200k_base"
+TOKENIZER_BLOB_URL = (
+    "https://openaipublic.blob.core.windows.net/encodings/o200k_base.tiktoken"
+)
+
+
+def _tokenizer_cache_path() -> Path | None:
+    # Mirrors tiktoken.load.read_file_cached, which keys its cache files by
+    # the SHA-1 of the blob URL. An empty cache directory disables the cache.
+    cache_dir = os.environ.get("TIKTOKEN_CACHE_DIR")
+    if cache_dir is None:
+        cache_dir = os.environ.get("DATA_GYM_CACHE_DIR")
+    if cache_dir is None:
+        cache_dir = os.path.join(tempfile.gettempdir(), "data-gym-cache")
+    if not cache_dir:
+        return None
+    return Path(cache_dir) / hashlib.sha1(TOKENIZER_BLOB_URL.encode()).hexdigest()
+
+
+def load_tokenizer() -> Any | None:
+    """The cached tiktoken encoding, or ``None`` when it is not available offline.
+
+    tiktoken downloads its encoding files on first use without a timeout, so
+    the encoding is only loaded when its file is already in the tiktoken cache;
+    otherwise the estimate falls back to characters per token.
+    """
+    if tiktoken is None:
+        return None
+    cache_path = _tokenizer_cache_path()
+    if cache_path is None or not cache_path.is_file():
+        return None
+    try:
+        return tiktoken.get_encoding(TOKENIZER_ENCODING)
+    except Exception:  # noqa: BLE001 - any failure means "not available offline"
+        return None
+
+
+def load_estimate_entrypoint(spec: Any) -> Callable[..., Any] | None:
+    """Resolve ``entrypoints.estimate_case`` to the callable that renders prompts.
+
+    The callable receives ``input_path`` and the approach arguments and returns
+    the text of every model request of the case, as a list or a mapping.
+    """
+    if not spec:
+        return None
+    target = spec.get("python") if isinstance(spec, dict) else spec
+    if not isinstance(target, str):
+        raise ValueError(
+            "entrypoints.estimate_case must be a 'module:function' string or a "
+            "mapping with a 'python' key"
+        )
+    return _import_callable(target)
+
+
+@dataclass
+class PromptCensus:
+    """Size of the prompts one case sends, for one configuration."""
+
+    requests: int
+    chars: int
+    tokens: int | None = None
+
+
+def take_census(
+    input_path: Path,
+    approach_args: dict[str, Any],
+    *,
+    renderer: Callable[..., Any] | None,
+    tokenizer: Any | None,
+    requests_per_case: int = DEFAULT_REQUESTS_PER_CASE,
+) -> PromptCensus:
+    """Render the prompts of a materialised variant and measure them.
+
+    Without a renderer every request is assumed to carry the whole variant,
+    as the rate limiter does.
+    """
+    if renderer is None:
+        chars = estimate_context_chars(input_path)
+        return PromptCensus(requests_per_case, chars * requests_per_case)
+    rendered = renderer(input_path=input_path, **approach_args)
+    prompts = [
+        str(text)
+        for text in (rendered.values() if isinstance(rendered, dict) else rendered)
+    ]
+    tokens = None
+    if tokenizer is not None:
+        tokens = sum(
+            len(tokenizer.encode(text, disallowed_special=())) for text in prompts
+        )
+    return PromptCensus(len(prompts), sum(len(text) for text in prompts), tokens)
+
+
+@dataclass
+class CaseUsage:
+    duration_s: float | None
+    prompt_tokens: int
+    completion_tokens: int
+    prompt_usd: float
+    completion_usd: float
+
+
+def _case_usage(payload: dict[str, Any]) -> CaseUsage:
+    timing = payload.get("timing") if isinstance(payload.get("timing"), dict) else {}
+    tokens = payload.get("tokens") if isinstance(payload.get("tokens"), dict) else {}
+    cost = payload.get("cost") if isinstance(payload.get("cost"), dict) else {}
+    duration = timing.get("duration_s")
+
+    def number(source: dict[str, Any], key: str) -> float:
+        value = source.get(key)
+        return float(value) if isinstance(value, (int, float)) else 0.0
+
+    return CaseUsage(
+        duration_s=(
+            float(duration)
+            if isinstance(duration, (int, float)) and duration > 0
+            else None
+        ),
+        prompt_tokens=int(number(tokens, "prompt")),
+        completion_tokens=int(number(tokens, "completion")),
+        prompt_usd=number(cost, "prompt_usd"),
+        completion_usd=number(cost, "completion_usd"),
+    )
+
+
+def load_usage_history(
+    approach_id: str, approach_args: dict[str, Any]
+) -> tuple[dict[str, list[CaseUsage]], int]:
+    """Usage reported by earlier runs, keyed by case id, and the run count.
+
+    Completion length depends on settings such as the reasoning effort, so
+    runs with exactly the same arguments are preferred; the usual per-model
+    match is the fallback.
+    """
+    exact = sorted(key for key in approach_args if key != "exercises")
+    for match in (exact, None):
+        history: dict[str, list[CaseUsage]] = {}
+        runs: set[str] = set()
+        for run_id, case_id, payload in iter_historical_results(
+            approach_id, approach_args, match=match
+        ):
+            history.setdefault(case_id, []).append(_case_usage(payload))
+            runs.add(run_id)
+        if history:
+            return history, len(runs)
+    return {}, 0
+
+
+@dataclass
+class ConfigurationEstimate:
+    approach_args: dict[str, Any]
+    cases: int
+    repetitions: int
+    requests: int
+    prompt_tokens: int
+    completion_tokens: int
+    cost_usd: float | None
+    # Expected duration of each case of one repetition; ``None`` without history.
+    durations: list[float] | None
+    method: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+
+def _price_rates(
+    price: dict[str, Any] | None, usages: Sequence[CaseUsage]
+) -> tuple[tuple[float, float] | None, str | None]:
+    if price:
+        return (
+            float(price.get("prompt", 0.0)) / 1_000_000,
+            float(price.get("completion", 0.0)) / 1_000_000,
+        ), "pricing"
+    prompt_tokens = sum(usage.prompt_tokens for usage in usages if usage.prompt_usd)
+    completion_tokens = sum(
+        usage.completion_tokens for usage in usages if usage.completion_usd
+    )
+    if not prompt_tokens or not completion_tokens:
+        return None, None
+    return (
+        sum(usage.prompt_usd for usage in usages) / prompt_tokens,
+        sum(usage.completion_usd for usage in usages) / completion_tokens,
+    ), "history"
+
+
+def estimate_configuration(
+    approach_id: str,
+    approach_args: dict[str, Any],
+    census: dict[str, PromptCensus],
+    *,
+    repetitions: int = 1,
+    chars_per_token: float = DEFAULT_CHARS_PER_TOKEN,
+    completion_tokens: int = DEFAULT_COMPLETION_TOKENS,
+    price: dict[str, Any] | None = None,
+) -> ConfigurationEstimate:
+    """Project the tokens, cost and case durations of one configuration.
+
+    Prompt tokens come from the census, scaled by the ratio between reported
+    and counted prompt tokens on the cases that already ran with this model.
+    Completion tokens and durations are the historical means of the same case,
+    or of all cases of the model when the case itself has no history. Prices
+    per million tokens come from ``price`` or, failing that, from the cost the
+    earlier results reported.
+    """
+    history, history_runs = load_usage_history(approach_id, approach_args)
+    usages = [usage for samples in history.values() for usage in samples]
+    reported = [usage for usage in usages if usage.prompt_tokens > 0]
+
+    counted = {
+        case_id: (
+            entry.tokens if entry.tokens is not None else entry.chars / chars_per_token
+        )
+        for case_id, entry in census.items()
+    }
+    observed: list[tuple[float, float]] = []
+    for case_id, tokens in counted.items():
+        samples = [
+            usage.prompt_tokens
+            for usage in history.get(case_id, ())
+            if usage.prompt_tokens
+        ]
+        if samples and tokens > 0:
+            observed.append((tokens, mean(samples)))
+    calibration = (
+        sum(actual for _, actual in observed) / sum(tokens for tokens, _ in observed)
+        if observed
+        else 1.0
+    )
+
+    model_completion = (
+        mean(usage.completion_tokens for usage in reported) if reported else None
+    )
+    prompt_total = completion_total = 0.0
+    for case_id, entry in census.items():
+        prompt_total += counted[case_id] * calibration
+        samples = [
+            usage.completion_tokens
+            for usage in history.get(case_id, ())
+            if usage.prompt_tokens > 0
+        ]
+        if samples:
+            completion_total += mean(samples)
+        elif model_completion is not None:
+            completion_total += model_completion
+        else:
+            completion_total += completion_tokens * entry.requests
+
+    rates, price_source = _price_rates(price, reported)
+    cost = None
+    if rates is not None:
+        cost = (prompt_total * rates[0] + completion_total * rates[1]) * repetitions
+
+    case_ids = list(census)
+    durations, _estimated, has_history = estimate_durations(
+        case_ids,
+        case_id=lambda case_id: case_id,
+        size=lambda case_id: census[case_id].chars,
+        history={
+            case_id: [usage.duration_s for usage in samples if usage.duration_s]
+            for case_id, samples in history.items()
+        },
+    )
+
+    return ConfigurationEstimate(
+        approach_args=approach_args,
+        cases=len(census),
+        repetitions=repetitions,
+        requests=sum(entry.requests for entry in census.values()) * repetitions,
+        prompt_tokens=round(prompt_total * repetitions),
+        completion_tokens=round(completion_total * repetitions),
+        cost_usd=cost,
+        durations=durations if has_history else None,
+        method={
+            "history_runs": history_runs,
+            "calibrated_cases": len(observed),
+            "calibration": round(calibration, 3),
+            "price_source": price_source,
+        },
+    )
+
+
+def estimate_wall_time(
+    estimates: Sequence[ConfigurationEstimate],
+    workers: int,
+    rate_limits: dict[str, Any] | None = None,
+) -> dict[str, float | None]:
+    """Wall time of running every estimated case on ``workers`` slots.
+
+    The makespan assumes longest-first list scheduling. Each shared rate limit
+    sets a floor of its requests and tokens divided by its per-minute budget;
+    the wall time is the larger of the two.
+    """
+    durations: list[float] = []
+    makespan: float | None = None
+    if estimates and all(estimate.durations is not None for estimate in estimates):
+        for estimate in estimates:
+            durations.extend((estimate.durations or []) * estimate.repetitions)
+        makespan = estimate_makespan(sorted(durations, reverse=True), workers)
+
+    loads: dict[Any, list[float]] = {}
+    for estimate in estimates:
+        limit = resolve_rate_limit(
+            rate_limits or {}, estimate.approach_args.get("model")
+        )
+        if limit is None:
+            continue
+        load = loads.setdefault(limit, [0.0, 0.0])
+        load[0] += estimate.requests
+        load[1] += estimate.total_tokens
+    floor = 0.0
+    for limit, (requests, tokens) in loads.items():
+        if limit.rpm:
+            floor = max(floor, requests / limit.rpm * 60)
+        if limit.tpm:
+            floor = max(floor, tokens / limit.tpm * 60)
+
+    wall_time = makespan
+    if floor and (wall_time is None or floor > wall_time):
+        wall_time = floor
+    return {
+        "makespan_s": makespan,
+        "rate_limit_floor_s": floor or None,
+        "wall_time_s": wall_time,
+    }
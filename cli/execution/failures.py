@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import re
+from typing import Iterator
+
+
+RATE_LIMITED = "rate_limited"
+SERVER_ERROR = "server_error"
+
+TRANSIENT = "transient"
+PERMANENT = "permanent"
+TIMED_OUT = "timed_out"
+
+_RATE_LIMIT_PATTERN = re.compile(
+    r"error code:?\s*429|status(?:[ _]code)?[:=\s]*429|\b429 too many requests"
+    r"|ratelimiterror|rate[ _-]?limit(?:ed| exceeded| reached)",
+    re.IGNORECASE,
+)
+_SERVER_ERROR_PATTERN = re.compile(
+    r"error code:?\s*5\d\d|status(?:[ _]code)?[:=\s]*5\d\d"
+    r"|\b5\d\d (?:internal server error|bad gateway|service unavailable|gateway timeout)"
+    r"|internalservererror|serviceunavailable|overloaded_error|\boverloaded\b",
+    re.IGNORECASE,
+)
+
+# Problems with the variant itself; retrying cannot change the outcome. They
+# are checked first because subprocess errors embed the whole traceback.
+_PERMANENT_PATTERN = re.compile(
+    r"no template files found|could not locate problem statement"
+    r"|exercise-details\.json not found|unsupported programming language"
+    r"|programming language missing|failed to apply patch",
+    re.IGNORECASE,
+)
+_TIMEOUT_PATTERN = re.compile(
+    r"timed? ?out|timeouterror|readtimeout|apitimeouterror"
+    r"|apiconnectionerror|connection (?:reset|refused|aborted)"
+    r"|remote ?protocol ?error|server disconnected",
+    re.IGNORECASE,
+)
+_PARSE_ERROR_PATTERN = re.compile(
+    r"outputparserexception|failed to parse|invalid json output"
+    r"|validation errors? for|jsondecodeerror",
+    re.IGNORECASE,
+)
+_TRANSIENT_TYPES = {
+    "TimeoutError",
+    "TimeoutExpired",
+    "APITimeoutError",
+    "APIConnectionError",
+    "ReadTimeout",
+    "ConnectTimeout",
+    "OutputParserException",
+    "ValidationError",
+    "JSONDecodeError",
+}
+
+
+class CaseTimeoutError(RuntimeError):
+    """Raised when a case attempt runs past its wall-clock timeout."""
+
+    def __init__(self, timeout_s: float) -> None:
+        super().__init__(f"Case exceeded its {timeout_s:g}s timeout")
+        self.timeout_s = timeout_s
+
+
+def _exception_chain(exc: BaseException) -> Iterator[BaseException]:
+    seen: set[int] = set()
+    current: BaseException | None = exc
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        yield current
+        current = current.__cause__ or current.__context__
+
+
+def status_code_of(exc: BaseException) -> int | None:
+    """Return the HTTP status attached to an SDK exception, if any."""
+    for candidate in (exc, getattr(exc, "response", None)):
+        code = getattr(candidate, "status_code", None)
+        if isinstance(code, int):
+            return code
+    return None
+
+
+def congestion_signal(exc: BaseException) -> str | None:
+    """Tell whether a failed case was throttled or hit an overloaded provider.
+
+    Python entrypoints surface the SDK exception (with a ``status_code``);
+    subprocess and batch entrypoints only surface text, so the message is
+    matched against the error formats of the OpenAI and httpx clients.
+    """
+    for candidate in _exception_chain(exc):
+        code = status_code_of(candidate)
+        if code == 429:
+            return RATE_LIMITED
+        if code is not None and 500 <= code < 600:
+            return SERVER_ERROR
+    text = str(exc)
+    if _RATE_LIMIT_PATTERN.search(text):
+        return RATE_LIMITED
+    if _SERVER_ERROR_PATTERN.search(text):
+        return SERVER_ERROR
+    return None
+
+
+def classify_failure(exc: BaseException) -> str:
+    """Classify a failed attempt as ``TRANSIENT`` (worth retrying) or ``PERMANENT``.
+
+    Throttling, server errors, timeouts, dropped connections and structured
+    output that failed to parse are transient; broken variants and anything
+    unrecognised are permanent, so unknown bugs do not burn API budget. A case
+    killed by the harness's own ``--case-timeout`` is ``TIMED_OUT`` and is not
+    retried, since another attempt would most likely hold its slot as long.
+    """
+    if isinstance(exc, CaseTimeoutError):
+        return TIMED_OUT
+    text = str(exc)
+    if _PERMANENT_PATTERN.search(text):
+        return PERMANENT
+    if congestion_signal(exc) is not None:
+        return TRANSIENT
+    for candidate in _exception_chain(exc):
+        if isinstance(candidate, (TimeoutError, ConnectionError)):
+            return TRANSIENT
+        if type(candidate).__name__ in _TRANSIENT_TYPES:
+            return TRANSIENT
+    if _TIMEOUT_PATTERN.search(text) or _PARSE_ERROR_PATTERN.search(text):
+        return TRANSIENT
+    return PERMANENT
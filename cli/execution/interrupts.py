@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import signal
+import sys
+import threading
+from typing import Any
+
+
+class ChildProcesses:
+    """Child processes that run cases, so that a second Ctrl-C can kill them.
+
+    Anything with a ``kill()`` method can be registered: ``subprocess.Popen``
+    objects and ``multiprocessing`` processes alike. Once :meth:`kill_all` has
+    run, registering another child kills it and raises, so that retries do
+    not start new children while the harness shuts down.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._processes: set[Any] = set()
+        self.stopping = False
+
+    def add(self, process: Any) -> None:
+        with self._lock:
+            if not self.stopping:
+                self._processes.add(process)
+                return
+        process.kill()
+        raise RuntimeError("The run is stopping; no new cases are started")
+
+    def discard(self, process: Any) -> None:
+        with self._lock:
+            self._processes.discard(process)
+
+    def kill_all(self) -> int:
+        with self._lock:
+            self.stopping = True
+            processes = list(self._processes)
+            self._processes.clear()
+        for process in processes:
+            try:
+                process.kill()
+            except (OSError, ValueError):
+                pass
+        return len(processes)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stopping = False
+
+
+children = ChildProcesses()
+
+
+class GracefulInterrupt:
+    """Turn the first Ctrl-C into a drain and the second into a hard stop.
+
+    After the first SIGINT ``draining`` is set: the scheduler stops starting
+    cases, while the cases already running finish or time out. The second
+    SIGINT kills the children of the running cases and raises
+    ``KeyboardInterrupt``. Subprocess entrypoints run in their own session,
+    so the terminal's Ctrl-C reaches only the harness. Cases running inside
+    the harness process cannot be killed; the harness exits once they return.
+    """
+
+    def __init__(self) -> None:
+        self.draining = threading.Event()
+        self.interrupts = 0
+        self._previous: Any = None
+        self._installed = False
+
+    def _handle(self, signum: int, frame: Any) -> None:
+        self.interrupts += 1
+        if self.interrupts == 1:
+            self.draining.set()
+            print(
+                "\nInterrupted: finishing the running cases and cancelling the rest. "
+                "Press Ctrl-C again to stop the running cases now.",
+                file=sys.stderr,
+            )
+            return
+        killed = children.kill_all()
+        print(
+            f"\nStopping now; killed {killed} running case process(es).",
+            file=sys.stderr,
+        )
+        raise KeyboardInterrupt
+
+    def install(self) -> None:
+        # Signal handlers can only be installed from the main thread.
+        if threading.current_thread() is threading.main_thread():
+            children.reset()
+            self._previous = signal.signal(signal.SIGINT, self._handle)
+            self._installed = True
+
+    def restore(self) -> None:
+        if self._installed:
+            signal.signal(signal.SIGINT, self._previous)
+            self._installed = False
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import json
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable
+
+from cli.utils import RUNS_ROOT
+
+
+QUEUED = "queued"
+STARTED = "started"
+FINISHED = "finished"
+FAILED = "failed"
+
+
+def journal_path(approach_id: str, run_id: str) -> Path:
+    return RUNS_ROOT / approach_id / f"{run_id}.journal"
+
+
+@dataclass
+class JournalState:
+    """What a journal says about each case of a run."""
+
+    queued: set[str] = field(default_factory=set)
+    finished: set[str] = field(default_factory=set)
+    failed: set[str] = field(default_factory=set)
+    attempts: dict[str, int] = field(default_factory=dict)
+    cost_usd: float = 0.0
+    tokens: int = 0
+    events: int = 0
+    # Harness stage timings of the attempt that finished each case.
+    stages: dict[str, dict[str, float]] = field(default_factory=dict)
+    # Size of each result file when its case finished, to validate it on resume.
+    result_bytes: dict[str, int] = field(default_factory=dict)
+
+    def pending(self) -> set[str]:
+        return self.queued - self.finished
+
+
+class RunJournal:
+    """Append-only JSONL timeline of the cases of one run.
+
+    Every event is written as a single line and flushed before the call
+    returns, so after a crash the journal holds everything up to the last
+    completed write; a torn final line is ignored when the journal is read.
+    A case counts as done only once its ``finished`` event is present, which
+    is written after the result file is complete and records its size.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._tail_checked = False
+
+    def _torn_tail(self) -> bool:
+        try:
+            with self.path.open("rb") as handle:
+                handle.seek(-1, 2)
+                return handle.read(1) != b"\n"
+        except OSError:
+            return False
+
+    def _write(self, records: list[dict[str, Any]]) -> None:
+        if not records:
+            return
+        text = "".join(json.dumps(record) + "\n" for record in records)
+        with self._lock:
+            if not self._tail_checked:
+                # Start on a fresh line after a write cut short by a crash.
+                if self._torn_tail():
+                    text = "\n" + text
+                self._tail_checked = True
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(text)
+                handle.flush()
+
+    @staticmethod
+    def _record(event: str, case_id: str, **fields: Any) -> dict[str, Any]:
+        record: dict[str, Any] = {
+            "event": event,
+            "case_id": case_id,
+            "at": datetime.now(timezone.utc).isoformat(),
+        }
+        record.update(
+            {key: value for key, value in fields.items() if value is not None}
+        )
+        return record
+
+    def _append(self, event: str, case_id: str, **fields: Any) -> None:
+        self._write([self._record(event, case_id, **fields)])
+
+    def queued(self, case_ids: Iterable[str]) -> None:
+        self._write([self._record(QUEUED, case_id) for case_id in case_ids])
+
+    def started(self, case_id: str, attempt: int) -> None:
+        self._append(STARTED, case_id, attempt=attempt)
+
+    def finished(
+        self,
+        case_id: str,
+        attempt: int,
+        duration_s: float,
+        *,
+        cost_usd: float | None = None,
+        tokens: int | None = None,
+        stages: dict[str, float] | None = None,
+        result_bytes: int | None = None,
+    ) -> None:
+        self._append(
+            FINISHED,
+            case_id,
+            attempt=attempt,
+            duration_s=round(duration_s, 3),
+            cost_usd=cost_usd,
+            tokens=tokens,
+            stages=(
+                {name: round(seconds, 3) for name, seconds in stages.items()}
+                if stages
+                else None
+            ),
+            result_bytes=result_bytes,
+        )
+
+    def failed(
+        self,
+        case_id: str,
+        attempt: int,
+        duration_s: float,
+        *,
+        failure: str,
+        error: str,
+        retry_in_s: float | None = None,
+    ) -> None:
+        self._append(
+            FAILED,
+            case_id,
+            attempt=attempt,
+            duration_s=round(duration_s, 3),
+            failure=failure,
+            error=error,
+            retry_in_s=round(retry_in_s, 3) if retry_in_s is not None else None,
+        )
+
+    def load(self) -> JournalState:
+        return load_journal(self.path)
+
+
+def load_journal(path: Path) -> JournalState:
+    state = JournalState()
+    if not path.exists():
+        return state
+    with path.open(encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(record, dict) or "case_id" not in record:
+                continue
+            case_id = str(record["case_id"])
+            event = record.get("event")
+            state.events += 1
+            if event == QUEUED:
+                state.queued.add(case_id)
+            elif event == STARTED:
+                state.attempts[case_id] = max(
+                    state.attempts.get(case_id, 0), int(record.get("attempt", 1))
+                )
+            elif event == FINISHED:
+                state.finished.add(case_id)
+                state.failed.discard(case_id)
+                if isinstance(record.get("cost_usd"), (int, float)):
+                    state.cost_usd += float(record["cost_usd"])
+                if isinstance(record.get("tokens"), int):
+                    state.tokens += record["tokens"]
+                if isinstance(record.get("stages"), dict):
+                    state.stages[case_id] = record["stages"]
+                if isinstance(record.get("result_bytes"), int):
+                    state.result_bytes[case_id] = record["result_bytes"]
+            elif event == FAILED and record.get("retry_in_s") is None:
+                if case_id not in state.finished:
+                    state.failed.add(case_id)
+    return state
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Hashable, Iterable
+
+
+class VariantLeases:
+    """Materialise each variant once for every case that reads it.
+
+    Matrix runs schedule the same variant for several configurations. The
+    first lease materialises it under a per-variant lock and later leases reuse
+    the directory. When ``clean`` callables are passed to :meth:`release`, the
+    variant is cleaned once its last expected case has finished.
+    """
+
+    def __init__(self, keys: Iterable[Hashable]) -> None:
+        self._expected: Counter = Counter(keys)
+        self._lock = threading.Lock()
+        self._key_locks: dict[Hashable, threading.Lock] = {}
+        self._paths: dict[Hashable, Path] = {}
+        self.materialized = 0
+
+    def _key_lock(self, key: Hashable) -> threading.Lock:
+        with self._lock:
+            lock = self._key_locks.get(key)
+            if lock is None:
+                lock = self._key_locks[key] = threading.Lock()
+            return lock
+
+    def expect(self, key: Hashable) -> None:
+        """Announce one more case for ``key`` after construction."""
+        with self._lock:
+            self._expected[key] += 1
+
+    def acquire(self, key: Hashable, materialize: Callable[[], Path]) -> Path:
+        with self._key_lock(key):
+            path = self._paths.get(key)
+            if path is None:
+                path = materialize()
+                self._paths[key] = path
+                with self._lock:
+                    self.materialized += 1
+            return path
+
+    def release(self, key: Hashable, clean: Callable[[], None] | None = None) -> None:
+        """Return a lease; call this once per case, even if ``acquire`` failed."""
+        with self._key_lock(key):
+            with self._lock:
+                self._expected[key] -= 1
+                remaining = self._expected[key]
+            if remaining > 0 or clean is None:
+                return
+            if self._paths.pop(key, None) is not None:
+                clean()
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Sequence
+
+from .concurrency import provider_of
+from .entrypoints import _import_callable
+from .failures import CaseTimeoutError
+from .timeouts import call_with_timeout
+
+
+DEFAULT_PREFLIGHT_TIMEOUT_S = 60.0
+
+
+def load_preflight_entrypoint(spec: Any) -> Callable[..., Any] | None:
+    """Resolve ``entrypoints.preflight`` to the callable that probes a model.
+
+    The callable receives the approach arguments of a run, sends the smallest
+    request the approach can make and returns its latencies in seconds as a
+    mapping. It raises when the provider cannot be reached or rejects the call.
+    """
+    if not spec:
+        return None
+    target = spec.get("python") if isinstance(spec, dict) else spec
+    if not isinstance(target, str):
+        raise ValueError(
+            "entrypoints.preflight must be a 'module:function' string or a "
+            "mapping with a 'python' key"
+        )
+    return _import_callable(target)
+
+
+@dataclass
+class ProbeResult:
+    """Outcome of the pre-flight probe for one model."""
+
+    model: Any
+    checked_at: str
+    duration_s: float
+    latencies: dict[str, float] = field(default_factory=dict)
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def describe(self) -> dict[str, Any]:
+        summary: dict[str, Any] = {
+            "model": self.model,
+            "provider": provider_of(self.model),
+            "checked_at": self.checked_at,
+            "ok": self.ok,
+            "duration_s": round(self.duration_s, 3),
+            "latencies_s": self.latencies,
+        }
+        if self.error is not None:
+            summary["error"] = self.error
+        return summary
+
+
+def _probe(
+    probe: Callable[..., Any], approach_args: dict[str, Any], timeout_s: float | None
+) -> ProbeResult:
+    checked_at = datetime.now(timezone.utc).isoformat()
+    started = time.perf_counter()
+    try:
+        latencies = call_with_timeout(probe, timeout_s, **approach_args)
+    except Exception as exc:  # noqa: BLE001 - reported as the probe outcome
+        if isinstance(exc, CaseTimeoutError):
+            error = f"no answer within {timeout_s:g}s"
+        else:
+            error = f"{type(exc).__name__}: {exc}"
+        return ProbeResult(
+            model=approach_args.get("model"),
+            checked_at=checked_at,
+            duration_s=time.perf_counter() - started,
+            error=error,
+        )
+    return ProbeResult(
+        model=approach_args.get("model"),
+        checked_at=checked_at,
+        duration_s=time.perf_counter() - started,
+        latencies={
+            str(name): round(float(seconds), 3)
+            for name, seconds in (latencies or {}).items()
+            if isinstance(seconds, (int, float))
+        },
+    )
+
+
+def run_preflight(
+    probe: Callable[..., Any],
+    configurations: Sequence[dict[str, Any]],
+    *,
+    timeout_s: float | None = DEFAULT_PREFLIGHT_TIMEOUT_S,
+) -> dict[str, ProbeResult]:
+    """Probe every distinct model of ``configurations`` once, in parallel.
+
+    Returns the results keyed by the JSON form of the model argument, which is
+    what :func:`preflight_key` computes for a run's arguments.
+    """
+    distinct: dict[str, dict[str, Any]] = {}
+    for approach_args in configurations:
+        distinct.setdefault(preflight_key(approach_args), approach_args)
+    if not distinct:
+        return {}
+    with ThreadPoolExecutor(max_workers=len(distinct)) as executor:
+        futures = {
+            key: executor.submit(_probe, probe, approach_args, timeout_s)
+            for key, approach_args in distinct.items()
+        }
+        return {key: future.result() for key, future in futures.items()}
+
+
+def preflight_key(approach_args: dict[str, Any]) -> str:
+    return json.dumps(approach_args.get("model"), default=str)
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable
+
+from cli.utils import PROJECT_ROOT, RUNS_ROOT
+
+from .entrypoints import write_result_file
+
+
+PREPARE_MARKERS_ROOT = RUNS_ROOT / ".prepare"
+
+
+def _resolve(path: str | Path) -> Path:
+    path = Path(path)
+    return path if path.is_absolute() else PROJECT_ROOT / path
+
+
+def _stat_inputs(paths: Iterable[str | Path]) -> list[list[Any]]:
+    # Size and modification time stand in for the content: declared inputs can
+    # be model weights or indexes that are too large to hash on every run.
+    entries: list[list[Any]] = []
+    for declared in paths:
+        root = _resolve(declared)
+        if not root.exists():
+            entries.append([str(declared), None, None])
+            continue
+        files = (
+            sorted(p for p in root.rglob("*") if p.is_file())
+            if root.is_dir()
+            else [root]
+        )
+        for path in files:
+            stat = path.stat()
+            label = (
+                str(declared)
+                if path == root
+                else f"{declared}/{path.relative_to(root)}"
+            )
+            entries.append([label, stat.st_size, stat.st_mtime_ns])
+    return entries
+
+
+def prepare_fingerprint(
+    config: dict, config_path: Path, approach_args: dict[str, Any]
+) -> str:
+    """Hash everything the ``prepare`` entrypoint of one configuration depends on.
+
+    That is the approach config file, the approach arguments, the pinned
+    ``repository.commit`` and the files under ``entrypoints.prepare_inputs``.
+    """
+    entrypoints = config.get("entrypoints", {}) or {}
+    inputs = entrypoints.get("prepare_inputs") or []
+    if isinstance(inputs, str):
+        inputs = [inputs]
+    payload = {
+        "config_sha256": hashlib.sha256(Path(config_path).read_bytes()).hexdigest(),
+        "approach_args": approach_args,
+        "commit": (config.get("repository", {}) or {}).get("commit"),
+        "inputs": _stat_inputs(inputs),
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def prepare_marker_path(approach_id: str, fingerprint: str) -> Path:
+    return PREPARE_MARKERS_ROOT / approach_id / f"{fingerprint}.json"
+
+
+def is_prepared(approach_id: str, fingerprint: str) -> bool:
+    return prepare_marker_path(approach_id, fingerprint).is_file()
+
+
+def mark_prepared(
+    approach_id: str,
+    fingerprint: str,
+    *,
+    approach_args: dict[str, Any],
+    duration_s: float,
+) -> Path:
+    """Record that ``prepare`` completed for ``fingerprint``."""
+    path = prepare_marker_path(approach_id, fingerprint)
+    write_result_file(
+        path,
+        {
+            "fingerprint": fingerprint,
+            "approach_args": approach_args,
+            "prepared_at": datetime.now(timezone.utc).isoformat(),
+            "duration_s": round(duration_s, 3),
+        },
+    )
+    return path
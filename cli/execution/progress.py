@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import json
+import shutil
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, TextIO
+
+from .rate_limits import reported_tokens
+
+
+AUTO = "auto"
+LINE = "line"
+JSON = "json"
+OFF = "off"
+PROGRESS_MODES = (AUTO, LINE, JSON, OFF)
+
+DEFAULT_LINE_INTERVAL_S = 1.0
+DEFAULT_JSON_INTERVAL_S = 30.0
+LATENCY_WINDOW = 100
+
+_CLEAR_LINE = "\r\x1b[K"
+
+
+def _percentile(values: list[float], fraction: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _format_duration(seconds: float | None) -> str:
+    if seconds is None:
+        return "--"
+    seconds = int(round(seconds))
+    hours, remainder = divmod(seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    if hours:
+        return f"{hours}h{minutes:02d}m"
+    if minutes:
+        return f"{minutes}m{seconds:02d}s"
+    return f"{seconds}s"
+
+
+def _result_usage(result_path: Path) -> tuple[float | None, int | None, float | None]:
+    try:
+        payload = json.loads(result_path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None, None, None
+    if not isinstance(payload, dict):
+        return None, None, None
+    timing = payload.get("timing")
+    duration = timing.get("duration_s") if isinstance(timing, dict) else None
+    cost = payload.get("cost")
+    total_usd = cost.get("total_usd") if isinstance(cost, dict) else None
+    return (
+        float(duration) if isinstance(duration, (int, float)) else None,
+        reported_tokens(payload),
+        float(total_usd) if isinstance(total_usd, (int, float)) else None,
+    )
+
+
+class _StatusLineStream:
+    """Clear the status line before other output and redraw it afterwards."""
+
+    def __init__(self, wrapped: TextIO, progress: "ProgressReporter") -> None:
+        self._wrapped = wrapped
+        self._progress = progress
+
+    def write(self, text: str) -> int:
+        with self._progress._output_lock:
+            self._wrapped.write(_CLEAR_LINE)
+            written = self._wrapped.write(text)
+            if text.endswith("\n"):
+                self._wrapped.write(self._progress._status_line)
+            self._wrapped.flush()
+        return written
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._wrapped, name)
+
+
+class ProgressReporter:
+    """Live case counts, throughput, latency, token, cost and ETA figures.
+
+    In ``line`` mode one status line at the bottom of the terminal is redrawn
+    in place, and other output written to ``sys.stdout``/``sys.stderr`` is
+    printed above it. In ``json`` mode a snapshot is printed as one JSON line
+    every ``interval_s`` seconds and once more at the end. Latency, token and
+    cost figures come from the ``timing``, ``tokens`` and ``cost`` fields of
+    the result files.
+    """
+
+    def __init__(
+        self,
+        total: int,
+        *,
+        mode: str = AUTO,
+        interval_s: float | None = None,
+        stream: TextIO | None = None,
+    ) -> None:
+        self.stream = stream or sys.stdout
+        if mode == AUTO:
+            mode = LINE if self.stream.isatty() else JSON
+        self.mode = mode
+        if interval_s is None:
+            interval_s = (
+                DEFAULT_LINE_INTERVAL_S if mode == LINE else DEFAULT_JSON_INTERVAL_S
+            )
+        self.interval_s = interval_s
+
+        self.total = total
+        self.completed = 0
+        self.failed = 0
+        self.running = 0
+        self.tokens = 0
+        self.cost_usd = 0.0
+        self._latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._started = time.monotonic()
+
+        self._lock = threading.Lock()
+        self._output_lock = threading.RLock()
+        self._status_line = ""
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._saved_streams: tuple[TextIO, TextIO] | None = None
+
+    def case_started(self) -> None:
+        with self._lock:
+            self.running += 1
+
+    def cases_added(self, count: int) -> None:
+        with self._lock:
+            self.total += count
+
+    def case_skipped(self) -> None:
+        """Drop a case that will not run from the total."""
+        with self._lock:
+            self.total = max(self.total - 1, 0)
+
+    def case_finished(
+        self,
+        success: bool,
+        result_path: Path | None = None,
+        duration_s: float | None = None,
+    ) -> None:
+        reported_duration = tokens = cost = None
+        if success and result_path is not None:
+            reported_duration, tokens, cost = _result_usage(result_path)
+        with self._lock:
+            self.running = max(self.running - 1, 0)
+            if success:
+                self.completed += 1
+            else:
+                self.failed += 1
+            latency = reported_duration if reported_duration is not None else duration_s
+            if success and latency is not None:
+                self._latencies.append(latency)
+            self.tokens += tokens or 0
+            self.cost_usd += cost or 0.0
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            elapsed_s = time.monotonic() - self._started
+            finished = self.completed + self.failed
+            queued = max(self.total - finished - self.running, 0)
+            per_minute = finished / elapsed_s * 60 if elapsed_s > 0 else 0.0
+            remaining = queued + self.running
+            eta_s = remaining / (per_minute / 60) if per_minute > 0 else None
+            latencies = list(self._latencies)
+            return {
+                "total": self.total,
+                "completed": self.completed,
+                "running": self.running,
+                "queued": queued,
+                "failed": self.failed,
+                "elapsed_s": round(elapsed_s, 1),
+                "cases_per_min": round(per_minute, 2),
+                "latency_p50_s": _percentile(latencies, 0.5),
+                "latency_p95_s": _percentile(latencies, 0.95),
+                "tokens_per_s": (
+                    round(self.tokens / elapsed_s, 1) if elapsed_s > 0 else 0.0
+                ),
+                "tokens": self.tokens,
+                "cost_usd": round(self.cost_usd, 6),
+                "eta_s": round(eta_s, 1) if eta_s is not None and remaining else None,
+            }
+
+    @staticmethod
+    def format_line(snapshot: dict[str, Any]) -> str:
+        p50 = snapshot["latency_p50_s"]
+        p95 = snapshot["latency_p95_s"]
+        latency = f"{p50:.1f}/{p95:.1f}s" if p50 is not None else "--"
+        return (
+            f"[{snapshot['completed'] + snapshot['failed']}/{snapshot['total']}] "
+            f"done {snapshot['completed']} | running {snapshot['running']} | "
+            f"queued {snapshot['queued']} | failed {snapshot['failed']} | "
+            f"{snapshot['cases_per_min']:.1f}/min | p50/p95 {latency} | "
+            f"{snapshot['tokens_per_s']:.0f} tok/s | ${snapshot['cost_usd']:.4f} | "
+            f"ETA {_format_duration(snapshot['eta_s'])}"
+        )
+
+    def _emit(self, final: bool = False) -> None:
+        snapshot = self.snapshot()
+        with self._output_lock:
+            if self.mode == LINE:
+                # A wrapped line could not be cleared with a carriage return.
+                width = max(shutil.get_terminal_size().columns - 1, 20)
+                line = self.format_line(snapshot)[:width]
+                self._status_line = "" if final else line
+                self.stream.write(_CLEAR_LINE + line + ("\n" if final else ""))
+                self.stream.flush()
+            else:
+                record = {
+                    "event": "progress",
+                    "at": datetime.now(timezone.utc).isoformat(),
+                    "final": final,
+                    **snapshot,
+                }
+                self.stream.write(json.dumps(record) + "\n")
+                self.stream.flush()
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            self._emit()
+
+    def start(self) -> None:
+        if self.mode == OFF or self._thread is not None:
+            return
+        if self.mode == LINE:
+            # Route everything else through the status line so that it is
+            # printed above it instead of over it.
+            self._saved_streams = (sys.stdout, sys.stderr)
+            sys.stdout = _StatusLineStream(sys.stdout, self)  # type: ignore[assignment]
+            sys.stderr = _StatusLineStream(sys.stderr, self)  # type: ignore[assignment]
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self._emit(final=True)
+        if self._saved_streams is not None:
+            sys.stdout, sys.stderr = self._saved_streams
+            self._saved_streams = None
@@ -0,0 +1,337 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from cli.utils import PROJECT_ROOT, RUNS_ROOT
+
+from .concurrency import provider_of
+
+
+DEFAULT_COORDINATOR = RUNS_ROOT / ".rate-limits.sqlite"
+DEFAULT_REQUESTS_PER_CASE = 1
+DEFAULT_CHARS_PER_TOKEN = 4.0
+DEFAULT_COMPLETION_TOKENS = 4000
+MAX_SLEEP_S = 5.0
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Requests- and tokens-per-minute budget shared under ``key``."""
+
+    key: str
+    rpm: float | None = None
+    tpm: float | None = None
+
+
+@dataclass
+class Reservation:
+    key: str
+    estimated_tokens: int
+    waited_s: float
+
+
+def resolve_rate_limit(section: dict[str, Any], model: Any) -> RateLimit | None:
+    """Pick the budget for ``model`` from a ``rate_limits`` config section.
+
+    A ``models`` entry for the exact choice id wins over the ``providers``
+    entry for its prefix. Runs resolving to the same entry share one bucket.
+    """
+    models = section.get("models") or {}
+    providers = section.get("providers") or {}
+    if isinstance(model, str) and model in models:
+        key, spec = model, models[model]
+    else:
+        provider = provider_of(model)
+        if provider not in providers:
+            return None
+        key, spec = provider, providers[provider]
+    spec = spec or {}
+    rpm = spec.get("rpm")
+    tpm = spec.get("tpm")
+    if rpm is None and tpm is None:
+        return None
+    for name, value in (("rpm", rpm), ("tpm", tpm)):
+        if value is not None and float(value) <= 0:
+            raise ValueError(f"rate_limits for '{key}': {name} must be positive")
+    return RateLimit(
+        key=key,
+        rpm=float(rpm) if rpm is not None else None,
+        tpm=float(tpm) if tpm is not None else None,
+    )
+
+
+def estimate_context_chars(input_path: Path) -> int:
+    """Characters of the materialised variant that get rendered into the prompt.
+
+    Like the reference loader, hidden paths and files that are not UTF-8 text
+    (e.g. the Gradle wrapper jar) are left out.
+    """
+    total = 0
+    for file_path in input_path.rglob("*"):
+        relative = file_path.relative_to(input_path)
+        if any(part.startswith(".") for part in relative.parts):
+            continue
+        if not file_path.is_file():
+            continue
+        try:
+            total += len(file_path.read_text(encoding="utf-8"))
+        except (OSError, UnicodeDecodeError):
+            continue
+    return total
+
+
+def reported_tokens(payload: Any) -> int | None:
+    if not isinstance(payload, dict):
+        return None
+    tokens = payload.get("tokens")
+    if not isinstance(tokens, dict):
+        return None
+    total = tokens.get("total")
+    # Approaches without usage tracking report zeros; keep the estimate then.
+    if isinstance(total, (int, float)) and total > 0:
+        return int(total)
+    return None
+
+
+def read_reported_tokens(result_path: Path) -> int | None:
+    try:
+        payload = json.loads(result_path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    return reported_tokens(payload)
+
+
+class BucketCoordinator:
+    """Token buckets kept in a SQLite file so that concurrent runs share them.
+
+    Each row stores the remaining request and token allowance for one key plus
+    the wall-clock time it was last refilled; every change happens inside an
+    immediate transaction, so threads and processes see a consistent level.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                "key TEXT PRIMARY KEY, requests REAL NOT NULL, "
+                "tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.path), timeout=30.0, isolation_level=None)
+
+    def _update(self, limit: RateLimit, change: Any) -> Any:
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT requests, tokens, updated_at FROM buckets WHERE key = ?",
+                (limit.key,),
+            ).fetchone()
+            now = time.time()
+            requests_level = limit.rpm or 0.0
+            tokens_level = limit.tpm or 0.0
+            if row is not None:
+                elapsed = max(now - row[2], 0.0)
+                if limit.rpm:
+                    requests_level = min(limit.rpm, row[0] + elapsed * limit.rpm / 60)
+                if limit.tpm:
+                    tokens_level = min(limit.tpm, row[1] + elapsed * limit.tpm / 60)
+            requests_level, tokens_level, outcome = change(requests_level, tokens_level)
+            conn.execute(
+                "INSERT INTO buckets (key, requests, tokens, updated_at) "
+                "VALUES (?, ?, ?, ?) ON CONFLICT(key) DO UPDATE SET "
+                "requests = excluded.requests, tokens = excluded.tokens, "
+                "updated_at = excluded.updated_at",
+                (limit.key, requests_level, tokens_level, now),
+            )
+            conn.execute("COMMIT")
+            return outcome
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def try_take(self, limit: RateLimit, requests: int, tokens: int) -> float:
+        """Take from the buckets, or return how long to wait before retrying."""
+
+        def change(requests_level: float, tokens_level: float):
+            # A single case larger than the whole minute budget would otherwise
+            # wait forever; it only needs the bucket to be full.
+            needed_tokens = min(tokens, limit.tpm) if limit.tpm else 0
+            needed_requests = min(requests, limit.rpm) if limit.rpm else 0
+            wait_s = 0.0
+            if limit.rpm and requests_level < needed_requests:
+                wait_s = (needed_requests - requests_level) * 60 / limit.rpm
+            if limit.tpm and tokens_level < needed_tokens:
+                wait_s = max(wait_s, (needed_tokens - tokens_level) * 60 / limit.tpm)
+            if wait_s > 0:
+                return requests_level, tokens_level, wait_s
+            return requests_level - requests, tokens_level - tokens, 0.0
+
+        return self._update(limit, change)
+
+    def adjust_tokens(self, limit: RateLimit, delta: int) -> None:
+        """Charge (positive) or refund (negative) tokens after the fact."""
+        if not limit.tpm:
+            return
+
+        def change(requests_level: float, tokens_level: float):
+            # Debt is capped at one minute of budget so a wildly wrong estimate
+            # cannot stall every other run for longer than that.
+            return (
+                requests_level,
+                max(min(tokens_level - delta, limit.tpm), -limit.tpm),
+                None,
+            )
+
+        self._update(limit, change)
+
+
+class RateLimiter:
+    """Charge each case against a shared RPM/TPM budget before it starts.
+
+    Cases reserve ``requests_per_case`` requests and an estimate derived from
+    the size of their materialised input; once the result reports its actual
+    token usage the difference is charged or refunded.
+    """
+
+    def __init__(
+        self,
+        limit: RateLimit,
+        coordinator: BucketCoordinator,
+        *,
+        requests_per_case: int = DEFAULT_REQUESTS_PER_CASE,
+        chars_per_token: float = DEFAULT_CHARS_PER_TOKEN,
+        completion_tokens: int = DEFAULT_COMPLETION_TOKENS,
+    ) -> None:
+        self.limit = limit
+        self.coordinator = coordinator
+        self.requests_per_case = requests_per_case
+        self.chars_per_token = chars_per_token
+        self.completion_tokens = completion_tokens
+
+        self._lock = threading.Lock()
+        self.cases = 0
+        self.waited_s = 0.0
+        self.estimated_tokens = 0
+        self.reported_tokens = 0
+        self.corrected_cases = 0
+        self.refunded_cases = 0
+
+    @classmethod
+    def from_config(
+        cls, section: dict[str, Any] | None, model: Any
+    ) -> "RateLimiter | None":
+        if not section:
+            return None
+        limit = resolve_rate_limit(section, model)
+        if limit is None:
+            return None
+        coordinator_path = Path(section.get("coordinator") or DEFAULT_COORDINATOR)
+        if not coordinator_path.is_absolute():
+            coordinator_path = PROJECT_ROOT / coordinator_path
+        estimate = section.get("estimate") or {}
+        return cls(
+            limit,
+            BucketCoordinator(coordinator_path),
+            requests_per_case=int(
+                estimate.get("requests_per_case", DEFAULT_REQUESTS_PER_CASE)
+            ),
+            chars_per_token=float(
+                estimate.get("chars_per_token", DEFAULT_CHARS_PER_TOKEN)
+            ),
+            completion_tokens=int(
+                estimate.get("completion_tokens", DEFAULT_COMPLETION_TOKENS)
+            ),
+        )
+
+    def estimate_tokens(self, input_path: Path) -> int:
+        prompt_tokens = estimate_context_chars(input_path) / self.chars_per_token
+        return int(self.requests_per_case * prompt_tokens + self.completion_tokens)
+
+    def _reserved(self, estimated: int, waited_s: float) -> Reservation:
+        with self._lock:
+            self.cases += 1
+            self.waited_s += waited_s
+            self.estimated_tokens += estimated
+        return Reservation(self.limit.key, estimated, waited_s)
+
+    def acquire(self, input_path: Path) -> Reservation:
+        estimated = self.estimate_tokens(input_path)
+        waited_s = 0.0
+        while True:
+            wait_s = self.coordinator.try_take(
+                self.limit, self.requests_per_case, estimated
+            )
+            if wait_s <= 0:
+                return self._reserved(estimated, waited_s)
+            wait_s = min(wait_s, MAX_SLEEP_S)
+            time.sleep(wait_s)
+            waited_s += wait_s
+
+    async def acquire_async(self, input_path: Path) -> Reservation:
+        estimated = await asyncio.to_thread(self.estimate_tokens, input_path)
+        waited_s = 0.0
+        while True:
+            wait_s = await asyncio.to_thread(
+                self.coordinator.try_take,
+                self.limit,
+                self.requests_per_case,
+                estimated,
+            )
+            if wait_s <= 0:
+                return self._reserved(estimated, waited_s)
+            wait_s = min(wait_s, MAX_SLEEP_S)
+            await asyncio.sleep(wait_s)
+            waited_s += wait_s
+
+    def settle(self, reservation: Reservation, actual_tokens: int | None) -> None:
+        if actual_tokens is None:
+            return
+        with self._lock:
+            self.reported_tokens += actual_tokens
+            self.corrected_cases += 1
+        delta = actual_tokens - reservation.estimated_tokens
+        if delta:
+            self.coordinator.adjust_tokens(self.limit, delta)
+
+    def refund(self, reservation: Reservation) -> None:
+        """Return the whole token estimate of a request the provider rejected."""
+        with self._lock:
+            self.refunded_cases += 1
+        if reservation.estimated_tokens:
+            self.coordinator.adjust_tokens(self.limit, -reservation.estimated_tokens)
+
+    def describe(self) -> dict[str, Any]:
+        try:
+            coordinator = str(self.coordinator.path.relative_to(PROJECT_ROOT))
+        except ValueError:
+            coordinator = str(self.coordinator.path)
+        return {
+            "key": self.limit.key,
+            "rpm": self.limit.rpm,
+            "tpm": self.limit.tpm,
+            "coordinator": coordinator,
+            "cases": self.cases,
+            "waited_s": round(self.waited_s, 3),
+            "estimated_tokens": self.estimated_tokens,
+            "reported_tokens": self.reported_tokens,
+            "corrected_cases": self.corrected_cases,
+            "refunded_cases": self.refunded_cases,
+        }
@@ -0,0 +1,324 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Mapping, TypeVar
+
+from .failures import TIMED_OUT, TRANSIENT, classify_failure, congestion_signal
+from .journal import RunJournal
+from .rate_limits import reported_tokens
+from .stages import record_stages
+
+
+T = TypeVar("T")
+
+MAX_LOGGED_ERROR_CHARS = 2000
+
+
+@dataclass
+class RetryPolicy:
+    """Exponential backoff with full jitter for transient case failures."""
+
+    max_attempts: int = 3
+    base_delay_s: float = 2.0
+    max_delay_s: float = 60.0
+
+    def __post_init__(self) -> None:
+        if self.max_attempts < 1:
+            raise ValueError("--max-attempts must be at least 1")
+        if self.base_delay_s < 0 or self.max_delay_s < 0:
+            raise ValueError("Retry delays must not be negative")
+
+    def delay_for(self, attempt: int) -> float:
+        """Seconds to wait after the ``attempt``-th failed attempt."""
+        ceiling = min(self.max_delay_s, self.base_delay_s * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+
+def _reported_usage(result_path: Path) -> tuple[float | None, int | None]:
+    try:
+        payload = json.loads(result_path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None, None
+    cost = payload.get("cost") if isinstance(payload, dict) else None
+    total = cost.get("total_usd") if isinstance(cost, dict) else None
+    total_usd = float(total) if isinstance(total, (int, float)) else None
+    return total_usd, reported_tokens(payload)
+
+
+class AttemptLog:
+    """Append one JSON line per case attempt and aggregate retry statistics.
+
+    Failed attempts carry no usage, so their cost is estimated from the
+    successful cases of the same run: the mean case cost scaled by how much of
+    a typical case duration the attempt used. Attempts rejected with a 429 or
+    5xx response produced no output and are counted as free. Attempts killed
+    by the case timeout are logged with the ``timed_out`` status and the
+    slot-seconds they held are summed separately.
+
+    When a ``journal`` is given, every attempt is also recorded there.
+    """
+
+    def __init__(
+        self, path: Path, policy: RetryPolicy, journal: RunJournal | None = None
+    ) -> None:
+        self.path = path
+        self.policy = policy
+        self.journal = journal
+        self._lock = threading.Lock()
+
+        self.retries = 0
+        self.retried_cases: set[str] = set()
+        self.recovered_cases = 0
+        self.failed_transient = 0
+        self.failed_permanent = 0
+        self.timed_out_cases: set[str] = set()
+        self.timeout_lost_s = 0.0
+        self.wasted_s = 0.0
+        self._wasted_model_s = 0.0
+        self._success_s = 0.0
+        self._success_cost = 0.0
+        self._costed_cases = 0
+
+    def _append(self, record: dict[str, Any]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(record) + "\n")
+
+    def started(self, case_id: str, attempt: int) -> None:
+        if self.journal is not None:
+            self.journal.started(case_id, attempt)
+
+    def succeeded(
+        self,
+        case_id: str,
+        attempt: int,
+        started_at: datetime,
+        duration_s: float,
+        result_path: Path,
+        stages: dict[str, float] | None = None,
+    ) -> None:
+        cost, tokens = _reported_usage(result_path)
+        try:
+            result_bytes: int | None = result_path.stat().st_size
+        except OSError:
+            result_bytes = None
+        with self._lock:
+            if attempt > 1:
+                self.recovered_cases += 1
+            if cost is not None:
+                self._success_s += duration_s
+                self._success_cost += cost
+                self._costed_cases += 1
+            self._append(
+                {
+                    "case_id": case_id,
+                    "attempt": attempt,
+                    "started_at": started_at.isoformat(),
+                    "duration_s": round(duration_s, 3),
+                    "status": "ok",
+                }
+            )
+        if self.journal is not None:
+            self.journal.finished(
+                case_id,
+                attempt,
+                duration_s,
+                cost_usd=cost,
+                tokens=tokens,
+                stages=stages,
+                result_bytes=result_bytes,
+            )
+
+    def failed(
+        self,
+        case_id: str,
+        attempt: int,
+        started_at: datetime,
+        duration_s: float,
+        exc: BaseException,
+        *,
+        failure: str,
+        retry_in_s: float | None,
+    ) -> None:
+        signal = congestion_signal(exc)
+        record: dict[str, Any] = {
+            "case_id": case_id,
+            "attempt": attempt,
+            "started_at": started_at.isoformat(),
+            "duration_s": round(duration_s, 3),
+            "status": TIMED_OUT if failure == TIMED_OUT else "failed",
+            "failure": failure,
+            "signal": signal,
+            "error": f"{type(exc).__name__}: {exc}"[:MAX_LOGGED_ERROR_CHARS],
+        }
+        if retry_in_s is not None:
+            record["retry_in_s"] = round(retry_in_s, 3)
+        with self._lock:
+            self.wasted_s += duration_s
+            if signal is None:
+                self._wasted_model_s += duration_s
+            if retry_in_s is not None:
+                self.retries += 1
+                self.retried_cases.add(case_id)
+            elif failure == TIMED_OUT:
+                self.timed_out_cases.add(case_id)
+                self.timeout_lost_s += duration_s
+            elif failure == TRANSIENT:
+                self.failed_transient += 1
+            else:
+                self.failed_permanent += 1
+            self._append(record)
+        if self.journal is not None:
+            self.journal.failed(
+                case_id,
+                attempt,
+                duration_s,
+                failure=failure,
+                error=record["error"],
+                retry_in_s=retry_in_s,
+            )
+
+    def wasted_cost_usd_estimate(self) -> float | None:
+        with self._lock:
+            if not self._costed_cases or not self._success_s:
+                return None
+            cost_per_s = self._success_cost / self._success_s
+            return round(self._wasted_model_s * cost_per_s, 6)
+
+    def describe(self, relative_to: Path | None = None) -> dict[str, Any]:
+        path = self.path
+        if relative_to is not None:
+            try:
+                path = path.relative_to(relative_to)
+            except ValueError:
+                pass
+        with self._lock:
+            summary = {
+                "max_attempts": self.policy.max_attempts,
+                "retries": self.retries,
+                "retried_cases": len(self.retried_cases),
+                "recovered_cases": self.recovered_cases,
+                "failed_transient": self.failed_transient,
+                "failed_permanent": self.failed_permanent,
+                "timed_out": len(self.timed_out_cases),
+                "timeout_lost_s": round(self.timeout_lost_s, 3),
+                "wasted_s": round(self.wasted_s, 3),
+            }
+        summary["wasted_cost_usd_estimate"] = self.wasted_cost_usd_estimate()
+        summary["attempt_log"] = str(path)
+        return summary
+
+
+def run_with_retries(
+    case_id: str,
+    attempt_fn: Callable[[], T],
+    *,
+    policy: RetryPolicy,
+    log: AttemptLog,
+    result_path: Path,
+    on_failed_attempt: Callable[[], None] | None = None,
+    stages: Mapping[str, float] | None = None,
+) -> T:
+    """Call ``attempt_fn`` until it succeeds, fails permanently or runs out of attempts.
+
+    Harness stages timed during an attempt are journaled with its ``finished``
+    event, together with ``stages`` measured before the first attempt.
+    """
+    attempt = 1
+    while True:
+        log.started(case_id, attempt)
+        started_at = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        try:
+            with record_stages(stages) as attempt_stages:
+                result = attempt_fn()
+        except Exception as exc:
+            duration_s = time.perf_counter() - started
+            if on_failed_attempt is not None:
+                on_failed_attempt()
+            failure = classify_failure(exc)
+            retry = failure == TRANSIENT and attempt < policy.max_attempts
+            delay_s = policy.delay_for(attempt) if retry else None
+            log.failed(
+                case_id,
+                attempt,
+                started_at,
+                duration_s,
+                exc,
+                failure=failure,
+                retry_in_s=delay_s,
+            )
+            if delay_s is None:
+                raise
+            time.sleep(delay_s)
+            attempt += 1
+            continue
+        log.succeeded(
+            case_id,
+            attempt,
+            started_at,
+            time.perf_counter() - started,
+            result_path,
+            attempt_stages,
+        )
+        return result
+
+
+async def arun_with_retries(
+    case_id: str,
+    attempt_fn: Callable[[], Awaitable[T]],
+    *,
+    policy: RetryPolicy,
+    log: AttemptLog,
+    result_path: Path,
+    on_failed_attempt: Callable[[], None] | None = None,
+    stages: Mapping[str, float] | None = None,
+) -> T:
+    """Async counterpart of :func:`run_with_retries`."""
+    attempt = 1
+    while True:
+        await asyncio.to_thread(log.started, case_id, attempt)
+        started_at = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        try:
+            with record_stages(stages) as attempt_stages:
+                result = await attempt_fn()
+        except Exception as exc:
+            duration_s = time.perf_counter() - started
+            if on_failed_attempt is not None:
+                on_failed_attempt()
+            failure = classify_failure(exc)
+            retry = failure == TRANSIENT and attempt < policy.max_attempts
+            delay_s = policy.delay_for(attempt) if retry else None
+            await asyncio.to_thread(
+                log.failed,
+                case_id,
+                attempt,
+                started_at,
+                duration_s,
+                exc,
+                failure=failure,
+                retry_in_s=delay_s,
+            )
+            if delay_s is None:
+                raise
+            await asyncio.sleep(delay_s)
+            attempt += 1
+            continue
+        await asyncio.to_thread(
+            log.succeeded,
+            case_id,
+            attempt,
+            started_at,
+            time.perf_counter() - started,
+            result_path,
+            attempt_stages,
+        )
+        return result
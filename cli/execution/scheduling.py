@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import heapq
+import json
+from pathlib import Path
+from statistics import mean, median
+from typing import Any, Callable, Hashable, Iterable, Iterator, Sequence, TypeVar
+
+try:
+    import yaml  # type: ignore[import]
+except ImportError:  # pragma: no cover - optional dependency
+    yaml = None  # type: ignore[assignment]
+
+from cli.utils import RESULTS_ROOT, RUNS_ROOT
+
+from .rate_limits import estimate_context_chars
+from .sharding import split_shard_run_id
+
+
+T = TypeVar("T")
+
+FIFO = "fifo"
+LONGEST_FIRST = "longest-first"
+AFFINITY = "exercise-affinity"
+SCHEDULES = (FIFO, LONGEST_FIRST, AFFINITY)
+
+
+def _load_metadata(path: Path) -> dict[str, Any]:
+    text = path.read_text(encoding="utf-8")
+    if path.suffix in {".yaml", ".yml"} and yaml is not None:
+        return yaml.safe_load(text) or {}
+    return json.loads(text)
+
+
+def _matching_keys(approach_args: dict[str, Any]) -> list[str]:
+    # Durations mostly depend on the model; other arguments only have to match
+    # when the approach has no model argument at all.
+    if "model" in approach_args:
+        return ["model"]
+    return sorted(key for key in approach_args if key != "exercises")
+
+
+def _base_run_id(run_id: str) -> str:
+    parts = split_shard_run_id(run_id)
+    return parts[0] if parts else run_id
+
+
+def iter_historical_results(
+    approach_id: str,
+    approach_args: dict[str, Any],
+    *,
+    exclude_run_id: str | None = None,
+    exclude_shards_of: str | None = None,
+    match: Sequence[str] | None = None,
+) -> Iterator[tuple[str, str, dict[str, Any]]]:
+    """Yield ``(run_id, case_id, payload)`` for the result files of comparable runs.
+
+    A run is comparable when it agrees on the ``match`` arguments; by default
+    that is the model, or every argument if the approach has no model.
+    ``exclude_shards_of`` skips every shard of that base run id, and the run
+    they are merged into.
+    """
+    runs_dir = RUNS_ROOT / approach_id
+    if not runs_dir.is_dir():
+        return
+    keys = list(match) if match is not None else _matching_keys(approach_args)
+    wanted = {key: approach_args.get(key) for key in keys}
+
+    for metadata_path in sorted(runs_dir.iterdir()):
+        if metadata_path.suffix not in {".yaml", ".yml", ".json"}:
+            continue
+        try:
+            metadata = _load_metadata(metadata_path)
+        except (OSError, ValueError):
+            continue
+        run_id = str(metadata.get("run_id") or metadata_path.stem)
+        if run_id == exclude_run_id:
+            continue
+        if exclude_shards_of is not None and _base_run_id(run_id) == exclude_shards_of:
+            continue
+        run_args = metadata.get("args") or {}
+        if any(run_args.get(key) != value for key, value in wanted.items()):
+            continue
+        cases_dir = RESULTS_ROOT / approach_id / run_id / "cases"
+        if not cases_dir.is_dir():
+            continue
+        for case_path in sorted(cases_dir.glob("*/*/*.json")):
+            try:
+                payload = json.loads(case_path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError):
+                continue
+            if isinstance(payload, dict):
+                relative = case_path.relative_to(cases_dir).with_suffix("")
+                yield run_id, relative.as_posix(), payload
+
+
+def load_historical_durations(
+    approach_id: str,
+    approach_args: dict[str, Any],
+    *,
+    exclude_run_id: str | None = None,
+    exclude_shards_of: str | None = None,
+) -> tuple[dict[str, list[float]], int]:
+    """Collect ``timing.duration_s`` per case id from earlier comparable runs.
+
+    Returns the durations keyed by ``course/exercise/variant`` and the number
+    of runs they were taken from.
+    """
+    durations: dict[str, list[float]] = {}
+    runs_used: set[str] = set()
+    for run_id, case_id, payload in iter_historical_results(
+        approach_id,
+        approach_args,
+        exclude_run_id=exclude_run_id,
+        exclude_shards_of=exclude_shards_of,
+    ):
+        timing = payload.get("timing")
+        duration = timing.get("duration_s") if isinstance(timing, dict) else None
+        if not isinstance(duration, (int, float)) or duration <= 0:
+            continue
+        durations.setdefault(case_id, []).append(float(duration))
+        runs_used.add(run_id)
+    return durations, len(runs_used)
+
+
+def prompt_chars(exercise_path: Path, artefacts: Iterable[str]) -> int:
+    """Text size of the exercise artefacts that every variant renders."""
+    total = 0
+    for artefact in artefacts:
+        path = exercise_path / artefact
+        if path.is_dir():
+            total += estimate_context_chars(path)
+        elif path.is_file():
+            try:
+                total += len(path.read_text(encoding="utf-8"))
+            except (OSError, UnicodeDecodeError):
+                continue
+    return total
+
+
+def estimate_makespan(durations: Sequence[float], workers: int) -> float:
+    """Makespan of list scheduling ``durations`` in order onto ``workers`` slots."""
+    slots = [0.0] * max(workers, 1)
+    for duration in durations:
+        finish = heapq.heappop(slots) + duration
+        heapq.heappush(slots, finish)
+    return max(slots)
+
+
+def estimate_durations(
+    tasks: Sequence[T],
+    *,
+    case_id: Callable[[T], str],
+    size: Callable[[T], int],
+    history: dict[str, list[float]],
+) -> tuple[list[float], int, bool]:
+    """Expected duration of each task, in the order of ``tasks``.
+
+    Tasks with history get the mean duration of the same case. The others are
+    converted from prompt size to seconds with the median seconds-per-character
+    of the tasks that have history, so both kinds can be ranked together.
+    Returns the estimates, how many came from size alone, and whether any
+    history was available (otherwise the estimates are plain sizes).
+    """
+    expected: dict[int, float] = {}
+    sizes: dict[int, int] = {}
+    rates: list[float] = []
+    for index, task in enumerate(tasks):
+        sizes[index] = size(task)
+        samples = history.get(case_id(task))
+        if samples:
+            expected[index] = mean(samples)
+            if sizes[index] > 0:
+                rates.append(expected[index] / sizes[index])
+    seconds_per_char = median(rates) if rates else 1.0
+    estimated = 0
+    for index in range(len(tasks)):
+        if index not in expected:
+            expected[index] = sizes[index] * seconds_per_char
+            estimated += 1
+    return [expected[index] for index in range(len(tasks))], estimated, bool(rates)
+
+
+def order_tasks(
+    tasks: Sequence[T],
+    policy: str,
+    *,
+    case_id: Callable[[T], str],
+    size: Callable[[T], int],
+    history: dict[str, list[float]],
+    history_runs: int,
+    workers: int,
+) -> tuple[list[T], dict[str, Any]]:
+    """Order ``tasks`` according to ``policy`` and describe the decision.
+
+    ``longest-first`` sorts by the expected duration from
+    :func:`estimate_durations` (LPT).
+    """
+    if policy not in SCHEDULES:
+        raise ValueError(f"Unknown schedule '{policy}'")
+    summary: dict[str, Any] = {"policy": policy}
+    # Affinity groups span runs, so ``run-benchmark`` forms them after this step.
+    if policy in (FIFO, AFFINITY) or not tasks:
+        return list(tasks), summary
+
+    expected, estimated, has_history = estimate_durations(
+        tasks, case_id=case_id, size=size, history=history
+    )
+    order = sorted(range(len(tasks)), key=lambda index: -expected[index])
+    summary.update(
+        {
+            "history_runs": history_runs,
+            "cases_with_history": len(tasks) - estimated,
+            "cases_estimated_from_size": estimated,
+        }
+    )
+    if has_history:
+        # Only meaningful in seconds once at least one case has history.
+        summary["estimated_makespan_s"] = round(
+            estimate_makespan([expected[index] for index in order], workers), 1
+        )
+        summary["fifo_estimated_makespan_s"] = round(
+            estimate_makespan(expected, workers), 1
+        )
+    return [tasks[index] for index in order], summary
+
+
+def interleave(groups: Sequence[Sequence[T]]) -> list[T]:
+    """Merge ``groups`` round-robin, keeping the order within each group."""
+    merged: list[T] = []
+    longest = max((len(group) for group in groups), default=0)
+    for index in range(longest):
+        for group in groups:
+            if index < len(group):
+                merged.append(group[index])
+    return merged
+
+
+def group_tasks(tasks: Sequence[T], key: Callable[[T], Hashable]) -> list[list[T]]:
+    """Group ``tasks`` by ``key`` in order of first appearance, keeping their order."""
+    groups: dict[Hashable, list[T]] = {}
+    for task in tasks:
+        groups.setdefault(key(task), []).append(task)
+    return list(groups.values())
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import hashlib
+import heapq
+import re
+from typing import Sequence
+
+
+SHARD_BY_HASH = "hash"
+SHARD_BY_DURATION = "duration"
+SHARD_STRATEGIES = (SHARD_BY_HASH, SHARD_BY_DURATION)
+
+_SHARD_PATTERN = re.compile(r"\s*(\d+)\s*/\s*(\d+)\s*")
+_SHARD_RUN_ID_PATTERN = re.compile(r"(?P<base>.+)-shard(?P<index>\d+)of(?P<count>\d+)")
+
+
+def parse_shard(text: str) -> tuple[int, int]:
+    """Parse ``i/N`` (1-based) into ``(i, N)``."""
+    match = _SHARD_PATTERN.fullmatch(text)
+    if not match:
+        raise ValueError(f"--shard must look like i/N (e.g. 1/4), got '{text}'")
+    index, count = int(match.group(1)), int(match.group(2))
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"--shard {text}: the index must be between 1 and {count}")
+    return index, count
+
+
+def shard_run_id(run_id: str, index: int, count: int) -> str:
+    return f"{run_id}-shard{index}of{count}"
+
+
+def split_shard_run_id(run_id: str) -> tuple[str, int, int] | None:
+    """Return ``(base_run_id, index, count)`` for a shard run id."""
+    match = _SHARD_RUN_ID_PATTERN.fullmatch(run_id)
+    if not match:
+        return None
+    return match.group("base"), int(match.group("index")), int(match.group("count"))
+
+
+def _stable_hash(key: str) -> int:
+    # Python's hash() is salted per process; every machine must agree.
+    return int.from_bytes(hashlib.sha256(key.encode("utf-8")).digest()[:8], "big")
+
+
+def hash_shards(keys: Sequence[str], count: int) -> dict[str, int]:
+    """Assign keys to ``count`` shards in the order of a stable hash.
+
+    Dealing the hash-ordered keys round-robin keeps the shard sizes within one
+    case of each other, which hashing each key modulo ``count`` does not for
+    the few dozen variants of an exercise.
+    """
+    ordered = sorted(set(keys), key=lambda key: (_stable_hash(key), key))
+    return {key: position % count + 1 for position, key in enumerate(ordered)}
+
+
+def balanced_shards(weights: Sequence[tuple[str, float]], count: int) -> dict[str, int]:
+    """Assign keys to ``count`` shards so that their summed weights are even.
+
+    Heaviest keys go first onto the least loaded shard (LPT). Ties are broken
+    by key and shard index, so the same weights give the same split anywhere.
+    """
+    loads = [(0.0, index) for index in range(1, count + 1)]
+    assignment: dict[str, int] = {}
+    for key, weight in sorted(weights, key=lambda item: (-item[1], item[0])):
+        load, index = heapq.heappop(loads)
+        assignment[key] = index
+        heapq.heappush(loads, (load + weight, index))
+    return assignment
@@ -0,0 +1,462 @@
+from __future__ import annotations
+
+import heapq
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterable, Sequence
+
+from cli.utils import DATA_ROOT, RESULTS_ROOT, RUNS_ROOT
+
+from .affinity import AffinityQueue
+from .concurrency import provider_of
+from .rate_limits import (
+    DEFAULT_CHARS_PER_TOKEN,
+    DEFAULT_COMPLETION_TOKENS,
+    DEFAULT_REQUESTS_PER_CASE,
+    RateLimit,
+    reported_tokens,
+    resolve_rate_limit,
+)
+from .scheduling import (
+    AFFINITY,
+    LONGEST_FIRST,
+    _load_metadata,
+    group_tasks,
+    interleave,
+    order_tasks,
+    prompt_chars,
+)
+
+
+WINDOW_S = 60.0
+
+
+@dataclass
+class RecordedCase:
+    run_id: str
+    case_id: str
+    duration_s: float
+    # ``None`` until :func:`estimate_missing_tokens` fills in results that
+    # report no usage.
+    tokens: int | None
+    started_at: float | None = None
+    finished_at: float | None = None
+
+
+@dataclass
+class RecordedRun:
+    """The successful cases of one earlier run, as its result files report them."""
+
+    run_id: str
+    approach_args: dict[str, Any]
+    config_path: str | None
+    cases: list[RecordedCase]
+
+    @property
+    def provider(self) -> str:
+        return provider_of(self.approach_args.get("model"))
+
+
+@dataclass
+class ScheduleOutcome:
+    """Makespan, slot usage and peak provider load of one schedule."""
+
+    policy: str
+    concurrency: int | None
+    cases: int
+    makespan_s: float
+    busy_s: float
+    utilization: float | None
+    rate_limit_wait_s: float
+    peak_in_flight: int
+    # Per rate-limit key (or provider): the most requests and tokens started
+    # within any one-minute window.
+    peak_load: dict[str, dict[str, float]] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "policy": self.policy,
+            "concurrency": self.concurrency,
+            "cases": self.cases,
+            "makespan_s": round(self.makespan_s, 1),
+            "busy_s": round(self.busy_s, 1),
+            "utilization": (
+                round(self.utilization, 3) if self.utilization is not None else None
+            ),
+            "rate_limit_wait_s": round(self.rate_limit_wait_s, 1),
+            "peak_in_flight": self.peak_in_flight,
+            "peak_load": self.peak_load,
+        }
+
+
+def _timestamp(value: Any) -> float | None:
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return None
+
+
+def load_recorded_run(approach_id: str, run_id: str) -> RecordedRun:
+    """Read the metadata and result files of ``run_id``.
+
+    Failed cases have no result file and are left out, so the replay covers
+    only the work that completed.
+    """
+    metadata: dict[str, Any] = {}
+    for suffix in (".yaml", ".yml", ".json"):
+        metadata_path = RUNS_ROOT / approach_id / f"{run_id}{suffix}"
+        if metadata_path.exists():
+            metadata = _load_metadata(metadata_path)
+            break
+    cases_dir = RESULTS_ROOT / approach_id / run_id / "cases"
+    if not cases_dir.is_dir():
+        raise ValueError(f"No results found for run '{run_id}' under {cases_dir}")
+
+    cases: list[RecordedCase] = []
+    for case_path in sorted(cases_dir.glob("*/*/*.json")):
+        try:
+            payload = json.loads(case_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            continue
+        timing = payload.get("timing") if isinstance(payload, dict) else None
+        if not isinstance(timing, dict):
+            continue
+        duration = timing.get("duration_s")
+        if not isinstance(duration, (int, float)) or duration <= 0:
+            continue
+        cases.append(
+            RecordedCase(
+                run_id=run_id,
+                case_id=case_path.relative_to(cases_dir).with_suffix("").as_posix(),
+                duration_s=float(duration),
+                tokens=reported_tokens(payload),
+                started_at=_timestamp(timing.get("start_time")),
+                finished_at=_timestamp(timing.get("end_time")),
+            )
+        )
+    if not cases:
+        raise ValueError(f"Run '{run_id}' has no result files with timing.duration_s")
+    return RecordedRun(
+        run_id=run_id,
+        approach_args=metadata.get("args") or {},
+        config_path=metadata.get("config_path"),
+        cases=cases,
+    )
+
+
+def estimate_missing_tokens(
+    runs: Sequence[RecordedRun],
+    artefacts: Iterable[str],
+    *,
+    requests_per_case: int = DEFAULT_REQUESTS_PER_CASE,
+    chars_per_token: float = DEFAULT_CHARS_PER_TOKEN,
+    completion_tokens: int = DEFAULT_COMPLETION_TOKENS,
+) -> int:
+    """Give the cases whose results report no tokens the rate limiter's estimate.
+
+    Like ``RateLimiter.estimate_tokens`` every request is assumed to carry the
+    whole exercise, measured on the ``artefacts`` of the dataset because the
+    variant may no longer be materialised. Returns the number of cases estimated.
+    """
+    artefacts = list(artefacts)
+    exercise_chars: dict[str, int] = {}
+    estimated = 0
+    for run in runs:
+        for case in run.cases:
+            if case.tokens is not None:
+                continue
+            exercise = case.case_id.rsplit("/", 1)[0]
+            if exercise not in exercise_chars:
+                exercise_chars[exercise] = prompt_chars(DATA_ROOT / exercise, artefacts)
+            prompt_tokens = exercise_chars[exercise] / chars_per_token
+            case.tokens = int(requests_per_case * prompt_tokens + completion_tokens)
+            estimated += 1
+    return estimated
+
+
+def peak_window(
+    events: Iterable[tuple[float, float]], window_s: float = WINDOW_S
+) -> float:
+    """Largest sum of ``(time, amount)`` events that fall within ``window_s``."""
+    ordered = sorted(events)
+    peak = total = 0.0
+    start = 0
+    for time_s, amount in ordered:
+        total += amount
+        while ordered[start][0] <= time_s - window_s:
+            total -= ordered[start][1]
+            start += 1
+        peak = max(peak, total)
+    return peak
+
+
+def _peak_in_flight(intervals: Sequence[tuple[float, float]]) -> int:
+    events = sorted(
+        [(start, 1) for start, _ in intervals] + [(end, -1) for _, end in intervals],
+        key=lambda event: (event[0], event[1]),
+    )
+    peak = current = 0
+    for _, change in events:
+        current += change
+        peak = max(peak, current)
+    return peak
+
+
+def _peak_load(
+    starts: Sequence[tuple[str, float, int]], requests_per_case: int
+) -> dict[str, dict[str, float]]:
+    by_key: dict[str, list[tuple[float, int]]] = {}
+    for key, started, tokens in starts:
+        by_key.setdefault(key, []).append((started, tokens))
+    return {
+        key: {
+            "requests_per_minute": round(
+                peak_window((started, requests_per_case) for started, _ in events), 1
+            ),
+            "tokens_per_minute": round(peak_window(events), 1),
+        }
+        for key, events in sorted(by_key.items())
+    }
+
+
+def _load_key(run: RecordedRun, limits: dict[str, RateLimit | None]) -> str:
+    limit = limits.get(run.run_id)
+    return limit.key if limit is not None else run.provider
+
+
+def observed_outcome(
+    run: RecordedRun,
+    limits: dict[str, RateLimit | None],
+    *,
+    requests_per_case: int = DEFAULT_REQUESTS_PER_CASE,
+) -> ScheduleOutcome | None:
+    """What a recorded run actually did, from the timestamps in its results.
+
+    The makespan spans the first start to the last end of the replayed cases;
+    retries, failed cases and time spent outside the approach are not in it.
+    Utilization is measured against the peak number of cases in flight.
+    """
+    cases = [
+        case
+        for case in run.cases
+        if case.started_at is not None and case.finished_at is not None
+    ]
+    if not cases:
+        return None
+    intervals = [(case.started_at, case.finished_at) for case in cases]
+    makespan = max(end for _, end in intervals) - min(start for start, _ in intervals)
+    busy = sum(case.duration_s for case in cases)
+    peak_in_flight = _peak_in_flight(intervals)  # type: ignore[arg-type]
+    key = _load_key(run, limits)
+    return ScheduleOutcome(
+        policy="recorded",
+        concurrency=None,
+        cases=len(cases),
+        makespan_s=makespan,
+        busy_s=busy,
+        utilization=busy / (makespan * peak_in_flight) if makespan else None,
+        rate_limit_wait_s=0.0,
+        peak_in_flight=peak_in_flight,
+        peak_load=_peak_load(
+            [(key, case.started_at, case.tokens or 0) for case in cases],  # type: ignore[misc]
+            requests_per_case,
+        ),
+    )
+
+
+class _Bucket:
+    """Deterministic twin of ``BucketCoordinator``: full at the start, grants in order."""
+
+    def __init__(self, limit: RateLimit) -> None:
+        self.limit = limit
+        self.requests = limit.rpm or 0.0
+        self.tokens = limit.tpm or 0.0
+        self.updated = 0.0
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(now - self.updated, 0.0)
+        if self.limit.rpm:
+            self.requests = min(
+                self.limit.rpm, self.requests + elapsed * self.limit.rpm / 60
+            )
+        if self.limit.tpm:
+            self.tokens = min(
+                self.limit.tpm, self.tokens + elapsed * self.limit.tpm / 60
+            )
+        self.updated = max(self.updated, now)
+
+    def take(self, now: float, requests: int, tokens: int) -> float:
+        """Take the allowance at ``now`` or later; returns the time it was granted."""
+        now = max(now, self.updated)
+        self._refill(now)
+        wait_s = 0.0
+        needed_requests = min(requests, self.limit.rpm) if self.limit.rpm else 0
+        needed_tokens = min(tokens, self.limit.tpm) if self.limit.tpm else 0
+        if self.limit.rpm and self.requests < needed_requests:
+            wait_s = (needed_requests - self.requests) * 60 / self.limit.rpm
+        if self.limit.tpm and self.tokens < needed_tokens:
+            wait_s = max(wait_s, (needed_tokens - self.tokens) * 60 / self.limit.tpm)
+        if wait_s > 0:
+            now += wait_s
+            self._refill(now)
+        self.requests -= requests if self.limit.rpm else 0
+        self.tokens -= tokens if self.limit.tpm else 0
+        return now
+
+
+def _groups(
+    runs: Sequence[RecordedRun], policy: str, concurrency: int
+) -> list[list[RecordedCase]]:
+    # Same order as ``run-benchmark``: each run sorted by policy, then the runs
+    # interleaved per provider and the providers interleaved with each other.
+    # Longest-first ranks by the mean duration of the case across the replayed
+    # runs of the same model, which is the history the next run would see.
+    # Outside the affinity policy every case is a group of its own.
+    history: dict[Any, dict[str, list[float]]] = {}
+    for run in runs:
+        per_model = history.setdefault(run.approach_args.get("model"), {})
+        for case in run.cases:
+            per_model.setdefault(case.case_id, []).append(case.duration_s)
+
+    by_provider: dict[str, list[list[RecordedCase]]] = {}
+    for run in runs:
+        cases = list(run.cases)
+        if policy == LONGEST_FIRST:
+            cases, _summary = order_tasks(
+                cases,
+                policy,
+                case_id=lambda case: case.case_id,
+                size=lambda case: 0,
+                history=history[run.approach_args.get("model")],
+                history_runs=len(runs),
+                workers=concurrency,
+            )
+        by_provider.setdefault(run.provider, []).append(cases)
+    if policy == AFFINITY:
+        models = {run.run_id: run.approach_args.get("model") for run in runs}
+        return interleave(
+            [
+                group_tasks(
+                    [case for cases in provider_cases for case in cases],
+                    lambda case: (models[case.run_id], case.case_id.rsplit("/", 1)[0]),
+                )
+                for provider_cases in by_provider.values()
+            ]
+        )
+    return [
+        [case]
+        for case in interleave([interleave(cases) for cases in by_provider.values()])
+    ]
+
+
+def simulate_schedule(
+    runs: Sequence[RecordedRun],
+    limits: dict[str, RateLimit | None],
+    *,
+    policy: str,
+    concurrency: int,
+    requests_per_case: int = DEFAULT_REQUESTS_PER_CASE,
+) -> ScheduleOutcome:
+    """Replay the recorded durations through the run scheduler as a discrete-event simulation.
+
+    Free slots take their cases from the same :class:`AffinityQueue` that
+    dispatches an affinity run. A case waits in its slot until its rate-limit
+    bucket can grant ``requests_per_case`` requests and its reported tokens,
+    and then holds the slot for its recorded duration, as ``CaseExecutor``
+    does with a fixed concurrency limit. Retries and failures are not modelled.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    affinity: AffinityQueue[RecordedCase] = AffinityQueue(
+        _groups(runs, policy, concurrency)
+    )
+    runs_by_id = {run.run_id: run for run in runs}
+    buckets = {
+        limit.key: _Bucket(limit) for limit in limits.values() if limit is not None
+    }
+    idle = list(range(concurrency))
+    running: list[tuple[float, int, int, RecordedCase]] = []
+    intervals: list[tuple[float, float]] = []
+    starts: list[tuple[str, float, int]] = []
+    waited = now = 0.0
+    while True:
+        waiting: list[int] = []
+        for slot in sorted(idle):
+            case = affinity.take(slot)
+            if case is None:
+                waiting.append(slot)
+                continue
+            run = runs_by_id[case.run_id]
+            limit = limits.get(run.run_id)
+            started = now
+            if limit is not None:
+                started = buckets[limit.key].take(
+                    now, requests_per_case, case.tokens or 0
+                )
+                waited += started - now
+            finished = started + case.duration_s
+            heapq.heappush(running, (finished, len(intervals), slot, case))
+            intervals.append((started, finished))
+            starts.append((_load_key(run, limits), started, case.tokens or 0))
+        idle = waiting
+        if not running:
+            break
+        now, _, slot, case = heapq.heappop(running)
+        affinity.done(case)
+        idle.append(slot)
+
+    makespan = max((end for _, end in intervals), default=0.0)
+    busy = sum(end - start for start, end in intervals)
+    return ScheduleOutcome(
+        policy=policy,
+        concurrency=concurrency,
+        cases=len(intervals),
+        makespan_s=makespan,
+        busy_s=busy,
+        utilization=busy / (makespan * concurrency) if makespan else None,
+        rate_limit_wait_s=waited,
+        peak_in_flight=_peak_in_flight(intervals),
+        peak_load=_peak_load(starts, requests_per_case),
+    )
+
+
+def recorded_rate_limits(
+    runs: Sequence[RecordedRun],
+    section: dict[str, Any] | None,
+    *,
+    rpm: float | None = None,
+    tpm: float | None = None,
+) -> dict[str, RateLimit | None]:
+    """The budget each run would draw from, keyed by run id.
+
+    ``rpm``/``tpm`` replace the configured limits with one budget per provider.
+    """
+    limits: dict[str, RateLimit | None] = {}
+    for run in runs:
+        if rpm is not None or tpm is not None:
+            limits[run.run_id] = RateLimit(key=run.provider, rpm=rpm, tpm=tpm)
+        elif section:
+            limits[run.run_id] = resolve_rate_limit(
+                section, run.approach_args.get("model")
+            )
+        else:
+            limits[run.run_id] = None
+    return limits
+
+
+def load_config_rate_limits(run: RecordedRun) -> dict[str, Any] | None:
+    """The ``rate_limits`` section of the approach config the run was started with."""
+    if not run.config_path:
+        return None
+    config_path = Path(run.config_path)
+    if not config_path.is_absolute():
+        config_path = RUNS_ROOT.parent / config_path
+    if not config_path.exists():
+        return None
+    config = _load_metadata(config_path)
+    section = config.get("rate_limits") if isinstance(config, dict) else None
+    return section if isinstance(section, dict) else None
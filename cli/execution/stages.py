@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Mapping
+
+MATERIALIZE = "materialize"
+RESULT_WRITE = "result_write"
+
+_current: ContextVar[dict[str, float] | None] = ContextVar("case_stages", default=None)
+
+
+@contextmanager
+def record_stages(
+    initial: Mapping[str, float] | None = None,
+) -> Iterator[dict[str, float]]:
+    """Collect the harness stages timed with :func:`stage` during one attempt.
+
+    The stages of the approach itself are reported in the result file under
+    ``timing.stages``; the harness cannot add its own there, because the
+    result write is one of them, so they are recorded in the run journal.
+    """
+    stages = dict(initial or {})
+    token = _current.set(stages)
+    try:
+        yield stages
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Add the time spent in the block to ``name``; a no-op outside an attempt."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_stage(name, time.perf_counter() - started)
+
+
+def add_stage(name: str, seconds: float) -> None:
+    stages = _current.get()
+    if stages is not None:
+        stages[name] = stages.get(name, 0.0) + seconds
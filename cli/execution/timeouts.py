@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import contextvars
+import threading
+from typing import Any, Callable, TypeVar
+
+from .concurrency import provider_of
+from .failures import CaseTimeoutError
+
+
+T = TypeVar("T")
+
+# Seconds a child process gets to exit after SIGTERM before it is killed.
+TERMINATE_GRACE_S = 5.0
+
+
+def resolve_case_timeout(
+    section: dict[str, Any] | None, model: Any, default_s: float | None
+) -> float | None:
+    """Pick the wall-clock timeout for ``model`` from a ``case_timeouts`` section.
+
+    A ``models`` entry for the exact choice id wins over the ``providers``
+    entry for its prefix, which wins over ``default_s`` (``--case-timeout``)
+    and then the section's own ``default``. ``None`` or ``0`` disables it.
+    """
+    section = section or {}
+    models = section.get("models") or {}
+    providers = section.get("providers") or {}
+    if isinstance(model, str) and model in models:
+        key, value = model, models[model]
+    elif provider_of(model) in providers:
+        key, value = provider_of(model), providers[provider_of(model)]
+    elif default_s is not None:
+        key, value = "--case-timeout", default_s
+    else:
+        key, value = "default", section.get("default")
+    if value is None:
+        return None
+    value = float(value)
+    if value < 0:
+        raise ValueError(f"case_timeouts for '{key}' must not be negative")
+    return value or None
+
+
+def call_with_timeout(
+    func: Callable[..., T], timeout_s: float | None, **kwargs: Any
+) -> T:
+    """Call ``func`` and raise :class:`CaseTimeoutError` after ``timeout_s``.
+
+    A thread cannot be killed, so on timeout the call is left running in a
+    daemon thread and its eventual result is discarded.
+    """
+    if timeout_s is None:
+        return func(**kwargs)
+
+    outcome: dict[str, Any] = {}
+    context = contextvars.copy_context()
+
+    def target() -> None:
+        try:
+            outcome["result"] = context.run(func, **kwargs)
+        except BaseException as exc:  # noqa: BLE001 - re-raised in the caller
+            outcome["error"] = exc
+
+    thread = threading.Thread(target=target, name="case-timeout", daemon=True)
+    thread.start()
+    thread.join(timeout_s)
+    if thread.is_alive():
+        raise CaseTimeoutError(timeout_s)
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+DEFAULT_LEASE_S = 300.0
+DEFAULT_MAX_CLAIMS = 3
+
+
+@dataclass
+class QueuedCase:
+    entry_id: int
+    run_id: str
+    case_id: str
+    claims: int
+
+
+class WorkQueue:
+    """Cases of one or more runs in a SQLite file that workers pull from.
+
+    Workers claim a case by leasing it for ``lease_s`` seconds and keep the
+    lease alive with heartbeats. A lease that is not renewed (the worker died
+    or lost the filesystem) expires and the case is handed out again; a case
+    whose lease expired ``max_claims`` times is marked failed so a case that
+    crashes its worker cannot take down every worker in turn.
+
+    The file uses SQLite's rollback journal rather than WAL because WAL needs
+    shared memory, which network filesystems do not provide.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.executescript(
+                "CREATE TABLE IF NOT EXISTS runs ("
+                "run_id TEXT PRIMARY KEY, approach_id TEXT NOT NULL, "
+                "spec TEXT NOT NULL);"
+                "CREATE TABLE IF NOT EXISTS cases ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, run_id TEXT NOT NULL, "
+                "case_id TEXT NOT NULL, status TEXT NOT NULL, "
+                "claims INTEGER NOT NULL DEFAULT 0, worker TEXT, "
+                "lease_expires_at REAL, updated_at REAL NOT NULL, error TEXT, "
+                "UNIQUE (run_id, case_id));"
+                "CREATE INDEX IF NOT EXISTS cases_status ON cases (status, id);"
+            )
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.path), timeout=60.0, isolation_level=None)
+
+    def _transaction(self, work: Any) -> Any:
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            outcome = work(conn)
+            conn.execute("COMMIT")
+            return outcome
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def enqueue(
+        self,
+        runs: dict[str, tuple[str, dict[str, Any]]],
+        cases: Iterable[tuple[str, str]],
+    ) -> int:
+        """Register ``runs`` and append their ``(run_id, case_id)`` pairs in order.
+
+        ``runs`` maps each run id to ``(approach_id, spec)``. Returns how many
+        cases were added; cases that are already queued keep their state.
+        """
+
+        def work(conn: sqlite3.Connection) -> int:
+            conn.executemany(
+                "INSERT INTO runs (run_id, approach_id, spec) VALUES (?, ?, ?) "
+                "ON CONFLICT(run_id) DO UPDATE SET spec = excluded.spec",
+                [
+                    (run_id, approach_id, json.dumps(spec))
+                    for run_id, (approach_id, spec) in runs.items()
+                ],
+            )
+            now = time.time()
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO cases (run_id, case_id, status, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                [(run_id, case_id, PENDING, now) for run_id, case_id in cases],
+            )
+            return conn.total_changes - before
+
+        return self._transaction(work)
+
+    def runs(self) -> dict[str, tuple[str, dict[str, Any]]]:
+        """Map run id to ``(approach_id, spec)``."""
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT run_id, approach_id, spec FROM runs").fetchall()
+        finally:
+            conn.close()
+        return {
+            run_id: (approach_id, json.loads(spec))
+            for run_id, approach_id, spec in rows
+        }
+
+    def claim(
+        self,
+        worker: str,
+        *,
+        lease_s: float = DEFAULT_LEASE_S,
+        max_claims: int = DEFAULT_MAX_CLAIMS,
+    ) -> QueuedCase | None:
+        def work(conn: sqlite3.Connection) -> QueuedCase | None:
+            now = time.time()
+            conn.execute(
+                "UPDATE cases SET status = ?, worker = NULL, updated_at = ?, "
+                "error = 'lease expired ' || claims || ' time(s)' "
+                "WHERE status = ? AND lease_expires_at < ? AND claims >= ?",
+                (FAILED, now, LEASED, now, max_claims),
+            )
+            row = conn.execute(
+                "SELECT id, run_id, case_id, claims FROM cases "
+                "WHERE status = ? OR (status = ? AND lease_expires_at < ?) "
+                "ORDER BY id LIMIT 1",
+                (PENDING, LEASED, now),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE cases SET status = ?, worker = ?, claims = claims + 1, "
+                "lease_expires_at = ?, updated_at = ? WHERE id = ?",
+                (LEASED, worker, now + lease_s, now, row[0]),
+            )
+            return QueuedCase(
+                entry_id=row[0], run_id=row[1], case_id=row[2], claims=row[3] + 1
+            )
+
+        return self._transaction(work)
+
+    def heartbeat(
+        self, entry_ids: Iterable[int], worker: str, *, lease_s: float
+    ) -> set[int]:
+        """Extend the leases ``worker`` holds; return the ids it no longer holds."""
+        entry_ids = list(entry_ids)
+        if not entry_ids:
+            return set()
+
+        def work(conn: sqlite3.Connection) -> set[int]:
+            now = time.time()
+            lost: set[int] = set()
+            for entry_id in entry_ids:
+                cursor = conn.execute(
+                    "UPDATE cases SET lease_expires_at = ?, updated_at = ? "
+                    "WHERE id = ? AND worker = ? AND status = ?",
+                    (now + lease_s, now, entry_id, worker, LEASED),
+                )
+                if cursor.rowcount == 0:
+                    lost.add(entry_id)
+            return lost
+
+        return self._transaction(work)
+
+    def complete(
+        self, entry_id: int, worker: str, *, success: bool, error: str | None = None
+    ) -> bool:
+        """Record the outcome; ``False`` if the lease had passed to another worker."""
+
+        def work(conn: sqlite3.Connection) -> bool:
+            cursor = conn.execute(
+                "UPDATE cases SET status = ?, error = ?, lease_expires_at = NULL, "
+                "updated_at = ? WHERE id = ? AND worker = ? AND status = ?",
+                (
+                    DONE if success else FAILED,
+                    error,
+                    time.time(),
+                    entry_id,
+                    worker,
+                    LEASED,
+                ),
+            )
+            return cursor.rowcount > 0
+
+        return self._transaction(work)
+
+    def release(self, entry_ids: Iterable[int], worker: str) -> None:
+        """Hand unfinished cases back right away instead of waiting for expiry."""
+        entry_ids = list(entry_ids)
+        if not entry_ids:
+            return
+
+        def work(conn: sqlite3.Connection) -> None:
+            conn.executemany(
+                "UPDATE cases SET status = ?, worker = NULL, claims = claims - 1, "
+                "lease_expires_at = NULL, updated_at = ? "
+                "WHERE id = ? AND worker = ? AND status = ?",
+                [
+                    (PENDING, time.time(), entry_id, worker, LEASED)
+                    for entry_id in entry_ids
+                ],
+            )
+
+        self._transaction(work)
+
+    def counts(self, run_id: str | None = None) -> dict[str, int]:
+        conn = self._connect()
+        try:
+            query = "SELECT status, COUNT(*) FROM cases"
+            params: tuple[Any, ...] = ()
+            if run_id is not None:
+                query += " WHERE run_id = ?"
+                params = (run_id,)
+            rows = conn.execute(query + " GROUP BY status", params).fetchall()
+        finally:
+            conn.close()
+        counts = {PENDING: 0, LEASED: 0, DONE: 0, FAILED: 0}
+        counts.update({status: count for status, count in rows})
+        return counts
+
+    def failures(self, run_id: str) -> list[tuple[str, str | None]]:
+        conn = self._connect()
+        try:
+            return conn.execute(
+                "SELECT case_id, error FROM cases WHERE run_id = ? AND status = ? "
+                "ORDER BY id",
+                (run_id, FAILED),
+            ).fetchall()
+        finally:
+            conn.close()
@@ -0,0 +1,411 @@
+from __future__ import annotations
+
+import multiprocessing
+import queue
+import signal
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from pathlib import Path
+from typing import Any, Sequence
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
+
+from .entrypoints import PythonEntrypoint, is_python_spec, measure_subprocess_startup
+from .failures import CaseTimeoutError
+from .interrupts import children
+from .stages import add_stage, record_stages
+
+
+READY = "ready"
+OK = "ok"
+ERROR = "error"
+
+POLL_INTERVAL_S = 0.5
+SHUTDOWN_TIMEOUT_S = 5.0
+
+
+class WorkerCrashedError(RuntimeError):
+    """Raised when a worker process exits while it owns a case."""
+
+
+def _peak_rss_mb() -> float:
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere.
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def _worker_main(
+    spec: dict[str, Any], warm_up_args: list[dict[str, Any]], conn: Connection
+) -> None:
+    # The parent owns interrupt handling and shuts workers down explicitly.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    try:
+        entrypoint = PythonEntrypoint.load(
+            str(spec["python"]), warmup=spec.get("warmup") or None
+        )
+        for approach_args in warm_up_args:
+            entrypoint.warm_up(approach_args)
+    except Exception:  # noqa: BLE001 - reported to the parent
+        conn.send((ERROR, traceback.format_exc(), _peak_rss_mb()))
+        return
+    conn.send((READY, entrypoint.load_s, _peak_rss_mb()))
+
+    while True:
+        try:
+            payload = conn.recv()
+        except EOFError:
+            return
+        if payload is None:
+            return
+        try:
+            with record_stages() as stages:
+                entrypoint(
+                    input_path=Path(payload["input_path"]),
+                    output_path=Path(payload["output_path"]),
+                    case_id=payload["case_id"],
+                    approach_args=payload["approach_args"],
+                )
+        except Exception as exc:  # noqa: BLE001 - reported to the parent
+            message = f"{type(exc).__name__}: {exc}\n{traceback.format_exc()}"
+            conn.send((ERROR, message, _peak_rss_mb()))
+        else:
+            conn.send((OK, stages, _peak_rss_mb()))
+
+
+@dataclass(eq=False)
+class _Worker:
+    process: Any
+    conn: Connection
+    load_s: float = 0.0
+    cases: int = 0
+    peak_rss_mb: float = 0.0
+    # Model and exercise of the last case, whose prompt the worker has cached.
+    affinity: Any = None
+
+
+class _IdleWorkers:
+    """Idle workers; a worker that last ran the requested exercise goes first."""
+
+    def __init__(self) -> None:
+        self._workers: list[_Worker] = []
+        self._available = threading.Condition()
+
+    def put(self, worker: _Worker) -> None:
+        with self._available:
+            self._workers.append(worker)
+            self._available.notify()
+
+    def get(self, timeout_s: float, affinity: Any = None) -> tuple[_Worker, bool]:
+        """Return an idle worker and whether it matched ``affinity``.
+
+        Raises ``queue.Empty`` when no worker became idle within ``timeout_s``.
+        """
+        with self._available:
+            if not self._workers:
+                self._available.wait(timeout_s)
+            if not self._workers:
+                raise queue.Empty
+            if affinity is not None:
+                for index, worker in enumerate(self._workers):
+                    if worker.affinity == affinity:
+                        return self._workers.pop(index), True
+            return self._workers.pop(0), False
+
+
+class WorkerPool:
+    """Long-lived worker processes that import a python entrypoint once.
+
+    Each call blocks until an idle worker has run the case, so the pool can be
+    driven by the regular case threads. Workers are recycled after
+    ``max_cases_per_worker`` cases or once their peak RSS passes
+    ``max_rss_mb``; a worker that dies mid-case is replaced and the case is
+    requeued on a fresh worker up to ``max_requeues`` times. A worker whose
+    case runs past ``timeout_s`` is terminated and replaced as well, but the
+    case is not requeued. Every worker is warmed up once for each entry of
+    ``warm_up_args``, so that a matrix run finds all of its models ready.
+    """
+
+    mode = "worker-pool"
+
+    def __init__(
+        self,
+        spec: Any,
+        *,
+        size: int,
+        warm_up_args: Sequence[dict[str, Any]],
+        max_cases_per_worker: int | None = None,
+        max_rss_mb: float | None = None,
+        max_requeues: int = 1,
+    ) -> None:
+        if not is_python_spec(spec):
+            raise ValueError(
+                "The worker pool requires a python run_case entrypoint "
+                "({python: 'module:function'})"
+            )
+        if size < 1:
+            raise ValueError("Worker pool size must be at least 1")
+        self.spec = dict(spec)
+        self.size = size
+        self.warm_up_args = [dict(approach_args) for approach_args in warm_up_args]
+        self.max_cases_per_worker = max_cases_per_worker
+        self.max_rss_mb = max_rss_mb
+        self.max_requeues = max_requeues
+
+        self._context = multiprocessing.get_context("spawn")
+        self._idle = _IdleWorkers()
+        self._lock = threading.Lock()
+        self._workers: list[_Worker] = []
+        self._closed = False
+        self._failure: Exception | None = None
+
+        self.spawned = 0
+        self.recycled = 0
+        self.crashed = 0
+        self.requeued = 0
+        self.timed_out = 0
+        self.warm_hits = 0
+        self.load_s_total = 0.0
+        self.subprocess_startup_s: float | None = None
+
+    def __enter__(self) -> "WorkerPool":
+        self.start()
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.close()
+
+    def start(self) -> None:
+        pending = [self._spawn() for _ in range(self.size)]
+        for worker in pending:
+            self._await_ready(worker)
+            self._idle.put(worker)
+
+    def _spawn(self) -> _Worker:
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(self.spec, self.warm_up_args, child_conn),
+            daemon=True,
+        )
+        process.start()
+        children.add(process)
+        child_conn.close()
+        worker = _Worker(process=process, conn=parent_conn)
+        with self._lock:
+            self._workers.append(worker)
+            self.spawned += 1
+        return worker
+
+    def _await_ready(self, worker: _Worker) -> None:
+        try:
+            status, value, rss = self._receive(worker)
+        except WorkerCrashedError:
+            self._retire(worker)
+            raise
+        if status != READY:
+            self._retire(worker)
+            raise RuntimeError(f"Worker failed to load {self.spec['python']}:\n{value}")
+        worker.load_s = float(value)
+        worker.peak_rss_mb = rss
+        with self._lock:
+            self.load_s_total += worker.load_s
+
+    def _receive(
+        self, worker: _Worker, timeout_s: float | None = None
+    ) -> tuple[str, Any, float]:
+        deadline = time.monotonic() + timeout_s if timeout_s is not None else None
+        while True:
+            wait_s = POLL_INTERVAL_S
+            if deadline is not None:
+                wait_s = min(wait_s, max(deadline - time.monotonic(), 0))
+            try:
+                if worker.conn.poll(wait_s):
+                    return worker.conn.recv()
+            except (EOFError, OSError) as exc:
+                raise WorkerCrashedError(
+                    f"Worker {worker.process.pid} closed its pipe"
+                ) from exc
+            if not worker.process.is_alive():
+                raise WorkerCrashedError(
+                    f"Worker {worker.process.pid} exited with code "
+                    f"{worker.process.exitcode}"
+                )
+            if deadline is not None and time.monotonic() >= deadline:
+                assert timeout_s is not None
+                raise CaseTimeoutError(timeout_s)
+
+    def _retire(self, worker: _Worker) -> None:
+        try:
+            worker.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        worker.process.join(timeout=SHUTDOWN_TIMEOUT_S)
+        if worker.process.is_alive():
+            worker.process.kill()
+            worker.process.join()
+        worker.conn.close()
+        children.discard(worker.process)
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+
+    def _replace(self, worker: _Worker) -> _Worker:
+        self._retire(worker)
+        try:
+            fresh = self._spawn()
+            self._await_ready(fresh)
+        except Exception as exc:
+            # Without a replacement the pool shrinks; fail waiting callers
+            # instead of letting them block on an idle queue that never refills.
+            self._failure = exc
+            raise
+        return fresh
+
+    def _acquire(self, affinity: Any = None) -> _Worker:
+        while True:
+            if self._failure is not None:
+                raise RuntimeError(f"Worker pool unavailable: {self._failure}")
+            if self._closed:
+                raise RuntimeError("Worker pool is closed")
+            try:
+                worker, warm = self._idle.get(POLL_INTERVAL_S, affinity)
+            except queue.Empty:
+                continue
+            if warm:
+                with self._lock:
+                    self.warm_hits += 1
+            return worker
+
+    def _release(self, worker: _Worker) -> None:
+        worn_out = (
+            self.max_cases_per_worker is not None
+            and worker.cases >= self.max_cases_per_worker
+        )
+        bloated = self.max_rss_mb is not None and worker.peak_rss_mb >= self.max_rss_mb
+        if worn_out or bloated:
+            with self._lock:
+                self.recycled += 1
+            try:
+                worker = self._replace(worker)
+            except Exception:  # noqa: BLE001 - stored in self._failure by _replace
+                # The case on the retired worker has already finished; only later
+                # acquires fail.
+                return
+        self._idle.put(worker)
+
+    def __call__(
+        self,
+        *,
+        input_path: Path,
+        output_path: Path,
+        case_id: str,
+        approach_args: dict[str, Any],
+        timeout_s: float | None = None,
+        log_path: Path | None = None,
+    ) -> None:
+        payload = {
+            "input_path": str(input_path),
+            "output_path": str(output_path),
+            "case_id": case_id,
+            "approach_args": approach_args,
+        }
+        # Variants of an exercise share most of their prompt; the worker that ran
+        # the last one keeps its provider connection and approach caches warm.
+        affinity = (approach_args.get("model"), case_id.rsplit("/", 1)[0])
+        requeues = 0
+        while True:
+            worker = self._acquire(affinity)
+            try:
+                worker.conn.send(payload)
+                status, message, rss = self._receive(worker, timeout_s)
+            except CaseTimeoutError:
+                with self._lock:
+                    self.timed_out += 1
+                # _retire kills the worker if it has not exited after SIGTERM.
+                worker.process.terminate()
+                self._idle.put(self._replace(worker))
+                raise
+            except (WorkerCrashedError, BrokenPipeError, OSError) as exc:
+                with self._lock:
+                    self.crashed += 1
+                self._idle.put(self._replace(worker))
+                if requeues >= self.max_requeues:
+                    raise WorkerCrashedError(
+                        f"Worker crashed while running {case_id}: {exc}"
+                    ) from exc
+                requeues += 1
+                with self._lock:
+                    self.requeued += 1
+                continue
+
+            worker.cases += 1
+            worker.peak_rss_mb = rss
+            worker.affinity = affinity
+            if status != ERROR:
+                # The result was written by the worker; its stages are reported back.
+                for name, seconds in (message or {}).items():
+                    add_stage(name, seconds)
+            self._release(worker)
+            if status == ERROR:
+                raise RuntimeError(message)
+            return
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        with self._lock:
+            workers = list(self._workers)
+        deadline = time.monotonic() + SHUTDOWN_TIMEOUT_S
+        for worker in workers:
+            try:
+                worker.conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for worker in workers:
+            worker.process.join(timeout=max(deadline - time.monotonic(), 0))
+            if worker.process.is_alive():
+                worker.process.kill()
+                worker.process.join()
+            worker.conn.close()
+            children.discard(worker.process)
+        with self._lock:
+            self._workers.clear()
+
+    def describe(self) -> dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "target": self.spec["python"],
+            "workers": self.size,
+            "spawned": self.spawned,
+            "recycled": self.recycled,
+            "crashed": self.crashed,
+            "requeued": self.requeued,
+            "timed_out": self.timed_out,
+            "warm_hits": self.warm_hits,
+            "load_s": round(self.load_s_total, 3),
+            "max_cases_per_worker": self.max_cases_per_worker,
+            "max_rss_mb": self.max_rss_mb,
+        }
+
+    def measure_startup(self) -> None:
+        """Time the interpreter start-up that the subprocess entrypoint pays per case."""
+        self.subprocess_startup_s = measure_subprocess_startup(self.spec["python"])
+
+    def estimated_startup_saved_s(self, cases_run: int) -> float | None:
+        # Each spawned worker paid one interpreter start-up; the subprocess
+        # entrypoint pays one for every case.
+        if not self.spawned or self.subprocess_startup_s is None:
+            return None
+        return round(self.subprocess_startup_s * max(cases_run - self.spawned, 0), 3)
@@ -24,6 +24,9 @@ def build_parser() -> argparse.ArgumentParser:
     commands = {
         "variants": "cli.commands.variants",
         "run-benchmark": "cli.commands.run",
+        "merge-runs": "cli.commands.merge_runs",
+        "simulate-run": "cli.commands.simulate_run",
+        "worker": "cli.commands.worker",
         "report": "cli.commands.report",
         "variants-analysis": "cli.commands.variants_analysis",
     }
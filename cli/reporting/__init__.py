@@ -1,7 +1,9 @@
 """Reporting helpers shared across CLI commands."""
 
+from .bootstrap import micro_f1, repetition_interval
 from .dataset import summarise_dataset
 from .metrics import (
+    collect_case_counts,
     compute_f1_iou,
     evaluate_case,
     extract_prediction_issues,
@@ -11,7 +13,10 @@ from .metrics import (
 )
 
 __all__ = [
+    "micro_f1",
+    "repetition_interval",
     "summarise_dataset",
+    "collect_case_counts",
     "compute_f1_iou",
     "evaluate_case",
     "extract_prediction_issues",
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import random
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+
+Counts = Tuple[int, int, int]
+
+DEFAULT_LEVEL = 0.95
+DEFAULT_SAMPLES = 2000
+
+
+def micro_f1(tp: int, fp: int, fn: int) -> float:
+    precision = tp / (tp + fp) if (tp + fp) else 0.0
+    recall = tp / (tp + fn) if (tp + fn) else 0.0
+    if not precision + recall:
+        return 0.0
+    return (2 * precision * recall) / (precision + recall)
+
+
+def _pooled_f1(samples: Sequence[Counts]) -> float:
+    return micro_f1(
+        sum(tp for tp, _, _ in samples),
+        sum(fp for _, fp, _ in samples),
+        sum(fn for _, _, fn in samples),
+    )
+
+
+def _percentile_interval(values: List[float], level: float) -> Tuple[float, float]:
+    ordered = sorted(values)
+    tail = (1 - level) / 2
+    low = ordered[int(tail * (len(ordered) - 1))]
+    high = ordered[int(round((1 - tail) * (len(ordered) - 1)))]
+    return low, high
+
+
+def repetition_interval(
+    runs: Sequence[Mapping[str, Counts]],
+    *,
+    level: float = DEFAULT_LEVEL,
+    samples: int = DEFAULT_SAMPLES,
+    seed: int = 0,
+) -> Optional[Dict[str, Any]]:
+    """Bootstrap confidence intervals for the micro-F1 pooled over repeated runs.
+
+    ``runs`` holds the case-level counts of each repetition of one
+    configuration. Two intervals are computed:
+
+    * ``interval`` keeps the variants fixed and resamples the repetitions of
+      each variant. It measures how much the result still depends on which
+      repetitions were drawn, narrows as repetitions are added, and decides
+      whether another repetition is worth running.
+    * ``dataset_interval`` resamples the variants themselves, each with all of
+      its repetitions. It also covers the choice of variants, so it does not
+      shrink much with more repetitions. It is the interval to report.
+
+    Returns ``None`` when no case could be scored.
+    """
+    by_variant: Dict[str, List[Counts]] = {}
+    for run in runs:
+        for case_id, counts in run.items():
+            by_variant.setdefault(case_id, []).append(counts)
+    if not by_variant:
+        return None
+
+    variants = [by_variant[case_id] for case_id in sorted(by_variant)]
+    rng = random.Random(seed)
+
+    within: List[float] = []
+    for _ in range(samples):
+        drawn: List[Counts] = []
+        for repetitions in variants:
+            drawn.extend(rng.choice(repetitions) for _ in repetitions)
+        within.append(_pooled_f1(drawn))
+
+    pooled = [
+        (
+            sum(tp for tp, _, _ in repetitions),
+            sum(fp for _, fp, _ in repetitions),
+            sum(fn for _, _, fn in repetitions),
+        )
+        for repetitions in variants
+    ]
+    across: List[float] = []
+    for _ in range(samples):
+        across.append(_pooled_f1([rng.choice(pooled) for _ in pooled]))
+
+    low, high = _percentile_interval(within, level)
+    dataset_low, dataset_high = _percentile_interval(across, level)
+    return {
+        "micro_f1": round(_pooled_f1(pooled), 4),
+        "level": level,
+        "interval": [round(low, 4), round(high, 4)],
+        "half_width": round((high - low) / 2, 4),
+        "dataset_interval": [round(dataset_low, 4), round(dataset_high, 4)],
+        "variants": len(variants),
+        "repetitions": len(runs),
+        "bootstrap_samples": samples,
+    }
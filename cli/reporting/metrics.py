@@ -153,6 +153,29 @@ def evaluate_case(
     return tp, fp, fn, span_sum, iou_sum, len(matches)
 
 
+def collect_case_counts(cases_dir: Path, data_root: Path) -> Dict[str, Tuple[int, int, int]]:
+    """TP/FP/FN per ``course/exercise/variant`` for the scorable results in ``cases_dir``."""
+    counts: Dict[str, Tuple[int, int, int]] = {}
+    for case_path in sorted(cases_dir.glob("*/*/*.json")):
+        course, exercise = case_path.parent.parent.name, case_path.parent.name
+        variant = case_path.stem
+        gold_issues, _gold_path = load_gold_issues(course, exercise, variant, data_root)
+        if gold_issues is None:
+            continue
+        try:
+            case_data = json.loads(case_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            continue
+        if not isinstance(case_data, dict):
+            continue
+        predictions, missing_predictions = extract_prediction_issues(case_data)
+        if missing_predictions:
+            continue
+        tp, fp, fn, _span_sum, _iou_sum, _matches = evaluate_case(gold_issues, predictions)
+        counts[f"{course}/{exercise}/{variant}"] = (tp, fp, fn)
+    return counts
+
+
 def unify_model_name(model_name: str) -> str:
     """Normalise provider-qualified model identifiers.
 
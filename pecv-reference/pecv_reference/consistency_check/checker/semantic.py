@@ -5,11 +5,12 @@ This checker focuses on the 1 semantic sub-category:
 - IDENTIFIER_NAMING_INCONSISTENCY
 """
 
-from typing import List
+from typing import List, Optional
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.language_models import BaseChatModel
 from pydantic import Field
 
+from ..timing import StageTimer
 from ..renderer import (
     context_renderer,
 )
@@ -228,20 +229,26 @@ template implementation and final solution.\
 )
 
 
-def init_semantic_checker(model: BaseChatModel):
+# Renders the context and fills in the prompt; shared with the cost estimate.
+semantic_prompt = (
+    context_renderer("problem_statement", "template_repository", "solution_repository")
+    | semantic_consistency_prompt
+)
+
+
+def init_semantic_checker(model: BaseChatModel, timer: Optional[StageTimer] = None):
     """Initializes checker for semantic consistency issues.
 
     Args:
         model (BaseChatModel): The LLM to use for checking semantic consistency.
+        timer (Optional[StageTimer]): Records the context rendering and the
+            model call as the ``context_rendering`` and ``semantic_llm`` stages.
 
     Returns:
         RunnableSerializable: A runnable that checks for semantic consistency issues.
     """
-    semantic_checker = (
-        context_renderer(
-            "problem_statement", "template_repository", "solution_repository"
-        )
-        | semantic_consistency_prompt
-        | model.with_structured_output(SemanticConsistencyResult)
-    )
-    return semantic_checker
+    llm = model.with_structured_output(SemanticConsistencyResult)
+    if timer is None:
+        return semantic_prompt | llm
+    rendering = timer.wrap("context_rendering", semantic_prompt)
+    return rendering | timer.wrap("semantic_llm", llm)
@@ -9,11 +9,12 @@ This checker focuses on the 5 structural sub-categories:
 - VISIBILITY_MISMATCH
 """
 
-from typing import List
+from typing import List, Optional
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.language_models import BaseChatModel
 from pydantic import Field
 
+from ..timing import StageTimer
 from ..renderer import (
     context_renderer,
 )
@@ -201,20 +202,26 @@ distinction rigorously. Return only genuine inconsistencies that are unintention
 )
 
 
-def init_structural_checker(model: BaseChatModel):
+# Renders the context and fills in the prompt; shared with the cost estimate.
+structural_prompt = (
+    context_renderer("problem_statement", "template_repository", "solution_repository")
+    | structural_consistency_prompt
+)
+
+
+def init_structural_checker(model: BaseChatModel, timer: Optional[StageTimer] = None):
     """Initializes checker for structural consistency issues.
 
     Args:
         model (BaseChatModel): The LLM to use for checking structural consistency.
+        timer (Optional[StageTimer]): Records the context rendering and the
+            model call as the ``context_rendering`` and ``structural_llm`` stages.
 
     Returns:
         RunnableSerializable: A runnable that checks for structural consistency issues.
     """
-    structural_checker = (
-        context_renderer(
-            "problem_statement", "template_repository", "solution_repository"
-        )
-        | structural_consistency_prompt
-        | model.with_structured_output(StructuralConsistencyResult)
-    )
-    return structural_checker
+    llm = model.with_structured_output(StructuralConsistencyResult)
+    if timer is None:
+        return structural_prompt | llm
+    rendering = timer.wrap("context_rendering", structural_prompt)
+    return rendering | timer.wrap("structural_llm", llm)
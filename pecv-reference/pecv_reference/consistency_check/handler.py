@@ -1,4 +1,5 @@
-from typing import Dict, List
+import json
+from typing import Dict, List, Optional
 from uuid import uuid4
 from langchain_core.runnables import RunnableParallel, RunnableLambda  # type: ignore[import]
 
@@ -10,14 +11,70 @@ except ImportError:  # pragma: no cover - optional dependency
 from ..settings import settings
 from ..models import init_chat_model
 
+from .timing import StageTimer
 from .models import (
     Metadata,
     ConsistencyCheckRequest,
     ConsistencyCheckResponse,
     ConsistencyIssue,
 )
-from .checker.structural import init_structural_checker
-from .checker.semantic import init_semantic_checker
+from .checker.structural import (
+    StructuralConsistencyResult,
+    init_structural_checker,
+    structural_prompt,
+)
+from .checker.semantic import (
+    SemanticConsistencyResult,
+    init_semantic_checker,
+    semantic_prompt,
+)
+
+
+def build_input_data(request: ConsistencyCheckRequest) -> Dict:
+    """Convert a request into the input that the checkers render."""
+    input_data = {
+        "problem_statement": request.problem_statement,
+        "programming_language": request.programming_language,
+        "template_repository": [
+            {"path": file.path, "content": file.content}
+            for file in request.template_repository.files
+        ],
+    }
+
+    # Add optional repositories if they exist
+    if request.solution_repository:
+        input_data["solution_repository"] = [
+            {"path": file.path, "content": file.content}
+            for file in request.solution_repository.files
+        ]
+
+    if request.test_repository:
+        input_data["test_repository"] = [
+            {"path": file.path, "content": file.content}
+            for file in request.test_repository.files
+        ]
+
+    return input_data
+
+
+def render_prompts(request: ConsistencyCheckRequest) -> Dict[str, str]:
+    """Render the prompt of every checker without calling a model.
+
+    Each entry holds the prompt messages followed by the JSON schema of the
+    structured output, which is sent along with the request.
+    """
+    input_data = build_input_data(request)
+    prompts = {}
+    for name, prompt, result_model in (
+        ("structural", structural_prompt, StructuralConsistencyResult),
+        ("semantic", semantic_prompt, SemanticConsistencyResult),
+    ):
+        messages = prompt.invoke(input_data).to_messages()
+        prompts[name] = "\n\n".join(
+            [str(message.content) for message in messages]
+            + [json.dumps(result_model.model_json_schema())]
+        )
+    return prompts
 
 
 class ConsistencyCheck:
@@ -28,39 +85,54 @@ class ConsistencyCheck:
             reasoning_effort=reasoning_effort,
         )
 
-    def check(self, request: ConsistencyCheckRequest) -> ConsistencyCheckResponse:
+    def check(
+        self,
+        request: ConsistencyCheckRequest,
+        timer: Optional[StageTimer] = None,
+        run_id: Optional[str] = None,
+    ) -> ConsistencyCheckResponse:
+        checker, input_data, trace_id = self._build_checker(request, timer, run_id)
+        issues = checker.invoke(input_data)
+
+        return ConsistencyCheckResponse(
+            issues=issues,
+            metadata=Metadata(trace_id=str(trace_id)),
+        )
+
+    async def acheck(
+        self,
+        request: ConsistencyCheckRequest,
+        timer: Optional[StageTimer] = None,
+        run_id: Optional[str] = None,
+    ) -> ConsistencyCheckResponse:
+        """Async variant of :meth:`check` that awaits both checkers via ``ainvoke``."""
+        checker, input_data, trace_id = self._build_checker(request, timer, run_id)
+        issues = await checker.ainvoke(input_data)
+
+        return ConsistencyCheckResponse(
+            issues=issues,
+            metadata=Metadata(trace_id=str(trace_id)),
+        )
+
+    def _build_checker(
+        self,
+        request: ConsistencyCheckRequest,
+        timer: Optional[StageTimer] = None,
+        run_id: Optional[str] = None,
+    ):
         trace_id = uuid4()
+        input_data = build_input_data(request)
 
-        input_data = {
-            "problem_statement": request.problem_statement,
-            "programming_language": request.programming_language,
-            "template_repository": [
-                {"path": file.path, "content": file.content}
-                for file in request.template_repository.files
-            ],
-        }
-
-        # Add optional repositories if they exist
-        if request.solution_repository:
-            input_data["solution_repository"] = [
-                {"path": file.path, "content": file.content}
-                for file in request.solution_repository.files
-            ]
-
-        if request.test_repository:
-            input_data["test_repository"] = [
-                {"path": file.path, "content": file.content}
-                for file in request.test_repository.files
-            ]
-
-        structural_checker = init_structural_checker(self.model)
-        semantic_checker = init_semantic_checker(self.model)
+        structural_checker = init_structural_checker(self.model, timer)
+        semantic_checker = init_semantic_checker(self.model, timer)
 
         def merge_issues(results: Dict) -> List[ConsistencyIssue]:
             """Merge issues from results."""
             return [issue for result in results.values() for issue in result.issues]
 
         merge = RunnableLambda(merge_issues, name="merge_issues")
+        if timer is not None:
+            merge = timer.wrap("merge", merge)
 
         callbacks = []
         if CallbackHandler is not None and getattr(
@@ -81,12 +153,9 @@ class ConsistencyCheck:
                 "callbacks": callbacks,
                 "run_name": "consistency_check",
                 "run_id": trace_id,
+                # Identifies the benchmark run in the trace; cases may share a process.
+                "metadata": {"run_id": run_id} if run_id else {},
             }
         )
 
-        issues = checker.invoke(input_data)
-
-        return ConsistencyCheckResponse(
-            issues=issues,
-            metadata=Metadata(trace_id=str(trace_id)),
-        )
+        return checker, input_data, trace_id
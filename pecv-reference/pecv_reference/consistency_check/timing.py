@@ -0,0 +1,48 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
+
+
+class StageTimer:
+    """Wall-clock seconds spent in each named stage of one consistency check.
+
+    A stage entered several times, e.g. context rendering by both checkers,
+    accumulates; stages that run in parallel may therefore add up to more
+    than the duration of the case.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def wrap(self, name: str, runnable: Runnable) -> Runnable:
+        """Time every invocation of ``runnable``, synchronous or not."""
+
+        def invoke(value, config: RunnableConfig):
+            with self.measure(name):
+                return runnable.invoke(value, config)
+
+        async def ainvoke(value, config: RunnableConfig):
+            with self.measure(name):
+                return await runnable.ainvoke(value, config)
+
+        return RunnableLambda(invoke, afunc=ainvoke, name=name)
+
+    def rounded(self) -> Dict[str, float]:
+        with self._lock:
+            return {name: round(seconds, 3) for name, seconds in self.stages.items()}
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
 import os
 import sys
@@ -8,14 +9,18 @@ import time
 import uuid
 from datetime import datetime, timezone
 from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from functools import lru_cache
 from pathlib import Path
 
+from pydantic import BaseModel
+
 try:  # pragma: no cover - optional dependency
     from langsmith import Client as LangsmithClient  # type: ignore[import]
 except ImportError:  # pragma: no cover - optional dependency
     LangsmithClient = None  # type: ignore[assignment]
 
-from pecv_reference.consistency_check.handler import ConsistencyCheck
+from pecv_reference.consistency_check.handler import ConsistencyCheck, render_prompts
+from pecv_reference.consistency_check.timing import StageTimer
 from pecv_reference.consistency_check.models import (
     ConsistencyCheckRequest,
     ProgrammingLanguage,
@@ -55,6 +60,9 @@ def decimal_to_float(value: Decimal) -> float:
 def aggregate_usage(runs) -> tuple[dict[str, int], dict[str, float]]:
     prompt_tokens = 0
     completion_tokens = 0
+    # Prompt tokens served from the provider's prompt cache; only reported when
+    # the usage metadata of at least one call breaks the prompt tokens down.
+    cached_tokens: int | None = None
     prompt_cost = Decimal("0")
     completion_cost = Decimal("0")
     total_cost = Decimal("0")
@@ -66,6 +74,10 @@ def aggregate_usage(runs) -> tuple[dict[str, int], dict[str, float]]:
 
         prompt_tokens += int(getattr(run, "prompt_tokens", 0) or 0)
         completion_tokens += int(getattr(run, "completion_tokens", 0) or 0)
+        details = getattr(run, "prompt_token_details", None)
+        if isinstance(details, dict):
+            cache_read = int(details.get("cache_read", 0) or 0)
+            cached_tokens = (cached_tokens or 0) + cache_read
 
         prompt_cost += safe_decimal(getattr(run, "prompt_cost", 0))
         completion_cost += safe_decimal(getattr(run, "completion_cost", 0))
@@ -82,6 +94,8 @@ def aggregate_usage(runs) -> tuple[dict[str, int], dict[str, float]]:
         "completion": completion_tokens,
         "total": prompt_tokens + completion_tokens,
     }
+    if cached_tokens is not None:
+        tokens["cached"] = cached_tokens
 
     cost = {
         "prompt_usd": decimal_to_float(prompt_cost),
@@ -113,6 +127,7 @@ def fetch_langsmith_usage(
                     "id",
                     "run_type",
                     "prompt_tokens",
+                    "prompt_token_details",
                     "completion_tokens",
                     "total_tokens",
                     "prompt_cost",
@@ -242,6 +257,12 @@ def build_run_id(
     return f"{model_slug}-{time_slug}-{suffix}-{random_part}"
 
 
+@lru_cache(maxsize=None)
+def get_consistency_check(model_name: str, reasoning_effort: str) -> ConsistencyCheck:
+    # Reuse the chat model client across cases handled by the same process.
+    return ConsistencyCheck(model=model_name, reasoning_effort=reasoning_effort)
+
+
 def format_timestamp(dt: datetime) -> str:
     return (
         dt.astimezone(timezone.utc)
@@ -250,20 +271,7 @@ def format_timestamp(dt: datetime) -> str:
     )
 
 
-def run_consistency_check(
-    input_path: Path,
-    output_path: Path,
-    model_name: str,
-    reasoning_effort: str,
-    case_id: str | None = None,
-    run_id: str | None = None,
-) -> None:
-    start_time = datetime.now(timezone.utc)
-    resolved_case_id = case_id or derive_case_id(input_path)
-    resolved_run_id = run_id or build_run_id(
-        model_name, resolved_case_id, start_time, reasoning_effort
-    )
-
+def build_request(input_path: Path) -> ConsistencyCheckRequest:
     problem_statement = load_problem_statement(input_path)
     template_files = load_repository_files(input_path / "template")
     solution_files = load_repository_files(input_path / "solution")
@@ -274,7 +282,7 @@ def run_consistency_check(
 
     programming_language = read_programming_language(input_path)
 
-    request = ConsistencyCheckRequest(
+    return ConsistencyCheckRequest(
         problem_statement=problem_statement,
         template_repository=Repository(files=template_files),
         programming_language=programming_language,
@@ -284,18 +292,17 @@ def run_consistency_check(
         test_repository=Repository(files=test_files) if test_files else None,
     )
 
+
+def configure_tracing() -> None:
+    # Process-wide defaults only: cases may share the process, so the run id of
+    # a case travels with its runnable config instead of the environment.
     os.environ.setdefault("LANGCHAIN_TRACING_V2", "true")
     os.environ.setdefault("LANGCHAIN_PROJECT", "pecv-reference")
-    os.environ["LANGCHAIN_RUN_ID"] = resolved_run_id
 
-    checker = ConsistencyCheck(model=model_name, reasoning_effort=reasoning_effort)
-    response = checker.check(request)
-
-    finished_at = datetime.now(timezone.utc)
-    response_data = response.model_dump()
-    metadata = response_data.get("metadata", {})
-    issues_payload = response_data.get("issues", [])
 
+def collect_usage(
+    trace_id: str | None,
+) -> tuple[dict[str, int] | None, dict[str, float] | None]:
     tokens_summary = {"prompt": 0, "completion": 0, "total": 0}
     cost_summary = {
         "prompt_usd": 0.0,
@@ -303,7 +310,6 @@ def run_consistency_check(
         "total_usd": 0.0,
     }
 
-    trace_id = metadata.get("trace_id")
     if trace_id:
         project_name = os.environ.get("LANGCHAIN_PROJECT")
         try:
@@ -317,15 +323,32 @@ def run_consistency_check(
                 file=sys.stderr,
             )
 
+    return tokens_summary, cost_summary
+
+
+def build_result(
+    *,
+    case_id: str,
+    run_id: str,
+    start_time: datetime,
+    finished_at: datetime,
+    issues: list,
+    trace_id: str | None,
+    tokens_summary: dict[str, int] | None,
+    cost_summary: dict[str, float] | None,
+    stages: dict[str, float] | None = None,
+) -> dict:
     result = {
-        "case_id": resolved_case_id,
-        "run_id": resolved_run_id,
+        "case_id": case_id,
+        "run_id": run_id,
         "timestamp": format_timestamp(finished_at),
-        "issues": issues_payload,
+        "issues": issues,
         "timing": {
             "start_time": format_timestamp(start_time),
             "end_time": format_timestamp(finished_at),
             "duration_s": (finished_at - start_time).total_seconds(),
+            # Approach stages; the harness journals materialisation and the write.
+            "stages": stages or {},
         },
         "trace_id": trace_id or "",
     }
@@ -333,11 +356,238 @@ def run_consistency_check(
         result["tokens"] = tokens_summary
     if cost_summary:
         result["cost"] = cost_summary
+    return result
 
+
+def write_result(output_path: Path, result: dict) -> None:
+    # Written next to the target and renamed, so a crash never leaves half a file.
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w", encoding="utf-8") as handle:
-        json.dump(result, handle, indent=2)
-        handle.write("\n")
+    temp_path = output_path.with_name(f".{output_path.name}.{os.getpid()}.tmp")
+    try:
+        with temp_path.open("w", encoding="utf-8") as handle:
+            json.dump(result, handle, indent=2)
+            handle.write("\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, output_path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+
+def check_case(
+    input_path: Path,
+    model_name: str,
+    reasoning_effort: str,
+    case_id: str | None = None,
+    run_id: str | None = None,
+) -> dict:
+    """Run the consistency check on one variant and return the result payload."""
+    start_time = datetime.now(timezone.utc)
+    resolved_case_id = case_id or derive_case_id(input_path)
+    resolved_run_id = run_id or build_run_id(
+        model_name, resolved_case_id, start_time, reasoning_effort
+    )
+
+    timer = StageTimer()
+    with timer.measure("load_files"):
+        request = build_request(input_path)
+    configure_tracing()
+
+    checker = get_consistency_check(model_name, reasoning_effort)
+    response = checker.check(request, timer=timer, run_id=resolved_run_id)
+
+    finished_at = datetime.now(timezone.utc)
+    response_data = response.model_dump()
+    trace_id = response_data.get("metadata", {}).get("trace_id")
+    with timer.measure("usage_fetch"):
+        tokens_summary, cost_summary = collect_usage(trace_id)
+
+    return build_result(
+        case_id=resolved_case_id,
+        run_id=resolved_run_id,
+        start_time=start_time,
+        finished_at=finished_at,
+        issues=response_data.get("issues", []),
+        trace_id=trace_id,
+        tokens_summary=tokens_summary,
+        cost_summary=cost_summary,
+        stages=timer.rounded(),
+    )
+
+
+def run_consistency_check(
+    input_path: Path,
+    output_path: Path,
+    model_name: str,
+    reasoning_effort: str,
+    case_id: str | None = None,
+    run_id: str | None = None,
+) -> None:
+    result = check_case(
+        input_path,
+        model_name,
+        reasoning_effort,
+        case_id=case_id,
+        run_id=run_id,
+    )
+    write_result(output_path, result)
+
+
+async def arun_consistency_check(
+    input_path: Path,
+    model_name: str,
+    reasoning_effort: str,
+    case_id: str | None = None,
+    run_id: str | None = None,
+) -> dict:
+    """Async variant of :func:`run_consistency_check` returning the result payload.
+
+    Blocking file loading and the LangSmith usage polling run in worker threads so
+    that many cases can share one event loop.
+    """
+    start_time = datetime.now(timezone.utc)
+    resolved_case_id = case_id or derive_case_id(input_path)
+    resolved_run_id = run_id or build_run_id(
+        model_name, resolved_case_id, start_time, reasoning_effort
+    )
+
+    timer = StageTimer()
+    with timer.measure("load_files"):
+        request = await asyncio.to_thread(build_request, input_path)
+    configure_tracing()
+
+    checker = get_consistency_check(model_name, reasoning_effort)
+    response = await checker.acheck(request, timer=timer, run_id=resolved_run_id)
+
+    finished_at = datetime.now(timezone.utc)
+    response_data = response.model_dump()
+    trace_id = response_data.get("metadata", {}).get("trace_id")
+    with timer.measure("usage_fetch"):
+        tokens_summary, cost_summary = await asyncio.to_thread(collect_usage, trace_id)
+
+    return build_result(
+        case_id=resolved_case_id,
+        run_id=resolved_run_id,
+        start_time=start_time,
+        finished_at=finished_at,
+        issues=response_data.get("issues", []),
+        trace_id=trace_id,
+        tokens_summary=tokens_summary,
+        cost_summary=cost_summary,
+        stages=timer.rounded(),
+    )
+
+
+def run_case(
+    input_path: Path,
+    output_path: Path,
+    case_id: str | None = None,
+    model: str | None = None,
+    reasoning_effort: str = "medium",
+    run_id: str | None = None,
+) -> dict:
+    """In-process counterpart of :func:`main` for ``run_case: {python: ...}``.
+
+    The harness writes the returned payload to ``output_path`` and times the write.
+    """
+    model_name = model or settings.MODEL_NAME
+    if not model_name:
+        raise ValueError(
+            "Model must be provided via --model or MODEL_NAME environment variable"
+        )
+
+    return check_case(
+        input_path=Path(input_path),
+        model_name=model_name,
+        reasoning_effort=reasoning_effort,
+        case_id=case_id,
+        run_id=run_id,
+    )
+
+
+async def arun_case(
+    input_path: Path,
+    output_path: Path,
+    case_id: str | None = None,
+    model: str | None = None,
+    reasoning_effort: str = "medium",
+    run_id: str | None = None,
+) -> dict:
+    """Async counterpart of :func:`run_case`; the harness writes the returned payload."""
+    model_name = model or settings.MODEL_NAME
+    if not model_name:
+        raise ValueError(
+            "Model must be provided via --model or MODEL_NAME environment variable"
+        )
+
+    return await arun_consistency_check(
+        input_path=Path(input_path),
+        model_name=model_name,
+        reasoning_effort=reasoning_effort,
+        case_id=case_id,
+        run_id=run_id,
+    )
+
+
+def estimate_case(
+    input_path: Path,
+    model: str | None = None,
+    reasoning_effort: str = "medium",
+    **_: object,
+) -> dict[str, str]:
+    """Render the prompts a case would send, for ``run-benchmark --dry-run``.
+
+    No model is contacted; the harness counts and prices the returned text.
+    """
+    return render_prompts(build_request(Path(input_path)))
+
+
+def warm_up(model: str | None = None, reasoning_effort: str = "medium") -> None:
+    """Build the chat model client ahead of the first case."""
+    model_name = model or settings.MODEL_NAME
+    if model_name:
+        get_consistency_check(model_name, reasoning_effort)
+
+
+class PreflightProbe(BaseModel):
+    ok: bool
+
+
+PREFLIGHT_PROMPT = "Reply with ok set to true."
+
+
+def preflight(
+    model: str | None = None, reasoning_effort: str = "medium", **_: object
+) -> dict[str, float]:
+    """Send one tiny structured-output request, for ``run-benchmark``'s pre-flight.
+
+    Builds the chat model client the cases will reuse and returns the seconds
+    spent building it, until the first streamed chunk and until the answer.
+    """
+    model_name = model or settings.MODEL_NAME
+    if not model_name:
+        raise ValueError("No model configured")
+    started = time.perf_counter()
+    client = get_consistency_check(model_name, reasoning_effort).model
+    probe = client.with_structured_output(PreflightProbe)
+    init_s = time.perf_counter() - started
+
+    request_started = time.perf_counter()
+    first_token_s = None
+    answer = None
+    for chunk in probe.stream(PREFLIGHT_PROMPT):
+        if first_token_s is None:
+            first_token_s = time.perf_counter() - request_started
+        answer = chunk
+    total_s = time.perf_counter() - request_started
+    if answer is None:
+        raise RuntimeError(f"{model_name} returned no structured answer")
+    return {
+        "init_s": init_s,
+        "first_token_s": first_token_s if first_token_s is not None else total_s,
+        "total_s": total_s,
+    }
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from cli.reporting import micro_f1, repetition_interval
+
+
+def test_no_scored_case_gives_no_interval():
+    assert repetition_interval([]) is None
+    assert repetition_interval([{}, {}]) is None
+
+
+def test_identical_repetitions_have_a_zero_width_interval():
+    run = {"c/e/v1": (2, 1, 0), "c/e/v2": (1, 0, 1)}
+
+    interval = repetition_interval([run, dict(run), dict(run)], samples=200)
+
+    assert interval["micro_f1"] == round(micro_f1(9, 3, 3), 4)
+    assert interval["interval"] == [interval["micro_f1"]] * 2
+    assert interval["half_width"] == 0
+    assert interval["variants"] == 2
+    assert interval["repetitions"] == 3
+    assert interval["bootstrap_samples"] == 200
+
+
+def test_interval_covers_the_pooled_f1_and_is_reproducible():
+    runs = [
+        {"c/e/v1": (1, 0, 0), "c/e/v2": (0, 1, 1), "c/e/v3": (1, 1, 0)},
+        {"c/e/v1": (0, 0, 1), "c/e/v2": (1, 0, 0), "c/e/v3": (1, 0, 0)},
+        {"c/e/v1": (1, 1, 0), "c/e/v2": (1, 0, 0), "c/e/v3": (0, 0, 1)},
+    ]
+
+    interval = repetition_interval(runs, samples=500, seed=7)
+
+    low, high = interval["interval"]
+    dataset_low, dataset_high = interval["dataset_interval"]
+    assert low <= interval["micro_f1"] <= high
+    assert dataset_low <= interval["micro_f1"] <= dataset_high
+    assert interval["half_width"] == round((high - low) / 2, 4)
+    assert repetition_interval(runs, samples=500, seed=7) == interval
+
+
+def test_variants_missing_from_a_repetition_still_count():
+    runs = [{"c/e/v1": (1, 0, 0), "c/e/v2": (1, 0, 0)}, {"c/e/v1": (1, 0, 0)}]
+
+    interval = repetition_interval(runs, samples=100)
+
+    assert interval["variants"] == 2
+    assert interval["micro_f1"] == 1.0
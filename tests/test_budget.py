@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from cli.execution.budget import BudgetGuard
+
+
+def write_result(path, *, cost_usd=None, tokens=None):
+    payload = {}
+    if cost_usd is not None:
+        payload["cost"] = {"total_usd": cost_usd}
+    if tokens is not None:
+        payload["tokens"] = {"total": tokens}
+    path.write_text(json.dumps(payload), encoding="utf-8")
+    return path
+
+
+def test_disabled_guard_admits_everything():
+    guard = BudgetGuard()
+
+    assert not guard.enabled
+    assert all(guard.admit() for _ in range(100))
+
+
+def test_ceilings_must_be_positive():
+    with pytest.raises(ValueError, match="--max-cost-usd"):
+        BudgetGuard(max_cost_usd=0)
+    with pytest.raises(ValueError, match="--max-total-tokens"):
+        BudgetGuard(max_tokens=-1)
+
+
+def test_without_seed_one_case_runs_until_its_usage_is_known(tmp_path):
+    guard = BudgetGuard(max_cost_usd=1.0)
+
+    assert guard.admit() is True
+    assert guard.admit() is None
+
+    guard.case_finished(write_result(tmp_path / "a.json", cost_usd=0.2))
+
+    assert guard.admit() is True
+    assert guard.admit() is True
+
+
+def test_projection_counts_cases_in_flight(tmp_path):
+    guard = BudgetGuard(max_cost_usd=1.0)
+    guard.admit()
+    guard.case_finished(write_result(tmp_path / "a.json", cost_usd=0.25))
+
+    # Spent 0.25; each admitted case is projected at the mean of 0.25.
+    assert guard.admit() is True
+    assert guard.admit() is True
+    assert guard.admit() is True
+    assert guard.admit() is False
+    assert "would exceed --max-cost-usd $1" in guard.stop_reason
+    assert guard.refused == 1
+
+
+def test_refusal_is_final(tmp_path):
+    guard = BudgetGuard(max_tokens=100)
+    guard.admit()
+    guard.case_finished(write_result(tmp_path / "a.json", tokens=60))
+
+    assert guard.admit() is False
+
+    guard.case_finished(None)
+
+    assert guard.admit() is False
+    assert guard.refused == 2
+    assert guard.describe()["stopped"] is True
+
+
+def test_seed_stands_in_until_a_case_completes():
+    guard = BudgetGuard(max_cost_usd=1.0)
+    guard.seed(0.2, None)
+    guard.seed(0.3, 1000)
+
+    assert guard.seed_cost_usd == 0.3
+    assert [guard.admit() for _ in range(4)] == [True, True, True, False]
+
+
+def test_completed_cases_replace_the_seed(tmp_path):
+    guard = BudgetGuard(max_cost_usd=1.0)
+    guard.seed(0.5, None)
+    guard.admit()
+    guard.case_finished(write_result(tmp_path / "a.json", cost_usd=0.1))
+
+    assert [guard.admit() for _ in range(10)] == [True] * 9 + [False]
+
+
+def test_missing_seed_for_one_ceiling_still_serialises():
+    guard = BudgetGuard(max_cost_usd=1.0, max_tokens=1000)
+    guard.seed(0.1, None)
+
+    assert guard.admit() is True
+    assert guard.admit() is None
+
+
+def test_prior_spend_of_a_resumed_run_counts():
+    guard = BudgetGuard(max_cost_usd=1.0)
+    guard.add_prior_spend(0.8, 0, 4)
+
+    # 0.8 spent at 0.2 per case leaves room for exactly one more.
+    assert guard.admit() is True
+    assert guard.admit() is False
+    assert guard.describe()["prior_cost_usd"] == 0.8
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import json
+
+from cli.execution.journal import RunJournal, load_journal
+
+
+def test_missing_journal_is_empty(tmp_path):
+    state = load_journal(tmp_path / "missing.journal")
+
+    assert state.events == 0
+    assert state.pending() == set()
+
+
+def test_pending_and_failed_are_derived_from_events(tmp_path):
+    journal = RunJournal(tmp_path / "run.journal")
+    journal.queued(["a/x/v1", "a/x/v2", "a/y/v1"])
+    journal.started("a/x/v1", 1)
+    journal.finished("a/x/v1", 1, 1.5, cost_usd=0.25, tokens=100, result_bytes=42)
+    journal.started("a/x/v2", 1)
+    journal.failed("a/x/v2", 1, 0.5, failure="transient", error="429", retry_in_s=2.0)
+    journal.started("a/x/v2", 2)
+    journal.failed("a/x/v2", 2, 0.5, failure="permanent", error="broken patch")
+
+    state = journal.load()
+
+    assert state.pending() == {"a/x/v2", "a/y/v1"}
+    assert state.finished == {"a/x/v1"}
+    assert state.failed == {"a/x/v2"}
+    assert state.attempts == {"a/x/v1": 1, "a/x/v2": 2}
+    assert state.cost_usd == 0.25
+    assert state.tokens == 100
+    assert state.result_bytes == {"a/x/v1": 42}
+
+
+def test_retried_failure_is_not_final(tmp_path):
+    journal = RunJournal(tmp_path / "run.journal")
+    journal.queued(["a/x/v1"])
+    journal.failed("a/x/v1", 1, 0.5, failure="transient", error="429", retry_in_s=1.0)
+
+    assert journal.load().failed == set()
+
+
+def test_finish_after_failure_clears_it(tmp_path):
+    journal = RunJournal(tmp_path / "run.journal")
+    journal.queued(["a/x/v1"])
+    journal.failed("a/x/v1", 1, 0.5, failure="permanent", error="boom")
+    journal.finished("a/x/v1", 2, 1.0)
+
+    state = journal.load()
+
+    assert state.failed == set()
+    assert state.pending() == set()
+
+
+def test_torn_tail_is_ignored_and_next_write_starts_a_new_line(tmp_path):
+    path = tmp_path / "run.journal"
+    journal = RunJournal(path)
+    journal.queued(["a/x/v1", "a/x/v2"])
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write('{"event": "finished", "case_id": "a/x/v1", "att')
+
+    assert load_journal(path).pending() == {"a/x/v1", "a/x/v2"}
+
+    resumed = RunJournal(path)
+    resumed.finished("a/x/v2", 1, 1.0)
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert json.loads(lines[-1])["case_id"] == "a/x/v2"
+    assert load_journal(path).pending() == {"a/x/v1"}
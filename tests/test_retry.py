@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import json
+import subprocess
+
+import pytest
+
+from cli.execution.failures import (
+    PERMANENT,
+    RATE_LIMITED,
+    SERVER_ERROR,
+    TIMED_OUT,
+    TRANSIENT,
+    CaseTimeoutError,
+    classify_failure,
+    congestion_signal,
+)
+from cli.execution.retry import RetryPolicy
+
+
+class StatusError(Exception):
+    def __init__(self, status_code: int) -> None:
+        super().__init__(f"request failed with {status_code}")
+        self.status_code = status_code
+
+
+@pytest.mark.parametrize(
+    "exc, expected",
+    [
+        (CaseTimeoutError(30), TIMED_OUT),
+        (StatusError(429), TRANSIENT),
+        (StatusError(503), TRANSIENT),
+        (RuntimeError("Error code: 429 - rate limit exceeded"), TRANSIENT),
+        (RuntimeError("Error code: 502 Bad Gateway"), TRANSIENT),
+        (TimeoutError(), TRANSIENT),
+        (ConnectionResetError(), TRANSIENT),
+        (subprocess.TimeoutExpired("runner", 5), TRANSIENT),
+        (RuntimeError("OutputParserException: Failed to parse Report"), TRANSIENT),
+        (RuntimeError("Could not locate problem statement"), PERMANENT),
+        (RuntimeError("failed to apply patch; request timed out"), PERMANENT),
+        (StatusError(400), PERMANENT),
+        (KeyError("model"), PERMANENT),
+    ],
+)
+def test_classify_failure(exc, expected):
+    assert classify_failure(exc) == expected
+
+
+def test_classify_failure_follows_the_exception_chain():
+    try:
+        try:
+            raise json.JSONDecodeError("Expecting value", "", 0)
+        except json.JSONDecodeError as exc:
+            raise RuntimeError("checker failed") from exc
+    except RuntimeError as exc:
+        assert classify_failure(exc) == TRANSIENT
+
+
+def test_congestion_signal():
+    assert congestion_signal(StatusError(429)) == RATE_LIMITED
+    assert (
+        congestion_signal(RuntimeError("service unavailable: overloaded"))
+        == SERVER_ERROR
+    )
+    assert congestion_signal(TimeoutError()) is None
+
+
+def test_delay_is_jittered_below_an_exponential_ceiling(monkeypatch):
+    monkeypatch.setattr("cli.execution.retry.random.uniform", lambda low, high: high)
+    policy = RetryPolicy(max_attempts=5, base_delay_s=2.0, max_delay_s=10.0)
+
+    assert [policy.delay_for(attempt) for attempt in range(1, 5)] == [
+        2.0,
+        4.0,
+        8.0,
+        10.0,
+    ]
+
+
+def test_delay_stays_within_bounds():
+    policy = RetryPolicy(base_delay_s=1.0, max_delay_s=3.0)
+
+    assert all(0 <= policy.delay_for(attempt) <= 3.0 for attempt in range(1, 20))
+
+
+def test_invalid_policies_are_rejected():
+    with pytest.raises(ValueError, match="--max-attempts"):
+        RetryPolicy(max_attempts=0)
+    with pytest.raises(ValueError, match="must not be negative"):
+        RetryPolicy(base_delay_s=-1)
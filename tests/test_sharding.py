@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from cli.commands import merge_runs
+from cli.execution import journal
+from cli.execution.journal import RunJournal
+from cli.execution.sharding import (
+    balanced_shards,
+    hash_shards,
+    parse_shard,
+    shard_run_id,
+    split_shard_run_id,
+)
+
+APPROACH = "approach"
+BASE = "run-1"
+
+
+def test_parse_shard():
+    assert parse_shard(" 2 / 4 ") == (2, 4)
+    for text in ("0/4", "5/4", "1/0", "one/4"):
+        with pytest.raises(ValueError):
+            parse_shard(text)
+
+
+def test_shard_run_id_round_trips():
+    assert split_shard_run_id(shard_run_id(BASE, 2, 3)) == (BASE, 2, 3)
+    assert split_shard_run_id(BASE) is None
+
+
+def test_hash_shards_is_stable_and_even():
+    keys = [f"course/exercise/variant-{index}" for index in range(23)]
+
+    assignment = hash_shards(keys, 4)
+
+    assert assignment == hash_shards(list(reversed(keys)), 4)
+    assert set(assignment) == set(keys)
+    sizes = [list(assignment.values()).count(index) for index in range(1, 5)]
+    assert max(sizes) - min(sizes) <= 1
+
+
+def test_balanced_shards_puts_the_heaviest_key_on_the_least_loaded_shard():
+    weights = [("c", 3.0), ("a", 5.0), ("d", 3.0), ("b", 4.0)]
+
+    assignment = balanced_shards(weights, 2)
+
+    assert assignment == {"a": 1, "b": 2, "c": 2, "d": 1}
+    assert balanced_shards(list(reversed(weights)), 2) == assignment
+
+
+@pytest.fixture
+def roots(tmp_path, monkeypatch):
+    runs_root = tmp_path / "runs"
+    results_root = tmp_path / "results"
+    monkeypatch.setattr(merge_runs, "RUNS_ROOT", runs_root)
+    monkeypatch.setattr(merge_runs, "RESULTS_ROOT", results_root)
+    monkeypatch.setattr(journal, "RUNS_ROOT", runs_root)
+    return runs_root, results_root
+
+
+def write_shard(roots, index, count, cases, *, queued=None, args=None, total=None):
+    runs_root, results_root = roots
+    run_id = shard_run_id(BASE, index, count)
+    metadata = {
+        "run_id": run_id,
+        "args": args or {"model": "openai:gpt-5-mini"},
+        "shard": {
+            "index": index,
+            "count": count,
+            "assigned_cases": len(queued if queued is not None else cases),
+            "total_cases": total or 0,
+        },
+    }
+    metadata_path = runs_root / APPROACH / f"{run_id}.yaml"
+    metadata_path.parent.mkdir(parents=True, exist_ok=True)
+    metadata_path.write_text(json.dumps(metadata), encoding="utf-8")
+    for case_id in cases:
+        case_path = results_root / APPROACH / run_id / "cases" / f"{case_id}.json"
+        case_path.parent.mkdir(parents=True, exist_ok=True)
+        case_path.write_text("{}", encoding="utf-8")
+    RunJournal(runs_root / APPROACH / f"{run_id}.journal").queued(
+        queued if queued is not None else cases
+    )
+
+
+def merge(**options):
+    options = {"allow_missing": False, "force": False, **options}
+    return merge_runs.merge_run(APPROACH, BASE, **options)
+
+
+def test_merge_refuses_without_shards(roots, capsys):
+    assert not merge()
+    assert "no shard runs found" in capsys.readouterr().out
+
+
+def test_merge_refuses_a_missing_shard(roots, capsys):
+    write_shard(roots, 1, 3, ["c/e/v1"])
+    write_shard(roots, 3, 3, ["c/e/v3"])
+
+    assert not merge()
+    assert "missing shard(s) 2/3" in capsys.readouterr().out
+
+
+def test_merge_refuses_shards_of_different_sizes(roots, capsys):
+    write_shard(roots, 1, 2, ["c/e/v1"])
+    write_shard(roots, 2, 3, ["c/e/v2"])
+
+    assert not merge()
+    assert "shards of different sizes" in capsys.readouterr().out
+
+
+def test_merge_refuses_shards_with_different_arguments(roots, capsys):
+    write_shard(roots, 1, 2, ["c/e/v1"])
+    write_shard(roots, 2, 2, ["c/e/v2"], args={"model": "openai:o4-mini"})
+
+    assert not merge()
+    assert "different arguments" in capsys.readouterr().out
+
+
+def test_merge_refuses_cases_in_more_than_one_shard(roots, capsys):
+    write_shard(roots, 1, 2, ["c/e/v1", "c/e/v2"])
+    write_shard(roots, 2, 2, ["c/e/v2"])
+
+    assert not merge()
+    assert "more than one shard" in capsys.readouterr().out
+
+
+def test_merge_refuses_assignments_that_do_not_add_up(roots, capsys):
+    write_shard(roots, 1, 2, ["c/e/v1"], total=3)
+    write_shard(roots, 2, 2, ["c/e/v2"], total=3)
+
+    assert not merge()
+    assert "were they run on different data" in capsys.readouterr().out
+
+
+def test_merge_refuses_queued_cases_without_result(roots, capsys):
+    write_shard(roots, 1, 2, ["c/e/v1"])
+    write_shard(roots, 2, 2, ["c/e/v2"], queued=["c/e/v2", "c/e/v3"])
+
+    assert not merge()
+    output = capsys.readouterr().out
+    assert "queued cases without a result" in output
+    assert "c/e/v3" in output
+
+
+def test_merge_refuses_to_overwrite_without_force(roots, capsys):
+    write_shard(roots, 1, 2, ["c/e/v1"])
+    write_shard(roots, 2, 2, ["c/e/v2"])
+    _, results_root = roots
+    existing = results_root / APPROACH / BASE / "cases" / "c" / "e" / "v1.json"
+    existing.parent.mkdir(parents=True)
+    existing.write_text("{}", encoding="utf-8")
+
+    assert not merge()
+    assert "use --force" in capsys.readouterr().out
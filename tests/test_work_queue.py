@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import pytest
+
+from cli.execution import work_queue
+from cli.execution.work_queue import DONE, FAILED, LEASED, PENDING, WorkQueue
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(work_queue, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def queue(tmp_path, clock):
+    queue = WorkQueue(tmp_path / "queue.sqlite")
+    queue.enqueue(
+        {"run-1": ("approach", {"args": {"model": "openai:gpt-5-mini"}})},
+        [("run-1", "c/e/v1"), ("run-1", "c/e/v2")],
+    )
+    return queue
+
+
+def test_enqueue_keeps_queued_cases(queue):
+    added = queue.enqueue(
+        {"run-1": ("approach", {})}, [("run-1", "c/e/v1"), ("run-1", "c/e/v3")]
+    )
+
+    assert added == 1
+    assert queue.counts()[PENDING] == 3
+    assert queue.runs() == {"run-1": ("approach", {})}
+
+
+def test_claim_hands_out_cases_in_order_once(queue):
+    first = queue.claim("worker-a", lease_s=60)
+    second = queue.claim("worker-b", lease_s=60)
+
+    assert (first.case_id, first.claims) == ("c/e/v1", 1)
+    assert (second.case_id, second.claims) == ("c/e/v2", 1)
+    assert queue.claim("worker-c", lease_s=60) is None
+    assert queue.counts()[LEASED] == 2
+
+
+def test_expired_lease_is_claimed_again(queue, clock):
+    first = queue.claim("worker-a", lease_s=60)
+    queue.claim("worker-a", lease_s=60)
+
+    clock.now += 30
+    assert queue.heartbeat([first.entry_id], "worker-a", lease_s=60) == set()
+    clock.now += 31
+    reclaimed = queue.claim("worker-b", lease_s=60)
+
+    assert reclaimed.case_id == "c/e/v2"
+    assert reclaimed.claims == 2
+    assert queue.complete(reclaimed.entry_id, "worker-a", success=True) is False
+    assert queue.complete(reclaimed.entry_id, "worker-b", success=True) is True
+    assert queue.counts()[DONE] == 1
+
+
+def test_heartbeat_reports_lost_leases(queue, clock):
+    first = queue.claim("worker-a", lease_s=60)
+    clock.now += 61
+    queue.claim("worker-b", lease_s=60)
+
+    assert queue.heartbeat([first.entry_id], "worker-a", lease_s=60) == {first.entry_id}
+
+
+def test_lease_expiring_max_claims_times_fails_the_case(queue, clock):
+    for _ in range(2):
+        entry = queue.claim("worker", lease_s=60, max_claims=2)
+        assert entry.case_id == "c/e/v1"
+        clock.now += 61
+
+    entry = queue.claim("worker", lease_s=60, max_claims=2)
+
+    assert entry.case_id == "c/e/v2"
+    assert queue.counts()[FAILED] == 1
+    assert queue.failures("run-1") == [("c/e/v1", "lease expired 2 time(s)")]
+
+
+def test_release_hands_cases_back_without_counting_a_claim(queue):
+    entry = queue.claim("worker-a", lease_s=60)
+    queue.release([entry.entry_id], "worker-a")
+
+    again = queue.claim("worker-b", lease_s=60)
+
+    assert again.case_id == "c/e/v1"
+    assert again.claims == 1